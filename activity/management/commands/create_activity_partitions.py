@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from activity.partitions import ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Create monthly ActivityLog partitions ahead of time"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.ACTIVITY_PARTITIONS_AHEAD,
+            help="Number of months after the current one to create partitions for",
+        )
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            self.stdout.write("ActivityLog is not partitioned on this database; nothing to do")
+            return
+        created = ensure_partitions(options["months_ahead"])
+        for name in created:
+            self.stdout.write(name)
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partitions"))
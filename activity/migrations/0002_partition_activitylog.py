@@ -0,0 +1,107 @@
+from datetime import date, datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.fields.json import KeyTextTransform
+
+# Months of empty partitions created ahead of the current one; the
+# create_activity_partitions command keeps this horizon moving afterwards.
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def partition_activity_log(apps, schema_editor):
+    """
+    Rebuild activity_activitylog as a table range-partitioned by month on timestamp.
+
+    Postgres requires the partition key inside the primary key, so the table key
+    becomes (id, timestamp); ids still come from a single sequence and stay unique.
+    Other backends keep the plain table.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    ActivityLog = apps.get_model("activity", "ActivityLog")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    qn = schema_editor.quote_name
+    table = ActivityLog._meta.db_table
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_partitioned_id_seq"
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN({qn('timestamp')}), MAX(id) FROM {qn(table)}")
+        oldest, max_id = cursor.fetchone()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+    schema_editor.execute(f"CREATE SEQUENCE {qn(sequence)} START WITH {(max_id or 0) + 1}")
+    schema_editor.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)}) PARTITION BY RANGE ({qn('timestamp')})")
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    schema_editor.execute(f"ALTER SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_part_pkey')} PRIMARY KEY (id, {qn('timestamp')})")
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_user_id_part_fk')} FOREIGN KEY (user_id) "
+        f"REFERENCES {qn(User._meta.db_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+    while month <= last:
+        schema_editor.execute(
+            f"CREATE TABLE {qn(f'{table}_p{month:%Y_%m}')} PARTITION OF {qn(table)} "
+            f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(_add_months(month, 1))}')"
+        )
+        month = _add_months(month, 1)
+    # Catches rows outside every monthly range instead of failing the write that produced them.
+    schema_editor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+    schema_editor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+    schema_editor.execute(f"DROP TABLE {qn(legacy)}")
+    schema_editor.execute(f"CREATE INDEX {qn(table + '_user_id_part_idx')} ON {qn(table)} (user_id)")
+
+
+def unpartition_activity_log(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    ActivityLog = apps.get_model("activity", "ActivityLog")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    qn = schema_editor.quote_name
+    table = ActivityLog._meta.db_table
+    partitioned = f"{table}_partitioned"
+
+    schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(partitioned)}")
+    schema_editor.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(partitioned)})")
+    schema_editor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(partitioned)}")
+    schema_editor.execute(f"DROP TABLE {qn(partitioned)} CASCADE")
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {qn(table)}), 0) + 1, false)"
+    )
+    schema_editor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id)")
+    schema_editor.execute(
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_user_id_fk')} FOREIGN KEY (user_id) "
+        f"REFERENCES {qn(User._meta.db_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+    schema_editor.execute(f"CREATE INDEX {qn(table + '_user_id_idx')} ON {qn(table)} (user_id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_activity_log, unpartition_activity_log),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(KeyTextTransform('project_id', 'metadata'), F('timestamp').desc(), name='activity_project_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:23
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0002_partition_activitylog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='activity_project_feed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(django.db.models.fields.json.KeyTransform('project_id', 'metadata'), models.OrderBy(models.F('timestamp'), descending=True), name='activity_project_feed_idx'),
+        ),
+    ]
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.fields.json import KeyTransform
 from django.utils import timezone
 
 
 class ActivityLog(models.Model):
+	"""
+	Append-only audit entry. On Postgres the table is range-partitioned by month on
+	``timestamp`` (see ``activity.partitions``), keyed by ``(id, timestamp)``.
+	"""
+
 	user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="activity_logs")
 	action = models.CharField(max_length=200)
 	target_type = models.CharField(max_length=255, blank=True)
@@ -15,6 +22,10 @@ class ActivityLog(models.Model):
 
 	class Meta:
 		ordering = ("-timestamp", "-id")
+		indexes = [
+			# KeyTransform (->) is what metadata__project_id filters compile to, so the feed can use it.
+			models.Index(KeyTransform("project_id", "metadata"), F("timestamp").desc(), name="activity_project_feed_idx"),
+		]
 
 	def __str__(self):
 		return f"{self.action} by {self.user_id} on {self.target_type}:{self.target_id} at {self.timestamp}"
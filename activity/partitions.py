@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import tempfile
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import ActivityLog
+
+PARENT_TABLE = ActivityLog._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_PATTERN = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+EXPORT_COLUMNS = ("id", "user_id", "action", "target_type", "target_id", "timestamp", "metadata")
+DELETE_BATCH_SIZE = 5000
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month() -> date:
+    # Partition bounds are UTC month boundaries.
+    return datetime.now(dt_timezone.utc).date().replace(day=1)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    lower = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    upper_month = add_months(month, 1)
+    return lower, datetime(upper_month.year, upper_month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [PARENT_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _monthly_tables() -> dict[date, bool]:
+    """Every monthly table, attached or left detached by an interrupted run, mapped to whether it is attached."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname, relispartition FROM pg_class WHERE relkind = 'r' AND relname LIKE %s",
+            [f"{PARENT_TABLE}\\_p%"],
+        )
+        rows = cursor.fetchall()
+    tables = {}
+    for name, attached in rows:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            tables[date(int(match.group(1)), int(match.group(2)), 1)] = attached
+    return tables
+
+
+def ensure_partitions(months_ahead: int | None = None) -> list[str]:
+    """Create the partitions for this month and ``months_ahead`` following ones; returns the new table names."""
+    if not is_partitioned():
+        return []
+    months_ahead = settings.ACTIVITY_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    existing = _monthly_tables()
+    first = current_month()
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if month in existing:
+            continue
+        _create_partition(month)
+        created.append(partition_name(month))
+    return created
+
+
+def _create_partition(month: date) -> None:
+    """
+    Create the month's partition, moving any rows the default partition caught for it.
+
+    Postgres refuses a new partition while the default one holds rows in its range, so
+    those rows are parked in a staging table and re-inserted through the parent once the
+    partition exists, all in one transaction.
+    """
+    qn = connection.ops.quote_name
+    lower, upper = month_bounds(month)
+    staging = qn(f"{PARENT_TABLE}_staging")
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {qn(PARENT_TABLE)})")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE {qn('timestamp')} >= %s "
+            f"AND {qn('timestamp')} < %s RETURNING *) INSERT INTO {staging} SELECT * FROM moved",
+            [lower, upper],
+        )
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {qn(partition_name(month))} PARTITION OF {qn(PARENT_TABLE)} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        cursor.execute(f"INSERT INTO {qn(PARENT_TABLE)} SELECT * FROM {staging}")
+        cursor.execute(f"DROP TABLE {staging}")
+
+
+def archive_name(month: date) -> str:
+    return f"{settings.ACTIVITY_ARCHIVE_PREFIX}/{month:%Y}/activity-{month:%Y-%m}.jsonl.gz"
+
+
+def _write_archive(month: date, rows) -> str:
+    """Stream ``rows`` (tuples in EXPORT_COLUMNS order) into a gzipped JSON Lines file in media storage."""
+    with tempfile.TemporaryFile() as spool:
+        with gzip.GzipFile(fileobj=spool, mode="wb") as archive:
+            for row in rows:
+                line = json.dumps(dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder)
+                archive.write(line.encode() + b"\n")
+        spool.seek(0)
+        return default_storage.save(archive_name(month), File(spool))
+
+
+def _rows(cursor):
+    while batch := cursor.fetchmany(1000):
+        yield from batch
+
+
+def _archive_partition(month: date, attached: bool) -> str:
+    qn = connection.ops.quote_name
+    table = qn(partition_name(month))
+    if attached:
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {table}")
+    # Detached first so feed queries stop seeing the month while it is exported.
+    with transaction.atomic():
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(qn(column) for column in EXPORT_COLUMNS)} FROM {table} ORDER BY id")
+            name = _write_archive(month, _rows(cursor))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {table}")
+    return name
+
+
+def _archive_month_rows(month: date) -> str:
+    lower, upper = month_bounds(month)
+    logs = ActivityLog.objects.filter(timestamp__gte=lower, timestamp__lt=upper)
+    name = _write_archive(month, logs.order_by("id").values_list(*EXPORT_COLUMNS).iterator(chunk_size=1000))
+    while ids := list(logs.values_list("id", flat=True)[:DELETE_BATCH_SIZE]):
+        ActivityLog.objects.filter(pk__in=ids).delete()
+    return name
+
+
+def _default_partition_months(before: date) -> list[date]:
+    """Months, older than ``before``, that have rows in the default partition."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {qn('timestamp')} AT TIME ZONE 'UTC')::date "
+            f"FROM {qn(DEFAULT_PARTITION)} WHERE {qn('timestamp')} < %s ORDER BY 1",
+            [month_bounds(before)[0]],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def expire_activity_logs(retention_months: int | None = None) -> list[str]:
+    """
+    Export every month older than the retention window to media storage and remove it.
+
+    On a partitioned table each expired partition is detached, dumped and dropped, so
+    the live table never sees a bulk delete; expired rows in the default partition are
+    exported and deleted in batches, as other backends do for every month. Returns the
+    stored archive names.
+    """
+    retention_months = settings.ACTIVITY_RETENTION_MONTHS if retention_months is None else retention_months
+    cutoff = add_months(current_month(), -retention_months)
+    if is_partitioned():
+        expired = sorted((month, attached) for month, attached in _monthly_tables().items() if month < cutoff)
+        archived = [_archive_partition(month, attached) for month, attached in expired]
+        return archived + [_archive_month_rows(month) for month in _default_partition_months(cutoff)]
+
+    oldest = ActivityLog.objects.order_by("timestamp").values_list("timestamp", flat=True).first()
+    if oldest is None:
+        return []
+    month = oldest.astimezone(dt_timezone.utc).date().replace(day=1)
+    archived = []
+    while month < cutoff:
+        lower, upper = month_bounds(month)
+        if ActivityLog.objects.filter(timestamp__gte=lower, timestamp__lt=upper).exists():
+            archived.append(_archive_month_rows(month))
+        month = add_months(month, 1)
+    return archived
@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 @receiver(post_save, sender=Task)
 def task_activity(sender, instance, created, **kwargs):
     data = {"project_id": str(instance.project_id)}
+    if created:
+        data["board_list"] = str(instance.board_list_id)
     action = "task_created" if created else "task_updated"
     create_activity_log(user=getattr(instance, "assigned_to", None), action=action, target=instance, metadata=data)
 
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from .partitions import ensure_partitions, expire_activity_logs
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def ensure_activity_partitions(self) -> int:
+    created = ensure_partitions()
+    if created:
+        logger.info("ensure_activity_partitions created %s", ", ".join(created))
+    return len(created)
+
+
+@shared_task(bind=True)
+def expire_activity_logs_task(self) -> list[str]:
+    archived = expire_activity_logs()
+    if archived:
+        logger.info("expire_activity_logs archived %s", ", ".join(archived))
+    return archived
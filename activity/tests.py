@@ -1,5 +1,14 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -9,6 +18,7 @@ from boards.models import Board, BoardList
 from tasks.models import Task
 from comments.models import Comment
 from .models import ActivityLog
+from .partitions import expire_activity_logs
 
 User = get_user_model()
 
@@ -37,3 +47,26 @@ class ActivityApiTests(APITestCase):
 		data = response.data.get("results", response.data)
 		self.assertTrue(any(item["metadata"].get("project_id") == str(self.project.id) for item in data))
 
+
+	def test_expired_months_are_exported_and_removed(self):
+		media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+		metadata = {"project_id": str(self.project.id)}
+		old = ActivityLog.objects.create(action="task_created", metadata=metadata, timestamp=timezone.now() - timedelta(days=500))
+		recent = ActivityLog.objects.create(action="task_moved", metadata=metadata, timestamp=timezone.now() - timedelta(days=120))
+
+		with override_settings(MEDIA_ROOT=media_root, ACTIVITY_ARCHIVE_PREFIX="activity_archive"):
+			archived = expire_activity_logs(retention_months=12)
+			self.assertEqual(len(archived), 1)
+			with default_storage.open(archived[0], "rb") as handle:
+				lines = gzip.decompress(handle.read()).decode().splitlines()
+		self.assertEqual([json.loads(line)["id"] for line in lines], [old.id])
+		self.assertFalse(ActivityLog.objects.filter(pk=old.pk).exists())
+		self.assertTrue(ActivityLog.objects.filter(pk=recent.pk).exists())
+
+		url = reverse("activity:project-activity", args=[self.project.id])
+		ids = [item["id"] for item in self.client.get(url).data["results"]]
+		self.assertNotIn(recent.id, ids)
+		since = (timezone.now() - timedelta(days=200)).isoformat()
+		ids = [item["id"] for item in self.client.get(url, {"since": since}).data["results"]]
+		self.assertIn(recent.id, ids)
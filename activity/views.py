@@ -1,7 +1,14 @@
-from django.shortcuts import get_object_or_404
-from rest_framework import generics, permissions
+from datetime import timedelta
+
+from django.conf import settings
+from django.shortcuts import aget_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from core.views import AsyncListAPIView
 from projects.permissions import IsProjectMember
 from projects.models import Project
 
@@ -9,12 +16,34 @@ from .models import ActivityLog
 from .serializers import ActivityLogSerializer
 
 
-class ProjectActivityListView(generics.ListAPIView):
+class ProjectActivityListView(AsyncListAPIView):
+	# Schema generation only; requests are scoped to a project in ``aget_queryset``.
+	queryset = ActivityLog.objects.none()
 	serializer_class = ActivityLogSerializer
 	permission_classes = (permissions.IsAuthenticated, IsProjectMember)
 
-	def get_queryset(self):
+	async def aget_queryset(self):
 		project_pk = self.kwargs.get("project_pk")
+		project = await aget_object_or_404(Project.objects.alive(), pk=project_pk)
+		await self.acheck_object_permissions(self.request, project)
 		# Only include activity logs that include project id in metadata
-		return ActivityLog.objects.filter(metadata__project_id=str(project_pk))
+		queryset = ActivityLog.objects.filter(metadata__project_id=str(project_pk))
+		# A lower timestamp bound lets Postgres skip every partition older than the window.
+		since = self._timestamp_param("since") or timezone.now() - timedelta(days=settings.ACTIVITY_FEED_WINDOW_DAYS)
+		queryset = queryset.filter(timestamp__gte=since)
+		until = self._timestamp_param("until")
+		if until is not None:
+			queryset = queryset.filter(timestamp__lt=until)
+		return queryset
+
+	def _timestamp_param(self, name):
+		value = self.request.query_params.get(name)
+		if not value:
+			return None
+		parsed = parse_datetime(value)
+		if parsed is None:
+			raise ValidationError({name: "Use an ISO 8601 timestamp."})
+		if timezone.is_naive(parsed):
+			parsed = timezone.make_aware(parsed)
+		return parsed
 
@@ -0,0 +1,8 @@
+"""
+Board analytics.
+
+Daily list snapshots and the lead/cycle time percentiles are computed by Celery beat
+jobs. Per-task flow metrics are not: ``signals`` applies each task_created/task_moved
+ActivityLog entry synchronously, in the transaction that wrote it, with the task's
+TaskFlowMetrics row locked so concurrent moves of one task are applied one at a time.
+"""
@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from .models import AnalyticsCursor, BoardListSnapshot
+
+
+@admin.register(BoardListSnapshot)
+class BoardListSnapshotAdmin(admin.ModelAdmin):
+	list_display = ("board", "board_list", "date", "task_count")
+	list_filter = ("date",)
+
+
+@admin.register(AnalyticsCursor)
+class AnalyticsCursorAdmin(admin.ModelAdmin):
+	list_display = ("name", "last_activity_id", "last_snapshot_date", "updated_at")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from activity.models import ActivityLog
+from analytics.models import TaskFlowMetrics, TaskListInterval
+from analytics.services import FLOW_ACTIONS, record_flow_event, refresh_flow_percentiles
+
+
+class Command(BaseCommand):
+    help = "Replay task activity logs into the cycle/lead time tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Activity rows fetched and applied per transaction")
+        parser.add_argument("--reset", action="store_true", help="Drop existing flow rows before replaying")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if options["reset"]:
+            TaskListInterval.objects.all().delete()
+            TaskFlowMetrics.objects.all().delete()
+            self.stdout.write("Cleared existing flow metrics")
+
+        logs = ActivityLog.objects.filter(action__in=FLOW_ACTIONS).order_by("id").iterator(chunk_size=chunk_size)
+        processed = 0
+        chunk: list[ActivityLog] = []
+        for log in logs:
+            chunk.append(log)
+            if len(chunk) >= chunk_size:
+                processed += self._apply(chunk)
+                chunk = []
+                self.stdout.write(f"Replayed {processed} events")
+        if chunk:
+            processed += self._apply(chunk)
+
+        refreshed = refresh_flow_percentiles()
+        self.stdout.write(self.style.SUCCESS(f"Replayed {processed} events; stored {refreshed} percentile rows"))
+
+    @staticmethod
+    def _apply(chunk: list[ActivityLog]) -> int:
+        with transaction.atomic():
+            for log in chunk:
+                record_flow_event(log)
+        return len(chunk)
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('boards', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_activity_id', models.PositiveBigIntegerField(default=0)),
+                ('last_snapshot_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BoardListSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('task_count', models.PositiveIntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='boards.board')),
+                ('board_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='boards.boardlist')),
+            ],
+            options={
+                'ordering': ('date', 'board_list'),
+                'indexes': [models.Index(fields=['board', 'date'], name='analytics_b_board_i_8b34e6_idx')],
+                'unique_together': {('board_list', 'date')},
+            },
+        ),
+    ]
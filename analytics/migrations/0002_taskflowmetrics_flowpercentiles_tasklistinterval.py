@@ -0,0 +1,66 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('boards', '0002_initial'),
+        ('tasks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskFlowMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('lead_time_seconds', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('cycle_time_seconds', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('last_event_id', models.PositiveBigIntegerField(default=0)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='flow_metrics', to=settings.AUTH_USER_MODEL)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flow_metrics', to='boards.board')),
+                ('task', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='flow_metrics', to='tasks.task')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FlowPercentiles',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sample_size', models.PositiveIntegerField(default=0)),
+                ('lead_time_p50', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('lead_time_p85', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('cycle_time_p50', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('cycle_time_p85', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='flow_percentiles', to=settings.AUTH_USER_MODEL)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flow_percentiles', to='boards.board')),
+            ],
+            options={
+                'ordering': ('board', 'assignee'),
+                'unique_together': {('board', 'assignee')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskListInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entered_at', models.DateTimeField()),
+                ('exited_at', models.DateTimeField(blank=True, null=True)),
+                ('board_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_intervals', to='boards.boardlist')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='list_intervals', to='tasks.task')),
+            ],
+            options={
+                'ordering': ('entered_at', 'id'),
+                'indexes': [models.Index(fields=['task', 'exited_at'], name='analytics_t_task_id_758117_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from boards.models import Board, BoardList
+from tasks.models import Task
+
+
+class BoardListSnapshot(models.Model):
+	"""Number of tasks sitting in a board list at the end of a given day."""
+
+	board = models.ForeignKey(Board, related_name="snapshots", on_delete=models.CASCADE)
+	board_list = models.ForeignKey(BoardList, related_name="snapshots", on_delete=models.CASCADE)
+	date = models.DateField()
+	task_count = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		ordering = ("date", "board_list")
+		unique_together = ("board_list", "date")
+		indexes = [models.Index(fields=("board", "date"))]
+
+	def __str__(self):
+		return f"{self.board_list_id} on {self.date}: {self.task_count}"
+
+
+class AnalyticsCursor(models.Model):
+	"""Bookmark of the last ActivityLog row an incremental job has consumed."""
+
+	name = models.CharField(max_length=100, unique=True)
+	last_activity_id = models.PositiveBigIntegerField(default=0)
+	last_snapshot_date = models.DateField(null=True, blank=True)
+	updated_at = models.DateTimeField(default=timezone.now)
+
+	def __str__(self):
+		return f"{self.name} @ {self.last_activity_id}"
+
+
+class TaskListInterval(models.Model):
+	"""A stay of a task in one board list; ``exited_at`` stays empty while it is still there."""
+
+	task = models.ForeignKey(Task, related_name="list_intervals", on_delete=models.CASCADE)
+	board_list = models.ForeignKey(BoardList, related_name="task_intervals", on_delete=models.CASCADE)
+	entered_at = models.DateTimeField()
+	exited_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		ordering = ("entered_at", "id")
+		indexes = [models.Index(fields=("task", "exited_at"))]
+
+	def __str__(self):
+		return f"{self.task_id} in {self.board_list_id} from {self.entered_at}"
+
+	@property
+	def duration_seconds(self):
+		end = self.exited_at or timezone.now()
+		return int((end - self.entered_at).total_seconds())
+
+
+class TaskFlowMetrics(models.Model):
+	"""Running lead/cycle time accumulator for a single task."""
+
+	task = models.OneToOneField(Task, related_name="flow_metrics", on_delete=models.SET_NULL, null=True, blank=True)
+	board = models.ForeignKey(Board, related_name="flow_metrics", on_delete=models.CASCADE)
+	assignee = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="flow_metrics", on_delete=models.SET_NULL, null=True, blank=True)
+	created_at = models.DateTimeField()
+	started_at = models.DateTimeField(null=True, blank=True)
+	completed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+	lead_time_seconds = models.PositiveBigIntegerField(null=True, blank=True)
+	cycle_time_seconds = models.PositiveBigIntegerField(null=True, blank=True)
+	last_event_id = models.PositiveBigIntegerField(default=0)
+
+	def __str__(self):
+		return f"Flow metrics for task {self.task_id}"
+
+
+class FlowPercentiles(models.Model):
+	"""Precomputed lead/cycle time percentiles per board, and per assignee within a board."""
+
+	board = models.ForeignKey(Board, related_name="flow_percentiles", on_delete=models.CASCADE)
+	assignee = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="flow_percentiles", on_delete=models.CASCADE, null=True, blank=True)
+	sample_size = models.PositiveIntegerField(default=0)
+	lead_time_p50 = models.PositiveBigIntegerField(null=True, blank=True)
+	lead_time_p85 = models.PositiveBigIntegerField(null=True, blank=True)
+	cycle_time_p50 = models.PositiveBigIntegerField(null=True, blank=True)
+	cycle_time_p85 = models.PositiveBigIntegerField(null=True, blank=True)
+	computed_at = models.DateTimeField(default=timezone.now)
+
+	class Meta:
+		ordering = ("board", "assignee")
+		unique_together = ("board", "assignee")
+
+	def __str__(self):
+		return f"Flow percentiles for board {self.board_id} / assignee {self.assignee_id}"
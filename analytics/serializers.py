@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import FlowPercentiles, TaskFlowMetrics, TaskListInterval
+
+DEFAULT_WINDOW_DAYS = 30
+
+
+class SeriesQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=DEFAULT_WINDOW_DAYS)
+        if start > end:
+            raise serializers.ValidationError({"start": "Start date must not be after end date."})
+        return {"start": start, "end": end}
+
+
+class FlowPercentilesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FlowPercentiles
+        fields = (
+            "board",
+            "assignee",
+            "sample_size",
+            "lead_time_p50",
+            "lead_time_p85",
+            "cycle_time_p50",
+            "cycle_time_p85",
+            "computed_at",
+        )
+        read_only_fields = fields
+
+
+class TaskListIntervalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskListInterval
+        fields = ("board_list", "entered_at", "exited_at", "duration_seconds")
+        read_only_fields = fields
+
+
+class TaskFlowMetricsSerializer(serializers.ModelSerializer):
+    intervals = TaskListIntervalSerializer(source="task.list_intervals", many=True, read_only=True)
+
+    class Meta:
+        model = TaskFlowMetrics
+        fields = (
+            "task",
+            "board",
+            "assignee",
+            "created_at",
+            "started_at",
+            "completed_at",
+            "lead_time_seconds",
+            "cycle_time_seconds",
+            "intervals",
+        )
+        read_only_fields = fields
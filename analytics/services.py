@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, Max, OuterRef
+from django.utils import timezone
+
+from activity.models import ActivityLog
+from boards.models import Board, BoardList
+from tasks.models import Task
+
+from .models import AnalyticsCursor, BoardListSnapshot, FlowPercentiles, TaskFlowMetrics, TaskListInterval
+
+SNAPSHOT_CURSOR = "daily_snapshots"
+SNAPSHOT_ACTIONS = (
+    "task_created",
+    "task_updated",
+    "task_moved",
+    "tasks_archived",
+    "task_restored",
+    "board_cloned",
+    "project_cloned",
+)
+SNAPSHOT_BATCH_SIZE = 1000
+FLOW_ACTIONS = ("task_created", "task_moved")
+
+
+def done_list_names() -> tuple[str, ...]:
+    return tuple(getattr(settings, "ANALYTICS_DONE_LISTS", ("Done",)))
+
+
+def _touched_board_ids(after_id: int, up_to_id: int) -> set[int]:
+    """Boards whose projects logged task activity in the (after_id, up_to_id] window."""
+    project_ids = (
+        ActivityLog.objects.filter(id__gt=after_id, id__lte=up_to_id, action__in=SNAPSHOT_ACTIONS)
+        .order_by()
+        .values_list("metadata__project_id", flat=True)
+        .distinct()
+    )
+    project_ids = {int(value) for value in project_ids if value}
+    if not project_ids:
+        return set()
+    return set(Board.objects.alive().filter(project_id__in=project_ids).values_list("id", flat=True))
+
+
+def _unsnapshotted_board_ids(snapshot_date: date) -> set[int]:
+    """Boards with a list that has no row for ``snapshot_date``: new boards and newly added lists."""
+    snapshotted = BoardListSnapshot.objects.filter(board_list=OuterRef("pk"), date=snapshot_date)
+    return set(
+        BoardList.objects.alive()
+        .filter(~Exists(snapshotted), board__in=Board.objects.alive())
+        .order_by()
+        .values_list("board_id", flat=True)
+        .distinct()
+    )
+
+
+def _counted_rows(snapshot_date: date, board_ids: Iterable[int] | None) -> Iterable[BoardListSnapshot]:
+    lists = BoardList.objects.alive()
+    tasks = Task.objects.alive()
+    if board_ids is not None:
+        lists = lists.filter(board_id__in=board_ids)
+        tasks = tasks.filter(board_list__board_id__in=board_ids)
+    counts = dict(tasks.order_by().values("board_list_id").annotate(total=Count("id")).values_list("board_list_id", "total"))
+    for list_id, board_id in lists.values_list("id", "board_id").iterator():
+        yield BoardListSnapshot(
+            board_id=board_id,
+            board_list_id=list_id,
+            date=snapshot_date,
+            task_count=counts.get(list_id, 0),
+        )
+
+
+def _carried_rows(snapshot_date: date, previous_date: date, skip_board_ids: set[int]) -> Iterable[BoardListSnapshot]:
+    previous = (
+        BoardListSnapshot.objects.filter(date=previous_date, board_list__in=BoardList.objects.alive())
+        .exclude(board_id__in=skip_board_ids)
+    )
+    for board_id, list_id, task_count in previous.values_list("board_id", "board_list_id", "task_count").iterator():
+        yield BoardListSnapshot(board_id=board_id, board_list_id=list_id, date=snapshot_date, task_count=task_count)
+
+
+def _write_rows(rows: Iterable[BoardListSnapshot]) -> int:
+    written = 0
+    batch: list[BoardListSnapshot] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            written += _upsert(batch)
+            batch = []
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(batch: list[BoardListSnapshot]) -> int:
+    BoardListSnapshot.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["board_list", "date"],
+        update_fields=["task_count"],
+    )
+    return len(batch)
+
+
+@transaction.atomic
+def materialize_daily_snapshots(snapshot_date: date | None = None, *, full: bool = False) -> int:
+    """
+    Write one BoardListSnapshot row per list for ``snapshot_date``.
+
+    Only boards whose projects logged task activity since the cursor, and boards with
+    lists the previous snapshot has no row for, are recounted; every other board
+    carries its previous snapshot forward unchanged. A ``full``
+    run (or the very first run) recounts every board, which also heals drift from
+    task deletions that leave no activity entry behind.
+    """
+    snapshot_date = snapshot_date or timezone.localdate()
+    cursor, _ = AnalyticsCursor.objects.select_for_update().get_or_create(name=SNAPSHOT_CURSOR)
+    latest_id = ActivityLog.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+
+    if full or cursor.last_snapshot_date is None:
+        written = _write_rows(_counted_rows(snapshot_date, None))
+    else:
+        touched = _touched_board_ids(cursor.last_activity_id, latest_id)
+        touched |= _unsnapshotted_board_ids(cursor.last_snapshot_date)
+        written = _write_rows(_counted_rows(snapshot_date, touched)) if touched else 0
+        if cursor.last_snapshot_date != snapshot_date:
+            written += _write_rows(_carried_rows(snapshot_date, cursor.last_snapshot_date, touched))
+
+    cursor.last_activity_id = latest_id
+    cursor.last_snapshot_date = snapshot_date
+    cursor.updated_at = timezone.now()
+    cursor.save(update_fields=["last_activity_id", "last_snapshot_date", "updated_at"])
+    return written
+
+
+def _snapshot_rows(board, start: date, end: date):
+    return (
+        BoardListSnapshot.objects.filter(board=board, date__gte=start, date__lte=end)
+        .order_by("date", "board_list__position", "board_list_id")
+        .values_list("date", "board_list_id", "board_list__name", "board_list__position", "task_count")
+    )
+
+
+async def acumulative_flow_series(board, start: date, end: date) -> dict:
+    lists: dict[int, dict] = {}
+    days: dict[date, dict[str, int]] = {}
+    async for day, list_id, name, position, task_count in _snapshot_rows(board, start, end):
+        lists.setdefault(list_id, {"id": list_id, "name": name, "position": position})
+        days.setdefault(day, {})[str(list_id)] = task_count
+    return {
+        "board": board.id,
+        "start": start,
+        "end": end,
+        "lists": sorted(lists.values(), key=lambda item: (item["position"], item["id"])),
+        "series": [{"date": day, "counts": counts} for day, counts in days.items()],
+    }
+
+
+async def aburndown_series(board, start: date, end: date) -> dict:
+    done_names = set(done_list_names())
+    days: dict[date, dict[str, int]] = {}
+    async for day, _list_id, name, _position, task_count in _snapshot_rows(board, start, end):
+        point = days.setdefault(day, {"remaining": 0, "done": 0})
+        point["done" if name in done_names else "remaining"] += task_count
+    return {
+        "board": board.id,
+        "start": start,
+        "end": end,
+        "series": [
+            {"date": day, "remaining": point["remaining"], "done": point["done"], "total": point["remaining"] + point["done"]}
+            for day, point in days.items()
+        ],
+    }
+
+
+def _elapsed_seconds(start, end) -> int:
+    return max(int((end - start).total_seconds()), 0)
+
+
+def _record_task_move(log: ActivityLog, task: Task, metrics: TaskFlowMetrics) -> None:
+    to_list_id = int(log.metadata["to_list"])
+    target = BoardList.objects.filter(pk=to_list_id).values_list("name", "board_id").first()
+    if target is None:
+        return
+    to_name, to_board_id = target
+
+    open_interval = task.list_intervals.filter(exited_at__isnull=True).order_by("-entered_at").first()
+    if open_interval is not None:
+        open_interval.exited_at = log.timestamp
+        open_interval.save(update_fields=["exited_at"])
+    elif log.metadata.get("from_list"):
+        # No entry was recorded (e.g. replaying logs written before creation events carried the list).
+        TaskListInterval.objects.create(
+            task=task,
+            board_list_id=int(log.metadata["from_list"]),
+            entered_at=metrics.created_at,
+            exited_at=log.timestamp,
+        )
+    TaskListInterval.objects.create(task=task, board_list_id=to_list_id, entered_at=log.timestamp)
+
+    metrics.board_id = to_board_id
+    if metrics.started_at is None:
+        metrics.started_at = log.timestamp
+    if to_name in done_list_names():
+        metrics.completed_at = log.timestamp
+        metrics.assignee_id = task.assigned_to_id
+        metrics.lead_time_seconds = _elapsed_seconds(metrics.created_at, log.timestamp)
+        metrics.cycle_time_seconds = _elapsed_seconds(metrics.started_at, log.timestamp)
+    else:
+        metrics.completed_at = None
+        metrics.lead_time_seconds = None
+        metrics.cycle_time_seconds = None
+
+
+@transaction.atomic
+def record_flow_event(log: ActivityLog) -> None:
+    """
+    Apply a single ``task_created``/``task_moved`` log entry to the flow tables.
+
+    Entries at or below the task's ``last_event_id`` are ignored, so replaying the
+    log over already processed history is a no-op.
+    """
+    if log.action not in FLOW_ACTIONS or not log.target_id:
+        return
+    task = Task.objects.select_related("board_list").filter(pk=log.target_id).first()
+    if task is None:
+        return
+    # Locked until the writer's transaction ends, so concurrent moves of one task apply in turn.
+    metrics, _ = TaskFlowMetrics.objects.select_for_update().get_or_create(
+        task=task,
+        defaults={"board_id": task.board_list.board_id, "created_at": task.created_at},
+    )
+    if log.id <= metrics.last_event_id:
+        return
+
+    if log.action == "task_created":
+        list_id = log.metadata.get("board_list")
+        if list_id and not task.list_intervals.exists():
+            TaskListInterval.objects.create(task=task, board_list_id=int(list_id), entered_at=log.timestamp)
+    else:
+        _record_task_move(log, task, metrics)
+
+    metrics.last_event_id = log.id
+    metrics.save()
+
+
+def _percentile(values: list[int], pct: int) -> int | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+@transaction.atomic
+def refresh_flow_percentiles() -> int:
+    """Recompute p50/p85 lead and cycle times from tasks completed inside the reporting window."""
+    window_days = getattr(settings, "ANALYTICS_FLOW_WINDOW_DAYS", 90)
+    since = timezone.now() - timedelta(days=window_days)
+    samples: dict[tuple[int, int | None], tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+    completed = TaskFlowMetrics.objects.filter(completed_at__gte=since).values_list(
+        "board_id", "assignee_id", "lead_time_seconds", "cycle_time_seconds"
+    )
+    for board_id, assignee_id, lead_time, cycle_time in completed.iterator():
+        keys = [(board_id, None)]
+        if assignee_id:
+            keys.append((board_id, assignee_id))
+        for key in keys:
+            leads, cycles = samples[key]
+            leads.append(lead_time)
+            if cycle_time is not None:
+                cycles.append(cycle_time)
+
+    now = timezone.now()
+    rows = [
+        FlowPercentiles(
+            board_id=board_id,
+            assignee_id=assignee_id,
+            sample_size=len(leads),
+            lead_time_p50=_percentile(leads, 50),
+            lead_time_p85=_percentile(leads, 85),
+            cycle_time_p50=_percentile(cycles, 50),
+            cycle_time_p85=_percentile(cycles, 85),
+            computed_at=now,
+        )
+        for (board_id, assignee_id), (leads, cycles) in samples.items()
+    ]
+    FlowPercentiles.objects.all().delete()
+    FlowPercentiles.objects.bulk_create(rows, batch_size=SNAPSHOT_BATCH_SIZE)
+    return len(rows)
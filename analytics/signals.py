@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from activity.models import ActivityLog
+
+from .services import FLOW_ACTIONS, record_flow_event
+
+
+@receiver(post_save, sender=ActivityLog)
+def consume_task_flow_event(sender, instance, created, **kwargs):
+    if created and instance.action in FLOW_ACTIONS:
+        record_flow_event(instance)
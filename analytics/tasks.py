@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from core.replicas import replica_reads
+
+from .services import materialize_daily_snapshots, refresh_flow_percentiles
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def materialize_board_snapshots(self, full: bool = False) -> int:
+    snapshot_date = timezone.localdate()
+    rebuild_weekday = getattr(settings, "ANALYTICS_SNAPSHOT_REBUILD_WEEKDAY", None)
+    if rebuild_weekday is not None and snapshot_date.weekday() == rebuild_weekday:
+        full = True
+    written = materialize_daily_snapshots(snapshot_date, full=full)
+    logger.info("materialize_board_snapshots wrote %s rows for %s (full=%s)", written, snapshot_date, full)
+    return written
+
+
+@shared_task(bind=True)
+@replica_reads
+def refresh_flow_percentiles_task(self) -> int:
+    refreshed = refresh_flow_percentiles()
+    logger.info("refresh_flow_percentiles_task stored %s percentile rows", refreshed)
+    return refreshed
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from boards.models import Board, BoardList
+from projects.models import Project, ProjectMember
+from tasks.models import Task
+from tasks.services import move_task_to_list
+from teams.models import Team, TeamMember
+
+from .models import BoardListSnapshot, TaskFlowMetrics
+from .services import materialize_daily_snapshots, refresh_flow_percentiles
+
+User = get_user_model()
+
+
+class SnapshotAnalyticsTests(APITestCase):
+	def setUp(self):
+		self.user = User.objects.create_user(email="analyst@example.com", password="StrongPass123")
+		self.team = Team.objects.create(name="Team Alpha", description="", created_by=self.user)
+		TeamMember.objects.create(team=self.team, user=self.user, role=TeamMember.RoleChoices.OWNER)
+		self.project = Project.objects.create(team=self.team, name="Project A")
+		ProjectMember.objects.create(project=self.project, user=self.user, role=ProjectMember.RoleChoices.MANAGER)
+		self.board = Board.objects.create(project=self.project, name="Flow Board")
+		self.list_todo = BoardList.objects.get(board=self.board, name="Todo")
+		self.list_done = BoardList.objects.get(board=self.board, name="Done")
+		self.client.force_authenticate(self.user)
+
+	def test_incremental_run_recounts_touched_boards_and_carries_others(self):
+		other_project = Project.objects.create(team=self.team, name="Project B")
+		other_board = Board.objects.create(project=other_project, name="Quiet Board")
+		other_todo = BoardList.objects.get(board=other_board, name="Todo")
+		Task.objects.create(project=other_project, board_list=other_todo, title="Quiet", position=1)
+		task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Ship it", position=1)
+		day_one = date(2026, 1, 5)
+		materialize_daily_snapshots(day_one)
+
+		move_task_to_list(task, self.list_done)
+		day_two = day_one + timedelta(days=1)
+		materialize_daily_snapshots(day_two)
+
+		counts = dict(BoardListSnapshot.objects.filter(date=day_two).values_list("board_list_id", "task_count"))
+		self.assertEqual(counts[self.list_todo.id], 0)
+		self.assertEqual(counts[self.list_done.id], 1)
+		self.assertEqual(counts[other_todo.id], 1)
+
+		# A board created since, with no task activity yet, still gets its rows.
+		new_board = Board.objects.create(project=other_project, name="New Board")
+		day_three = day_two + timedelta(days=1)
+		materialize_daily_snapshots(day_three)
+		self.assertEqual(
+			BoardListSnapshot.objects.filter(board=new_board, date=day_three).count(),
+			BoardList.objects.filter(board=new_board).count(),
+		)
+
+	def test_cfd_and_burndown_endpoints_read_snapshots(self):
+		Task.objects.create(project=self.project, board_list=self.list_todo, title="Open", position=1)
+		Task.objects.create(project=self.project, board_list=self.list_done, title="Closed", position=1)
+		today = date(2026, 1, 5)
+		materialize_daily_snapshots(today)
+
+		params = {"start": today.isoformat(), "end": today.isoformat()}
+		response = self.client.get(reverse("analytics:board-cfd", args=[self.board.id]), params)
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(len(response.data["lists"]), 5)
+		self.assertEqual(response.data["series"][0]["counts"][str(self.list_todo.id)], 1)
+
+		response = self.client.get(reverse("analytics:board-burndown", args=[self.board.id]), params)
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		point = response.data["series"][0]
+		self.assertEqual((point["remaining"], point["done"], point["total"]), (1, 1, 2))
+
+	def test_task_moves_feed_flow_metrics_and_percentiles(self):
+		list_progress = BoardList.objects.get(board=self.board, name="Progress")
+		task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Flow", position=1)
+		Task.objects.filter(pk=task.pk).update(assigned_to=self.user)
+		move_task_to_list(task, list_progress)
+		move_task_to_list(task, self.list_done)
+
+		metrics = TaskFlowMetrics.objects.get(task=task)
+		self.assertIsNotNone(metrics.completed_at)
+		self.assertIsNotNone(metrics.lead_time_seconds)
+		self.assertEqual(task.list_intervals.filter(exited_at__isnull=True).get().board_list_id, self.list_done.id)
+		self.assertEqual(task.list_intervals.count(), 3)
+
+		refresh_flow_percentiles()
+		response = self.client.get(reverse("analytics:board-flow", args=[self.board.id]))
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(response.data["board"]["sample_size"], 1)
+		self.assertEqual(response.data["assignees"][0]["assignee"], self.user.id)
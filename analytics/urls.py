@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import BoardFlowView, BurndownView, CumulativeFlowView, TaskFlowView
+
+app_name = "analytics"
+
+urlpatterns = [
+    path("boards/<int:board_pk>/cfd/", CumulativeFlowView.as_view(), name="board-cfd"),
+    path("boards/<int:board_pk>/burndown/", BurndownView.as_view(), name="board-burndown"),
+    path("boards/<int:board_pk>/flow/", BoardFlowView.as_view(), name="board-flow"),
+    path("tasks/<int:task_pk>/flow/", TaskFlowView.as_view(), name="task-flow"),
+]
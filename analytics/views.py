@@ -0,0 +1,59 @@
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from boards.models import Board
+from core.views import AsyncAPIView
+from projects.permissions import IsProjectMember
+from tasks.models import Task
+
+from .models import FlowPercentiles, TaskFlowMetrics
+from .serializers import FlowPercentilesSerializer, SeriesQuerySerializer, TaskFlowMetricsSerializer
+from .services import aburndown_series, acumulative_flow_series
+
+
+class BoardSeriesView(AsyncAPIView):
+	permission_classes = (permissions.IsAuthenticated, IsProjectMember)
+	series_builder = None
+
+	async def get(self, request, board_pk):
+		board = await aget_object_or_404(Board.objects.alive().select_related("project"), pk=board_pk)
+		await self.acheck_object_permissions(request, board)
+		query = SeriesQuerySerializer(data=request.query_params)
+		query.is_valid(raise_exception=True)
+		return Response(await type(self).series_builder(board, **query.validated_data))
+
+
+class CumulativeFlowView(BoardSeriesView):
+	series_builder = staticmethod(acumulative_flow_series)
+
+
+class BurndownView(BoardSeriesView):
+	series_builder = staticmethod(aburndown_series)
+
+
+class BoardFlowView(AsyncAPIView):
+	permission_classes = (permissions.IsAuthenticated, IsProjectMember)
+
+	async def get(self, request, board_pk):
+		board = await aget_object_or_404(Board.objects.alive().select_related("project"), pk=board_pk)
+		await self.acheck_object_permissions(request, board)
+		rows = [row async for row in FlowPercentiles.objects.filter(board=board)]
+		board_row = next((row for row in rows if row.assignee_id is None), None)
+		return Response(
+			{
+				"board": FlowPercentilesSerializer(board_row).data if board_row else None,
+				"assignees": FlowPercentilesSerializer([row for row in rows if row.assignee_id], many=True).data,
+			}
+		)
+
+
+class TaskFlowView(APIView):
+	permission_classes = (permissions.IsAuthenticated, IsProjectMember)
+
+	def get(self, request, task_pk):
+		task = get_object_or_404(Task.objects.alive().select_related("project"), pk=task_pk)
+		self.check_object_permissions(request, task)
+		metrics = get_object_or_404(TaskFlowMetrics, task=task)
+		return Response(TaskFlowMetricsSerializer(metrics).data)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Board, BoardList
+from .models import Board, BoardList, PurgeJob
 
 
 class BoardListInline(admin.TabularInline):
@@ -10,13 +10,21 @@ class BoardListInline(admin.TabularInline):
 
 @admin.register(Board)
 class BoardAdmin(admin.ModelAdmin):
-	list_display = ("name", "project", "created_at")
+	list_display = ("name", "project", "is_template", "created_at", "deleted_at")
+	list_filter = ("is_template",)
 	search_fields = ("name", "project__name")
 	inlines = (BoardListInline,)
 
 
 @admin.register(BoardList)
 class BoardListAdmin(admin.ModelAdmin):
-	list_display = ("name", "board", "position")
+	list_display = ("name", "board", "position", "deleted_at")
 	list_editable = ("position",)
 	ordering = ("board", "position")
+
+
+@admin.register(PurgeJob)
+class PurgeJobAdmin(admin.ModelAdmin):
+	list_display = ("target_type", "target_id", "status", "batches", "requested_by", "created_at", "finished_at")
+	list_filter = ("target_type", "status")
+	readonly_fields = ("deleted_counts", "batches", "last_error", "created_at", "updated_at", "finished_at")
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0002_initial'),
+        ('projects', '0003_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurgeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('project', 'Project'), ('board', 'Board'), ('list', 'List')], max_length=20)),
+                ('target_id', models.PositiveBigIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('deleted_counts', models.JSONField(blank=True, default=dict)),
+                ('batches', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='board',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='boardlist',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='boardlist',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='board',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('project', 'name'), name='unique_live_board_name_per_project'),
+        ),
+        migrations.AddConstraint(
+            model_name='boardlist',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('board', 'name'), name='unique_live_list_name_per_board'),
+        ),
+        migrations.AddField(
+            model_name='purgejob',
+            name='requested_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purge_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='purgejob',
+            index=models.Index(fields=['status', 'updated_at'], name='boards_purg_status_70ccda_idx'),
+        ),
+    ]
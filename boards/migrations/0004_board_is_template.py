@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_soft_delete_and_purgejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='is_template',
+            field=models.BooleanField(default=False),
+        ),
+    ]
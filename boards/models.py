@@ -1,21 +1,43 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from core.models import SoftDeleteQuerySet
+
 
 DEFAULT_LISTS = ["Backlog", "Todo", "Progress", "Review", "Done"]
 
 
+class BoardQuerySet(SoftDeleteQuerySet):
+	alive_paths = ("", "project")
+
+
+class BoardListQuerySet(SoftDeleteQuerySet):
+	alive_paths = ("", "board", "board__project")
+
+
 class Board(models.Model):
 	project = models.ForeignKey("projects.Project", related_name="boards", on_delete=models.CASCADE)
 	name = models.CharField(max_length=150)
+	is_template = models.BooleanField(default=False)
 	created_at = models.DateTimeField(default=timezone.now)
 	updated_at = models.DateTimeField(auto_now=True)
+	deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+	objects = BoardQuerySet.as_manager()
 
 	class Meta:
-		unique_together = ("project", "name")
 		ordering = ("name",)
+		constraints = [
+			models.UniqueConstraint(
+				fields=("project", "name"),
+				condition=Q(deleted_at__isnull=True),
+				name="unique_live_board_name_per_project",
+			),
+		]
 
 	def __str__(self):
 		return f"{self.name} ({self.project_id})"
@@ -27,10 +49,58 @@ class BoardList(models.Model):
 	position = models.PositiveIntegerField(default=0)
 	created_at = models.DateTimeField(default=timezone.now)
 	updated_at = models.DateTimeField(auto_now=True)
+	deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+	objects = BoardListQuerySet.as_manager()
 
 	class Meta:
 		ordering = ("position", "id")
-		unique_together = ("board", "name")
+		constraints = [
+			models.UniqueConstraint(
+				fields=("board", "name"),
+				condition=Q(deleted_at__isnull=True),
+				name="unique_live_list_name_per_board",
+			),
+		]
 
 	def __str__(self):
 		return f"{self.name} [{self.board_id}]"
+
+
+class PurgeJob(models.Model):
+	"""Tracks the background removal of a soft-deleted project, board or list and its children."""
+
+	class TargetChoices(models.TextChoices):
+		PROJECT = "project", "Project"
+		BOARD = "board", "Board"
+		LIST = "list", "List"
+
+	class StatusChoices(models.TextChoices):
+		PENDING = "pending", "Pending"
+		RUNNING = "running", "Running"
+		COMPLETED = "completed", "Completed"
+		FAILED = "failed", "Failed"
+
+	target_type = models.CharField(max_length=20, choices=TargetChoices.choices)
+	target_id = models.PositiveBigIntegerField()
+	requested_by = models.ForeignKey(
+		settings.AUTH_USER_MODEL,
+		related_name="purge_jobs",
+		on_delete=models.SET_NULL,
+		null=True,
+		blank=True,
+	)
+	status = models.CharField(max_length=20, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+	deleted_counts = models.JSONField(default=dict, blank=True)
+	batches = models.PositiveIntegerField(default=0)
+	last_error = models.TextField(blank=True)
+	created_at = models.DateTimeField(default=timezone.now)
+	updated_at = models.DateTimeField(auto_now=True)
+	finished_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		ordering = ("-created_at",)
+		indexes = [models.Index(fields=("status", "updated_at"))]
+
+	def __str__(self):
+		return f"Purge {self.target_type} {self.target_id} ({self.status})"
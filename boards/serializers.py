@@ -9,7 +9,7 @@ from .models import Board, BoardList
 
 
 class ListSerializer(serializers.ModelSerializer):
-    board_id = serializers.PrimaryKeyRelatedField(source="board", queryset=Board.objects.all(), write_only=True)
+    board_id = serializers.PrimaryKeyRelatedField(source="board", queryset=Board.objects.alive(), write_only=True)
 
     class Meta:
         model = BoardList
@@ -19,13 +19,13 @@ class ListSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         board = validated_data["board"]
         if validated_data.get("position") is None:
-            next_position = board.lists.aggregate(max_pos=Max("position")).get("max_pos") or 0
+            next_position = board.lists.alive().aggregate(max_pos=Max("position")).get("max_pos") or 0
             validated_data["position"] = next_position + 1
         return super().create(validated_data)
 
 
 class BoardSerializer(serializers.ModelSerializer):
-    project_id = serializers.PrimaryKeyRelatedField(source="project", queryset=Project.objects.all())
+    project_id = serializers.PrimaryKeyRelatedField(source="project", queryset=Project.objects.alive())
     project = serializers.CharField(source="project.name", read_only=True)
     lists = ListSerializer(many=True, read_only=True)
 
@@ -36,8 +36,16 @@ class BoardSerializer(serializers.ModelSerializer):
             "project",
             "project_id",
             "name",
+            "is_template",
             "created_at",
             "updated_at",
             "lists",
         )
         read_only_fields = ("id", "project", "created_at", "updated_at", "lists")
+
+
+class BoardCloneSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=150)
+    project_id = serializers.PrimaryKeyRelatedField(source="project", queryset=Project.objects.alive(), required=False)
+    include_tasks = serializers.BooleanField(default=True)
+    as_template = serializers.BooleanField(default=False)
@@ -1,26 +1,47 @@
 from __future__ import annotations
 
+import time
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from activity.services import create_activity_log
+from analytics.models import BoardListSnapshot, TaskFlowMetrics, TaskListInterval
+from core.dispatch import enqueue
+from projects.models import Project, ProjectMember
+from projects.services import add_project_member
+from tasks.models import ArchivedTask, Subtask, Task
+
+from .models import Board, BoardList, DEFAULT_LISTS, PurgeJob
 
-from .models import Board, BoardList, DEFAULT_LISTS
+CLONE_CHUNK_SIZE = 1000
+
+PURGE_TARGETS = {
+    Project: PurgeJob.TargetChoices.PROJECT,
+    Board: PurgeJob.TargetChoices.BOARD,
+    BoardList: PurgeJob.TargetChoices.LIST,
+}
 
 
 def ensure_default_lists(board: Board) -> None:
-    if board.lists.exists():
-        return
-    for index, name in enumerate(DEFAULT_LISTS, start=1):
-        BoardList.objects.create(board=board, name=name, position=index)
+    # A single INSERT; lists that already exist on the board are left untouched.
+    BoardList.objects.bulk_create(
+        [BoardList(board=board, name=name, position=index) for index, name in enumerate(DEFAULT_LISTS, start=1)],
+        ignore_conflicts=True,
+    )
 
 
 @transaction.atomic
 def reorder_board_lists(board: Board, ordered_ids: list[int]) -> None:
-    existing_ids = list(board.lists.values_list("id", flat=True))
+    existing_ids = list(board.lists.alive().values_list("id", flat=True))
     if len(ordered_ids) != len(existing_ids) or set(existing_ids) != set(ordered_ids):
         raise ValidationError("Order must include all board lists.")
 
     ordering_map = {item_id: idx for idx, item_id in enumerate(ordered_ids, start=1)}
-    lists = board.lists.all()
+    lists = board.lists.alive()
     for board_list in lists:
         new_position = ordering_map.get(board_list.id)
         if new_position is None:
@@ -28,3 +49,231 @@ def reorder_board_lists(board: Board, ordered_ids: list[int]) -> None:
         if board_list.position != new_position:
             board_list.position = new_position
             board_list.save(update_fields=["position"])
+
+
+def soft_delete(instance, *, user=None) -> PurgeJob:
+    """
+    Hide a project, board or list immediately and leave the actual removal to a purge job.
+
+    Every visibility queryset filters on ``deleted_at`` (directly or through the
+    parent chain), so the row and everything below it disappear from the API as soon
+    as this commits; the rows themselves are deleted in batches by Celery.
+    """
+    from .tasks import purge_deleted_object
+
+    model = type(instance)
+    now = timezone.now()
+    with transaction.atomic():
+        model.objects.filter(pk=instance.pk, deleted_at__isnull=True).update(deleted_at=now)
+        instance.deleted_at = now
+        job = PurgeJob.objects.create(target_type=PURGE_TARGETS[model], target_id=instance.pk, requested_by=user)
+        enqueue(purge_deleted_object, job.pk)
+    return job
+
+
+def _purge_plan(job: PurgeJob) -> tuple[list[QuerySet], QuerySet]:
+    """Children drained batch by batch, heaviest fan-out first, then the soft-deleted row itself."""
+    target_id = job.target_id
+    if job.target_type == PurgeJob.TargetChoices.LIST:
+        scope = {"board_list_id": target_id}
+        final = BoardList.objects.filter(pk=target_id)
+    elif job.target_type == PurgeJob.TargetChoices.BOARD:
+        scope = {"board_list__board_id": target_id}
+        final = Board.objects.filter(pk=target_id)
+    else:
+        scope = {"board_list__board__project_id": target_id}
+        final = Project.objects.filter(pk=target_id)
+
+    drains = [
+        # Deleting tasks cascades to subtasks, comments and attachments; attachment
+        # signals release blobs and queue file removal for each batch.
+        Task.objects.filter(**scope),
+        ArchivedTask.objects.filter(**scope),
+        TaskListInterval.objects.filter(**scope),
+        BoardListSnapshot.objects.filter(**scope),
+    ]
+    if job.target_type != PurgeJob.TargetChoices.LIST:
+        board_scope = {"board_id": target_id} if job.target_type == PurgeJob.TargetChoices.BOARD else {"board__project_id": target_id}
+        drains.append(TaskFlowMetrics.objects.filter(**board_scope))
+    if job.target_type == PurgeJob.TargetChoices.PROJECT:
+        drains.append(Task.objects.filter(project_id=target_id))
+        drains.append(ArchivedTask.objects.filter(project_id=target_id))
+    return drains, final
+
+
+def _record_progress(job: PurgeJob, per_model: dict[str, int]) -> None:
+    counts = dict(job.deleted_counts)
+    for label, deleted in per_model.items():
+        counts[label] = counts.get(label, 0) + deleted
+    job.deleted_counts = counts
+    job.batches += 1
+    job.save(update_fields=["deleted_counts", "batches", "updated_at"])
+
+
+def _delete_batch(queryset: QuerySet, batch_size: int) -> dict[str, int] | None:
+    ids = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+    if not ids:
+        return None
+    with transaction.atomic():
+        _total, per_model = queryset.model.objects.filter(pk__in=ids).delete()
+    return per_model
+
+
+def run_purge_job(job_id: int, *, time_budget: float | None = None, batch_size: int | None = None) -> bool:
+    """
+    Delete a purge job's rows in bounded transactions until done or ``time_budget`` runs out.
+
+    Returns ``True`` once the job has completed. Progress is stored after every batch,
+    and because each batch simply drains what is left, an interrupted job resumes by
+    running again.
+    """
+    time_budget = settings.PURGE_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    job = PurgeJob.objects.get(pk=job_id)
+    if job.status == PurgeJob.StatusChoices.COMPLETED:
+        return True
+
+    drains, final = _purge_plan(job)
+    if final.filter(deleted_at__isnull=True).exists():
+        job.status = PurgeJob.StatusChoices.FAILED
+        job.last_error = "Target is no longer marked as deleted."
+        job.save(update_fields=["status", "last_error", "updated_at"])
+        return True
+
+    job.status = PurgeJob.StatusChoices.RUNNING
+    job.save(update_fields=["status", "updated_at"])
+    deadline = time.monotonic() + time_budget
+    try:
+        for queryset in drains:
+            while (per_model := _delete_batch(queryset, batch_size)) is not None:
+                _record_progress(job, per_model)
+                if time.monotonic() >= deadline:
+                    return False
+        with transaction.atomic():
+            _total, per_model = final.delete()
+        _record_progress(job, per_model)
+    except Exception as exc:
+        # The job stays RUNNING: the task retries transient database errors with backoff,
+        # and resume_stalled_purges re-enqueues anything still unfinished after that.
+        job.last_error = str(exc)
+        job.save(update_fields=["last_error", "updated_at"])
+        raise
+
+    job.status = PurgeJob.StatusChoices.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "updated_at"])
+    return True
+
+
+def _clone_tasks(source: Board, project_id: int, list_map: dict[int, int]) -> int:
+    """Copy the source board's tasks and subtasks chunk by chunk, remapping lists and tasks in memory."""
+    list_names = dict(BoardList.objects.filter(pk__in=list_map.values()).values_list("id", "name"))
+    source_tasks = Task.objects.filter(board_list_id__in=list_map).order_by("id")
+    copied = 0
+    last_id = 0
+    while True:
+        chunk = list(
+            source_tasks.filter(id__gt=last_id).values(
+                "id", "board_list_id", "title", "description", "priority", "position", "tags"
+            )[:CLONE_CHUNK_SIZE]
+        )
+        if not chunk:
+            return copied
+        last_id = chunk[-1]["id"]
+        now = timezone.now()
+        # Assignees and due dates belong to the original sprint, not the copy.
+        clones = Task.objects.bulk_create(
+            [
+                Task(
+                    project_id=project_id,
+                    board_list_id=list_map[row["board_list_id"]],
+                    title=row["title"],
+                    description=row["description"],
+                    priority=row["priority"],
+                    status=list_names[list_map[row["board_list_id"]]],
+                    position=row["position"],
+                    tags=row["tags"],
+                    created_at=now,
+                )
+                for row in chunk
+            ]
+        )
+        task_map = {row["id"]: clone.pk for row, clone in zip(chunk, clones)}
+        Subtask.objects.bulk_create(
+            [
+                Subtask(task_id=task_map[row["task_id"]], title=row["title"], description=row["description"], position=row["position"])
+                for row in Subtask.objects.filter(task_id__in=task_map)
+                .order_by("task_id", "position", "id")
+                .values("task_id", "title", "description", "position")
+            ],
+            batch_size=CLONE_CHUNK_SIZE,
+        )
+        copied += len(clones)
+
+
+def _copy_board(source: Board, *, project_id: int, name: str, include_tasks: bool, is_template: bool) -> tuple[Board, int]:
+    # bulk_create skips post_save, so the copy does not also receive the default lists.
+    board = Board.objects.bulk_create([Board(project_id=project_id, name=name, is_template=is_template)])[0]
+    source_lists = list(
+        BoardList.objects.filter(board=source, deleted_at__isnull=True).order_by("position", "id").values("id", "name", "position")
+    )
+    clones = BoardList.objects.bulk_create(
+        [BoardList(board=board, name=row["name"], position=row["position"]) for row in source_lists]
+    )
+    list_map = {row["id"]: clone.pk for row, clone in zip(source_lists, clones)}
+    copied = _clone_tasks(source, project_id, list_map) if include_tasks else 0
+    return board, copied
+
+
+def _check_free_name(queryset, name: str, label: str) -> None:
+    if queryset.alive().filter(name=name).exists():
+        raise ValidationError(f"A {label} named '{name}' already exists.")
+
+
+@transaction.atomic
+def clone_board(
+    source: Board,
+    *,
+    project: Project | None = None,
+    name: str,
+    include_tasks: bool = True,
+    is_template: bool = False,
+    user=None,
+) -> Board:
+    """
+    Copy a board with its lists and, optionally, tasks and subtasks using set-based inserts.
+
+    Per-row save signals are bypassed; a single ``board_cloned`` activity entry is
+    written instead so activity feeds and the nightly snapshots pick the board up.
+    """
+    project = project or source.project
+    _check_free_name(Board.objects.filter(project=project), name, "board")
+    board, copied = _copy_board(source, project_id=project.pk, name=name, include_tasks=include_tasks, is_template=is_template)
+    create_activity_log(
+        user=user,
+        action="board_cloned",
+        target=board,
+        metadata={"project_id": str(project.pk), "source_board": str(source.pk), "tasks": copied},
+    )
+    return board
+
+
+@transaction.atomic
+def clone_project(source: Project, *, name: str, user, include_tasks: bool = True) -> Project:
+    """Copy a project and every live board in it; ``user`` becomes manager of the copy."""
+    _check_free_name(Project.objects.filter(team_id=source.team_id), name, "project")
+    project = Project.objects.create(team_id=source.team_id, name=name, description=source.description)
+    add_project_member(project=project, user=user, role=ProjectMember.RoleChoices.MANAGER)
+    copied = 0
+    for board in Board.objects.filter(project=source, deleted_at__isnull=True).order_by("id"):
+        _board, board_tasks = _copy_board(
+            board, project_id=project.pk, name=board.name, include_tasks=include_tasks, is_template=board.is_template
+        )
+        copied += board_tasks
+    create_activity_log(
+        user=user,
+        action="project_cloned",
+        target=project,
+        metadata={"project_id": str(project.pk), "source_project": str(source.pk), "tasks": copied},
+    )
+    return project
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import PurgeJob
+from .services import run_purge_job
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, autoretry_for=(DatabaseError,), retry_backoff=True, retry_kwargs={"max_retries": 5})
+def purge_deleted_object(self, job_id: int) -> bool:
+    finished = run_purge_job(job_id)
+    if not finished:
+        # Hand the worker back between slices so one huge board cannot monopolise it.
+        purge_deleted_object.delay(job_id)
+    return finished
+
+
+@shared_task(bind=True)
+def resume_stalled_purges(self) -> int:
+    """Re-enqueue purge jobs whose worker died or whose message was lost."""
+    cutoff = timezone.now() - timedelta(minutes=settings.PURGE_STALL_MINUTES)
+    stalled = list(
+        PurgeJob.objects.filter(
+            status__in=(PurgeJob.StatusChoices.PENDING, PurgeJob.StatusChoices.RUNNING),
+            updated_at__lt=cutoff,
+        ).values_list("id", flat=True)
+    )
+    for job_id in stalled:
+        purge_deleted_object.delay(job_id)
+    if stalled:
+        logger.info("resume_stalled_purges re-enqueued %s jobs", len(stalled))
+    return len(stalled)
@@ -1,11 +1,20 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from activity.models import ActivityLog
+from comments.models import Comment
 from projects.models import Project, ProjectMember
+from tasks.models import Subtask, Task
 from teams.models import Team, TeamMember
-from .models import Board, BoardList
+from .models import Board, BoardList, PurgeJob
+from .services import _delete_batch, run_purge_job, soft_delete
 
 User = get_user_model()
 
@@ -37,3 +46,74 @@ class BoardApiTests(APITestCase):
 		self.assertEqual(response.status_code, status.HTTP_200_OK)
 		first_list = BoardList.objects.get(id=order[0])
 		self.assertEqual(first_list.position, 1)
+
+	def test_clone_board_copies_lists_and_tasks_into_another_project(self):
+		source = Board.objects.create(project=self.project, name="Sprint Template", is_template=True)
+		todo = source.lists.get(name="Todo")
+		source.lists.filter(name="Review").update(deleted_at=timezone.now())
+		task = Task.objects.create(project=self.project, board_list=todo, title="Write spec", position=1, tags=["docs"])
+		Task.objects.filter(pk=task.pk).update(assigned_to=self.user)
+		Subtask.objects.create(task=task, title="Outline", completed=True)
+		target = Project.objects.create(team=self.team, name="Project B")
+		ProjectMember.objects.create(project=target, user=self.user, role=ProjectMember.RoleChoices.MANAGER)
+
+		url = reverse("boards:board-clone", args=[source.id])
+		response = self.client.post(url, {"name": "Sprint 12", "project_id": target.id}, format="json")
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		clone = Board.objects.get(pk=response.data["id"])
+		self.assertEqual(clone.project_id, target.id)
+		self.assertFalse(clone.is_template)
+		self.assertEqual(len(response.data["lists"]), 4)
+		copied = Task.objects.get(board_list__board=clone)
+		self.assertEqual((copied.project_id, copied.board_list.name, copied.tags), (target.id, "Todo", ["docs"]))
+		self.assertIsNone(copied.assigned_to_id)
+		self.assertEqual(list(copied.subtasks.values_list("title", "completed")), [("Outline", False)])
+		self.assertTrue(ActivityLog.objects.filter(action="board_cloned", target_id=str(clone.id)).exists())
+
+		duplicate = self.client.post(url, {"name": "Sprint 12", "project_id": target.id}, format="json")
+		self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+
+	@override_settings(PURGE_BATCH_SIZE=2)
+	def test_board_delete_hides_immediately_and_purges_in_batches(self):
+		board = Board.objects.create(project=self.project, name="Legacy")
+		todo = board.lists.get(name="Todo")
+		for index in range(5):
+			task = Task.objects.create(project=self.project, board_list=todo, title=f"Old {index}", position=index)
+			Subtask.objects.create(task=task, title="Step")
+			Comment.objects.create(task=task, user=self.user, text="Note")
+
+		with self.captureOnCommitCallbacks() as callbacks:
+			response = self.client.delete(reverse("boards:board-detail", args=[board.id]))
+		self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+		self.assertTrue(Board.objects.filter(pk=board.id).exists())
+		self.assertEqual(self.client.get(reverse("boards:board-detail", args=[board.id])).status_code, status.HTTP_404_NOT_FOUND)
+		self.assertEqual(self.client.get(reverse("tasks:tasks-list")).data["count"], 0)
+		recreated = self.client.post(reverse("boards:board-list"), {"project_id": self.project.id, "name": "Legacy"}, format="json")
+		self.assertEqual(recreated.status_code, status.HTTP_201_CREATED)
+
+		for callback in callbacks:
+			callback()
+		job = PurgeJob.objects.get(pk=response.data["purge_job"])
+		self.assertEqual(job.status, PurgeJob.StatusChoices.COMPLETED)
+		self.assertEqual(job.deleted_counts["tasks.Task"], 5)
+		self.assertEqual(job.deleted_counts["comments.Comment"], 5)
+		self.assertGreaterEqual(job.batches, 3)
+		self.assertFalse(Board.objects.filter(pk=board.id).exists())
+		self.assertFalse(Subtask.objects.exists())
+
+	def test_purge_interrupted_by_a_database_error_stays_resumable(self):
+		board = Board.objects.create(project=self.project, name="Flaky")
+		Task.objects.create(project=self.project, board_list=board.lists.get(name="Todo"), title="Old", position=1)
+		with self.captureOnCommitCallbacks():
+			job = soft_delete(board, user=self.user)
+
+		with mock.patch("boards.services._delete_batch", side_effect=[OperationalError("deadlock detected"), _delete_batch]):
+			with self.assertRaises(OperationalError):
+				run_purge_job(job.id)
+		job.refresh_from_db()
+		self.assertEqual((job.status, job.last_error), (PurgeJob.StatusChoices.RUNNING, "deadlock detected"))
+
+		self.assertTrue(run_purge_job(job.id))
+		job.refresh_from_db()
+		self.assertEqual(job.status, PurgeJob.StatusChoices.COMPLETED)
+		self.assertFalse(Board.objects.filter(pk=board.id).exists())
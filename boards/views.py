@@ -1,6 +1,8 @@
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -9,19 +11,33 @@ from projects.models import ProjectMember
 from projects.permissions import IsProjectManager, IsProjectMember
 
 from .models import Board, BoardList
-from .serializers import BoardSerializer, ListSerializer
-from .services import reorder_board_lists
+from .serializers import BoardCloneSerializer, BoardSerializer, ListSerializer
+from .services import clone_board, reorder_board_lists, soft_delete
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+def live_lists_prefetch():
+	return Prefetch("lists", queryset=BoardList.objects.filter(deleted_at__isnull=True))
+
+
+class SoftDeleteMixin:
+	"""Destroy marks the row deleted and returns 202 while a purge job removes it in the background."""
+
+	def destroy(self, request, *args, **kwargs):
+		instance = self.get_object()
+		job = soft_delete(instance, user=request.user)
+		return Response({"purge_job": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class BoardViewSet(SoftDeleteMixin, viewsets.ModelViewSet):
 	serializer_class = BoardSerializer
 	permission_classes = (permissions.IsAuthenticated,)
 
 	def get_queryset(self):
 		return (
-			Board.objects.filter(project__members__user=self.request.user)
+			Board.objects.alive()
+			.filter(project__members__user=self.request.user)
 			.select_related("project")
-			.prefetch_related("lists")
+			.prefetch_related(live_lists_prefetch())
 			.distinct()
 		)
 
@@ -52,13 +68,39 @@ class BoardViewSet(viewsets.ModelViewSet):
 			raise PermissionDenied("Only project managers can update boards.")
 		serializer.save()
 
-
-class ListViewSet(viewsets.ModelViewSet):
+	@action(detail=True, methods=["post"])
+	def clone(self, request, pk=None):
+		source = self.get_object()
+		serializer = BoardCloneSerializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+		project = serializer.validated_data.get("project") or source.project
+		if not ProjectMember.objects.filter(
+			project=project,
+			user=request.user,
+			role=ProjectMember.RoleChoices.MANAGER,
+		).exists():
+			raise PermissionDenied("Only project managers can clone boards into a project.")
+		try:
+			board = clone_board(
+				source,
+				project=project,
+				name=serializer.validated_data["name"],
+				include_tasks=serializer.validated_data["include_tasks"],
+				is_template=serializer.validated_data["as_template"],
+				user=request.user,
+			)
+		except DjangoValidationError as exc:
+			raise ValidationError(exc.message or str(exc)) from exc
+		board = Board.objects.select_related("project").prefetch_related(live_lists_prefetch()).get(pk=board.pk)
+		return Response(BoardSerializer(board, context={"request": request}).data, status=status.HTTP_201_CREATED)
+
+
+class ListViewSet(SoftDeleteMixin, viewsets.ModelViewSet):
 	serializer_class = ListSerializer
 	permission_classes = (permissions.IsAuthenticated,)
 
 	def get_queryset(self):
-		queryset = BoardList.objects.filter(board__project__members__user=self.request.user).select_related("board")
+		queryset = BoardList.objects.alive().filter(board__project__members__user=self.request.user).select_related("board")
 		board_id = self.request.query_params.get("board")
 		if board_id:
 			queryset = queryset.filter(board_id=board_id)
@@ -96,7 +138,7 @@ class ReorderListsView(APIView):
 	permission_classes = (permissions.IsAuthenticated, IsProjectManager)
 
 	def post(self, request, board_id):
-		board = get_object_or_404(Board, pk=board_id)
+		board = get_object_or_404(Board.objects.alive(), pk=board_id)
 		self.check_object_permissions(request, board)
 		order = request.data.get("order")
 		if not isinstance(order, list) or not order:
@@ -105,5 +147,6 @@ class ReorderListsView(APIView):
 			reorder_board_lists(board=board, ordered_ids=[int(item) for item in order])
 		except (ValueError, DjangoValidationError) as exc:
 			raise ValidationError(str(exc)) from exc
+		board = Board.objects.prefetch_related(live_lists_prefetch()).get(pk=board.pk)
 		serializer = BoardSerializer(board, context={"request": request})
 		return Response(serializer.data, status=status.HTTP_200_OK)
@@ -24,6 +24,7 @@ class CommentAttachment(models.Model):
 	comment = models.ForeignKey(Comment, related_name="attachments", on_delete=models.CASCADE)
 	file = models.FileField(upload_to="comment_attachments/%Y/%m/%d")
 	filename = models.CharField(max_length=255, blank=True)
+	blob = models.ForeignKey("uploads.Blob", related_name="comment_attachments", on_delete=models.PROTECT, null=True, blank=True)
 	created_at = models.DateTimeField(default=timezone.now)
 
 	def save(self, *args, **kwargs):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from django.urls import reverse
 from rest_framework import serializers
 
 from tasks.models import Task
@@ -8,15 +9,28 @@ from .models import Comment, CommentAttachment
 
 class CommentAttachmentSerializer(serializers.ModelSerializer):
     file = serializers.FileField(write_only=True)
+    size = serializers.IntegerField(source="blob.size", read_only=True, allow_null=True)
+    mime_type = serializers.CharField(source="blob.mime_type", read_only=True, allow_null=True)
+    checksum = serializers.CharField(source="blob.sha256", read_only=True, allow_null=True)
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = CommentAttachment
-        fields = ("id", "file", "filename", "created_at")
+        fields = ("id", "file", "filename", "size", "mime_type", "checksum", "renditions", "created_at")
         read_only_fields = ("id", "filename", "created_at")
 
+    def get_renditions(self, obj):
+        if obj.blob is None or not obj.blob.renditions:
+            return {}
+        url = reverse("comments:attachment-download", args=[obj.pk])
+        request = self.context.get("request")
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return {label: f"{url}?rendition={label}" for label in obj.blob.renditions}
+
 
 class CommentSerializer(serializers.ModelSerializer):
-    task_id = serializers.PrimaryKeyRelatedField(source="task", queryset=Task.objects.all(), write_only=True)
+    task_id = serializers.PrimaryKeyRelatedField(source="task", queryset=Task.objects.alive(), write_only=True)
     attachments = CommentAttachmentSerializer(many=True, read_only=True)
 
     class Meta:
@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import CommentViewSet
+from .views import CommentViewSet, download_comment_attachment_view
 
 router = DefaultRouter()
 router.register(r"", CommentViewSet, basename="comments")
@@ -9,5 +9,6 @@ router.register(r"", CommentViewSet, basename="comments")
 app_name = "comments"
 
 urlpatterns = [
+    path("attachments/<int:pk>/download/", download_comment_attachment_view, name="attachment-download"),
     path("", include(router.urls)),
 ]
@@ -1,17 +1,21 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 
+from core.media import attachment_download_response
 from projects.permissions import IsProjectMember, IsProjectManager
-from tasks.models import Task
+from tasks.models import Task, task_alive_q
 
-from .models import Comment
+from .models import Comment, CommentAttachment
 from .serializers import CommentSerializer, CommentAttachmentSerializer
 
 
 class CommentViewSet(viewsets.ModelViewSet):
-	queryset = Comment.objects.all().select_related("task", "user").prefetch_related("attachments")
+	queryset = Comment.objects.all().select_related("task", "user").prefetch_related(
+		Prefetch("attachments", queryset=CommentAttachment.objects.select_related("blob"))
+	)
 	serializer_class = CommentSerializer
 
 	def get_permissions(self):
@@ -23,13 +27,25 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 	def get_queryset(self):
 		# allow listing of comments for tasks within projects user belongs to
-		return Comment.objects.filter(task__project__members__user=self.request.user).distinct()
+		return self.queryset.filter(task_alive_q("task__"), task__project__members__user=self.request.user).distinct()
 
 	@action(detail=False, methods=["get"], url_path="task/(?P<task_pk>[^/.]+)")
 	def list_for_task(self, request, task_pk=None):
-		task = get_object_or_404(Task, pk=task_pk)
+		task = get_object_or_404(Task.objects.alive(), pk=task_pk)
 		# permission check; IsProjectMember will be enforced via viewset
 		comments = self.get_queryset().filter(task=task)
 		serializer = self.get_serializer(comments, many=True, context={"request": request})
 		return Response(serializer.data)
 
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def download_comment_attachment_view(request, pk):
+	attachment = get_object_or_404(
+		CommentAttachment.objects.select_related("blob")
+		.only("file", "filename", "blob__renditions")
+		.filter(task_alive_q("comment__task__")),
+		pk=pk,
+		comment__task__project__members__user=request.user,
+	)
+	return attachment_download_response(attachment, request.query_params.get("rendition"))
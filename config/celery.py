@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -11,6 +12,27 @@ app.autodiscover_tasks()
 import core.email  # noqa: E402,F401
 
 
-@app.task(bind=True)
+@worker_process_init.connect
+def reset_database_pools(**kwargs):
+    """Give each prefork child its own connection pool instead of sockets inherited from the parent."""
+    from django.db import connections
+
+    for connection in connections.all():
+        pools = getattr(connection, "_connection_pools", None)
+        # Dropped, not closed: closing would terminate the parent's sessions.
+        if pools is not None:
+            pools.pop(connection.alias, None)
+
+
+@worker_process_shutdown.connect
+def close_database_pools(**kwargs):
+    from django.db import connections
+
+    for connection in connections.all():
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+
+
+@app.task(bind=True, ignore_result=False)
 def healthcheck(self):
     return "healthy"
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from pathlib import Path
+from celery.schedules import crontab
 from django.core.exceptions import ImproperlyConfigured
 import os
 import sys
@@ -11,6 +12,12 @@ except Exception:  # pragma: no cover - package not installed
     environ = None
     HAS_ENVIRON = False
 
+try:
+    import msgpack  # noqa: F401
+    HAS_MSGPACK = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAS_MSGPACK = False
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 if HAS_ENVIRON:
@@ -56,6 +63,26 @@ else:
             # Return raw DATABASE_URL string; DATABASES fallback used below.
             return os.environ.get(key, default)
 
+        def db_url_config(self, url):
+            from urllib.parse import urlparse
+
+            parsed = urlparse(url)
+            scheme = parsed.scheme
+            if scheme.startswith("postgres"):
+                engine = "django.db.backends.postgresql"
+            elif scheme.startswith("mysql"):
+                engine = "django.db.backends.mysql"
+            else:
+                engine = "django.db.backends.sqlite3"
+            return {
+                "ENGINE": engine,
+                "NAME": parsed.path[1:] if parsed.path else "",
+                "USER": parsed.username,
+                "PASSWORD": parsed.password,
+                "HOST": parsed.hostname,
+                "PORT": parsed.port,
+            }
+
     env = DummyEnv()
 
 SECRET_KEY = env("SECRET_KEY", default="change-me")
@@ -86,6 +113,8 @@ INSTALLED_APPS = [
     "comments",
     "activity",
     "notifications",
+    "analytics",
+    "uploads",
 ]
 
 MIDDLEWARE = [
@@ -98,8 +127,17 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.throttling.RateLimitHeadersMiddleware",
+    "core.replicas.ReplicaRoutingMiddleware",
 ]
 
+# "asgi" when the app is served by uvicorn workers through config.asgi. WhiteNoise only has
+# a sync code path, and a single sync middleware makes every async view hop through a
+# thread, so in that mode nginx serves /static/ on its own.
+SERVER_MODE = env("SERVER_MODE", default="wsgi")
+if SERVER_MODE == "asgi":
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -119,6 +157,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 if HAS_ENVIRON:
     DATABASES = {
@@ -128,33 +167,7 @@ else:
 
     db_url = env.db("DATABASE_URL", default=None)
     if db_url:
-
-        from urllib.parse import urlparse
-
-        parsed = urlparse(db_url)
-        db_name = parsed.path[1:] if parsed.path else ""
-        db_user = parsed.username
-        db_pass = parsed.password
-        db_host = parsed.hostname
-        db_port = parsed.port
-        scheme = parsed.scheme
-        if scheme.startswith("postgres"):
-            engine = "django.db.backends.postgresql"
-        elif scheme.startswith("mysql"):
-            engine = "django.db.backends.mysql"
-        else:
-            engine = "django.db.backends.sqlite3"
-
-        DATABASES = {
-            "default": {
-                "ENGINE": engine,
-                "NAME": db_name,
-                "USER": db_user,
-                "PASSWORD": db_pass,
-                "HOST": db_host,
-                "PORT": db_port,
-            }
-        }
+        DATABASES = {"default": env.db_url_config(db_url)}
     else:
         DATABASES = {
             "default": {
@@ -163,6 +176,44 @@ else:
             }
         }
 
+# Read replicas, one connection URL each. Safe-method API requests and jobs marked with
+# core.replicas.replica_reads read from a random replica; a client that just wrote keeps
+# reading from the primary for DATABASE_REPLICA_PIN_SECONDS so it sees its own changes.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+# The test suite gets a "replica" alias mirroring the test database, which core.tests
+# routes reads to; it only becomes a replica where a test lists it in DATABASE_REPLICAS.
+if "test" in sys.argv and not DATABASE_REPLICAS:
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
+
+# Postgres connections come from a per-process psycopg 3 pool, so requests and Celery tasks
+# borrow an open connection instead of paying the TCP and auth handshake each time. Each
+# gunicorn worker and each Celery child holds its own pool per database (see config/celery.py);
+# size it so that processes x DB_POOL_MAX_SIZE stays under the server's max_connections. With
+# DB_POOL disabled, connections are kept open per thread for DB_CONN_MAX_AGE seconds.
+for database in DATABASES.values():
+    if database["ENGINE"] != "django.db.backends.postgresql":
+        continue
+    if env.bool("DB_POOL", default=True):
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=1),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "timeout": env.int("DB_POOL_TIMEOUT_SECONDS", default=10),
+            "max_idle": env.int("DB_POOL_MAX_IDLE_SECONDS", default=10 * 60),
+            "max_lifetime": env.int("DB_POOL_MAX_LIFETIME_SECONDS", default=60 * 60),
+        }
+        database["CONN_MAX_AGE"] = 0
+    else:
+        database["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+    # With a pool this validates each connection as it is handed out, so one dropped by the
+    # server or a failover is replaced instead of failing the request.
+    database["CONN_HEALTH_CHECKS"] = True
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -190,6 +241,9 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Let nginx serve authorized downloads from its internal location instead of streaming them through Django.
+MEDIA_ACCEL_REDIRECT = env.bool("MEDIA_ACCEL_REDIRECT", default=not DEBUG)
+MEDIA_ACCEL_PREFIX = env.str("MEDIA_ACCEL_PREFIX", default="/protected-media/")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
@@ -197,7 +251,7 @@ AUTH_USER_MODEL = "users.User"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -207,19 +261,37 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.PageNumberPagination",
     "PAGE_SIZE": 25,
+    # orjson encodes and decodes JSON; MessagePack is only sent to clients that ask for it
+    # with ``Accept: application/msgpack``, since */* picks the first renderer.
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *(("core.renderers.MessagePackRenderer",) if HAS_MSGPACK else ()),
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 
 REST_FRAMEWORK.update({
+    # Sliding-window limits evaluated by one Redis script per request. Views opt into an
+    # extra budget with ``throttle_scope``; every scope below needs a rate.
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core.throttling.AnonSlidingWindowThrottle",
+        "core.throttling.UserSlidingWindowThrottle",
+        "core.throttling.ScopedSlidingWindowThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
         "anon": env.str("THROTTLE_ANON_PER_MIN", default="10/min"),
         "user": env.str("THROTTLE_USER_PER_MIN", default="100/min"),
+        "task_moves": env.str("THROTTLE_TASK_MOVES", default="60/min"),
+        "search": env.str("THROTTLE_SEARCH", default="30/min"),
+        "uploads": env.str("THROTTLE_UPLOADS", default="600/min"),
     },
 })
 
@@ -236,7 +308,17 @@ SIMPLE_JWT = {
 SIMPLE_JWT.update({
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    # Checks the blacklist in per-day Redis sets before falling back to the database.
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.CachedTokenRefreshSerializer",
 })
+# Expired outstanding/blacklisted refresh tokens are deleted by a beat job in batches of this size.
+TOKEN_PURGE_BATCH_SIZE = env.int("TOKEN_PURGE_BATCH_SIZE", default=1000)
+
+# JWT-authenticated requests resolve their user from a short-lived per-process LRU and the
+# shared cache; user saves invalidate both, other processes' LRUs expire within seconds.
+AUTH_USER_CACHE_TTL_SECONDS = env.int("AUTH_USER_CACHE_TTL_SECONDS", default=300)
+AUTH_USER_LOCAL_CACHE_TTL_SECONDS = env.int("AUTH_USER_LOCAL_CACHE_TTL_SECONDS", default=5)
+AUTH_USER_LOCAL_CACHE_SIZE = env.int("AUTH_USER_LOCAL_CACHE_SIZE", default=1024)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Kanban Manager API",
@@ -282,13 +364,148 @@ CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="redis://redis:6379/0")
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default="redis://redis:6379/0")
 CELERY_TASK_SERIALIZER = "json"
 CELERY_ACCEPT_CONTENT = ["json"]
+# Nothing reads task return values; tasks that need them opt back in with ignore_result=False.
+CELERY_TASK_IGNORE_RESULT = True
+# Each workload has its own queue and worker service (see docker-compose.yml), so a slow SMTP
+# server or a long sweep never holds up in-app notifications. Unrouted tasks use "default".
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "core.email.*": {"queue": "email"},
+    "notifications.tasks.send_welcome_email": {"queue": "email"},
+    "notifications.tasks.send_task_assigned_email": {"queue": "email"},
+    "notifications.tasks.send_task_due_soon_email": {"queue": "email"},
+    "users.tasks.send_welcome_email": {"queue": "email"},
+    "notifications.tasks.send_task_assigned_notification": {"queue": "notifications", "priority": 0},
+    "notifications.tasks.send_task_due_soon_notification": {"queue": "notifications"},
+    "users.tasks.notify_profile_updated": {"queue": "notifications"},
+    "analytics.tasks.*": {"queue": "analytics"},
+    "notifications.tasks.dispatch_due_reminders": {"queue": "notifications"},
+    "notifications.tasks.check_due_soon_tasks": {"queue": "maintenance"},
+    "notifications.tasks.rebuild_due_reminders": {"queue": "maintenance"},
+    "notifications.tasks.reconcile_unread_counts_task": {"queue": "maintenance"},
+    "notifications.tasks.prune_notifications_task": {"queue": "maintenance"},
+    "activity.tasks.*": {"queue": "maintenance"},
+    "boards.tasks.*": {"queue": "maintenance"},
+    "tasks.tasks.*": {"queue": "maintenance"},
+    "uploads.tasks.delete_stored_files": {"queue": "maintenance"},
+    "uploads.tasks.purge_stale_upload_sessions": {"queue": "maintenance"},
+    "uploads.tasks.collect_orphaned_media_task": {"queue": "maintenance"},
+    "users.tasks.purge_expired_tokens_task": {"queue": "maintenance"},
+}
+# Redis emulates priorities with one list per step; 0 is served first. Interactive
+# notifications are routed at priority 0, everything else defaults to the middle.
+CELERY_BROKER_TRANSPORT_OPTIONS = {"priority_steps": [0, 3, 6, 9], "sep": ":", "queue_order_strategy": "priority"}
+CELERY_TASK_DEFAULT_PRIORITY = 6
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int("CELERY_WORKER_PREFETCH_MULTIPLIER", default=1)
 CELERY_BEAT_SCHEDULE = {
-    "check_due_soon_tasks_every_hour": {
-        "task": "notifications.tasks.check_due_soon_tasks",
+    "dispatch_due_reminders": {
+        "task": "notifications.tasks.dispatch_due_reminders",
+        "schedule": timedelta(minutes=1),
+    },
+    "rebuild_due_reminders_daily": {
+        "task": "notifications.tasks.rebuild_due_reminders",
+        "schedule": crontab(hour=0, minute=45),
+    },
+    "materialize_board_snapshots_nightly": {
+        "task": "analytics.tasks.materialize_board_snapshots",
+        "schedule": crontab(hour=23, minute=55),
+    },
+    "refresh_flow_percentiles": {
+        "task": "analytics.tasks.refresh_flow_percentiles_task",
+        "schedule": timedelta(minutes=15),
+    },
+    "purge_stale_upload_sessions": {
+        "task": "uploads.tasks.purge_stale_upload_sessions",
         "schedule": timedelta(hours=1),
-    }
+    },
+    "resume_stalled_purges": {
+        "task": "boards.tasks.resume_stalled_purges",
+        "schedule": timedelta(minutes=10),
+    },
+    "archive_completed_tasks_nightly": {
+        "task": "tasks.tasks.archive_completed_tasks_task",
+        "schedule": crontab(hour=2, minute=30),
+    },
+    "reconcile_unread_notification_counts": {
+        "task": "notifications.tasks.reconcile_unread_counts_task",
+        "schedule": timedelta(minutes=10),
+    },
+    "prune_notifications_nightly": {
+        "task": "notifications.tasks.prune_notifications_task",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "purge_expired_tokens_hourly": {
+        "task": "users.tasks.purge_expired_tokens_task",
+        "schedule": crontab(minute=20),
+    },
+    "ensure_activity_partitions_daily": {
+        "task": "activity.tasks.ensure_activity_partitions",
+        "schedule": crontab(hour=1, minute=0),
+    },
+    "expire_activity_logs_daily": {
+        "task": "activity.tasks.expire_activity_logs_task",
+        "schedule": crontab(hour=1, minute=15),
+    },
+    "collect_orphaned_media_nightly": {
+        "task": "uploads.tasks.collect_orphaned_media_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
 }
 
+# Lists whose tasks count as finished in burndown charts.
+ANALYTICS_DONE_LISTS = env.list("ANALYTICS_DONE_LISTS", default=["Done"])
+# Weekday (0=Monday) on which the nightly snapshot recounts every board.
+ANALYTICS_SNAPSHOT_REBUILD_WEEKDAY = env.int("ANALYTICS_SNAPSHOT_REBUILD_WEEKDAY", default=6)
+# Completed tasks older than this many days drop out of the lead/cycle time percentiles.
+ANALYTICS_FLOW_WINDOW_DAYS = env.int("ANALYTICS_FLOW_WINDOW_DAYS", default=90)
+
+# Soft-deleted projects, boards and lists are removed by Celery in batches of this many rows,
+# working for at most PURGE_TIME_BUDGET_SECONDS per task run before re-enqueueing itself.
+PURGE_BATCH_SIZE = env.int("PURGE_BATCH_SIZE", default=500)
+PURGE_TIME_BUDGET_SECONDS = env.int("PURGE_TIME_BUDGET_SECONDS", default=20)
+PURGE_STALL_MINUTES = env.int("PURGE_STALL_MINUTES", default=15)
+
+# Tasks that have sat in a done list this many days move to the archive table. Matches the
+# flow window by default, since archiving drops a task's lead/cycle time metrics.
+TASK_ARCHIVE_AFTER_DAYS = env.int("TASK_ARCHIVE_AFTER_DAYS", default=90)
+TASK_ARCHIVE_BATCH_SIZE = env.int("TASK_ARCHIVE_BATCH_SIZE", default=500)
+TASK_ARCHIVE_TIME_BUDGET_SECONDS = env.int("TASK_ARCHIVE_TIME_BUDGET_SECONDS", default=60)
+
+# Cached per-user unread notification counters expire after this long and are rewritten
+# from the database by a periodic reconcile job.
+NOTIFICATION_UNREAD_TTL_SECONDS = env.int("NOTIFICATION_UNREAD_TTL_SECONDS", default=24 * 60 * 60)
+# Assignees are reminded this many hours before a task is due. Reminders wait in a Redis sorted set
+# updated whenever a due date or assignee changes, and a dispatcher pops due entries every minute.
+DUE_SOON_REMINDER_HOURS = env.int("DUE_SOON_REMINDER_HOURS", default=24)
+REMINDER_DISPATCH_BATCH_SIZE = env.int("REMINDER_DISPATCH_BATCH_SIZE", default=500)
+# Read notifications older than the retention period are deleted nightly, and every user keeps
+# at most NOTIFICATION_MAX_PER_USER of their newest notifications.
+NOTIFICATION_RETENTION_DAYS = env.int("NOTIFICATION_RETENTION_DAYS", default=90)
+NOTIFICATION_MAX_PER_USER = env.int("NOTIFICATION_MAX_PER_USER", default=500)
+NOTIFICATION_PRUNE_BATCH_SIZE = env.int("NOTIFICATION_PRUNE_BATCH_SIZE", default=1000)
+
+# ActivityLog is partitioned by month: partitions exist this many months ahead, months older than
+# the retention window are exported as gzipped JSON Lines under the archive prefix and dropped.
+# The project feed only reaches back ACTIVITY_FEED_WINDOW_DAYS unless asked for an explicit range.
+ACTIVITY_PARTITIONS_AHEAD = env.int("ACTIVITY_PARTITIONS_AHEAD", default=3)
+ACTIVITY_RETENTION_MONTHS = env.int("ACTIVITY_RETENTION_MONTHS", default=12)
+ACTIVITY_ARCHIVE_PREFIX = env.str("ACTIVITY_ARCHIVE_PREFIX", default="activity_archive")
+ACTIVITY_FEED_WINDOW_DAYS = env.int("ACTIVITY_FEED_WINDOW_DAYS", default=90)
+
+# Jobs enqueued with core.dispatch.enqueue_unique are published at most once per key in this window.
+DISPATCH_UNIQUE_TTL_SECONDS = env.int("DISPATCH_UNIQUE_TTL_SECONDS", default=10 * 60)
+
+# Chunked uploads: largest accepted file, largest single chunk, and how long an idle session survives.
+UPLOAD_MAX_BYTES = env.int("UPLOAD_MAX_BYTES", default=512 * 1024 * 1024)
+UPLOAD_CHUNK_MAX_BYTES = env.int("UPLOAD_CHUNK_MAX_BYTES", default=8 * 1024 * 1024)
+UPLOAD_SESSION_TTL_HOURS = env.int("UPLOAD_SESSION_TTL_HOURS", default=24)
+# Unreferenced media younger than this is left alone by the garbage collector.
+MEDIA_GC_GRACE_HOURS = env.int("MEDIA_GC_GRACE_HOURS", default=24)
+
+# Longest edge, in pixels, of the derivatives generated for image attachments and avatars.
+ATTACHMENT_RENDITION_SIZES = {"thumb": 256, "preview": 1024}
+AVATAR_RENDITION_SIZES = {"small": 64, "medium": 256}
+
 
 CELERY_TASK_ALWAYS_EAGER = env.bool("CELERY_TASK_ALWAYS_EAGER", default=DEBUG)
 CELERY_TASK_EAGER_PROPAGATES = env.bool("CELERY_TASK_EAGER_PROPAGATES", default=True)
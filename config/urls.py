@@ -30,6 +30,8 @@ urlpatterns = [
     path("api/v1/comments/", include("comments.urls")),
     path("api/v1/notifications/", include("notifications.urls")),
     path("api/v1/activity/", include("activity.urls")),
+    path("api/v1/analytics/", include("analytics.urls")),
+    path("api/v1/uploads/", include("uploads.urls")),
 
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Columns loaded into the cached user. Anything else (password, last_login) is deferred and
+# fetched on first access, so code that needs it still sees the real value.
+CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "name",
+    "bio",
+    "avatar",
+    "avatar_renditions",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+# Saves touching only other columns (``last_login`` on every sign-in) leave the cache alone.
+INVALIDATING_FIELDS = frozenset(CACHED_USER_FIELDS) | {"password"}
+
+
+def user_cache_key(user_id: Any) -> str:
+    return f"auth:user:{user_id}"
+
+
+class _LocalUserCache:
+    """Small per-process LRU with a short TTL in front of the shared cache."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key: str, snapshot: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + settings.AUTH_USER_LOCAL_CACHE_TTL_SECONDS, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_USER_LOCAL_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_user_cache = _LocalUserCache()
+
+
+def invalidate_cached_users(user_ids: Iterable[Any]) -> None:
+    """Forget cached users; call after bulk updates that bypass model save signals."""
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    for key in keys:
+        local_user_cache.discard(key)
+    cache.delete_many(keys)
+
+
+def _snapshot(user) -> dict:
+    snapshot = {field: getattr(user, user._meta.get_field(field).attname) for field in CACHED_USER_FIELDS}
+    snapshot["avatar"] = user.avatar.name if user.avatar else None
+    snapshot["_revoke_hash"] = get_md5_hash_password(user.password)
+    return snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a per-process LRU and the
+    shared cache before falling back to the database.
+
+    Token validation, including blacklist checks on blacklistable token classes, is
+    unchanged. The cached user is a deferred model instance: uncached columns load
+    on access and ``save()`` writes only the loaded ones.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = user_cache_key(user_id)
+        snapshot = local_user_cache.get(key)
+        if snapshot is None:
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = self._load_snapshot(user_id)
+                cache.set(key, snapshot, timeout=settings.AUTH_USER_CACHE_TTL_SECONDS)
+            local_user_cache.set(key, snapshot)
+
+        if not snapshot["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != snapshot["_revoke_hash"]:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return self._build_user(snapshot)
+
+    def _load_snapshot(self, user_id) -> dict:
+        try:
+            user = self.user_model.objects.only(*CACHED_USER_FIELDS, "password").get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return _snapshot(user)
+
+    def _build_user(self, snapshot: dict):
+        model = get_user_model()
+        # from_db expects the loaded values in the model's column order.
+        fields = [field for field in model._meta.concrete_fields if field.name in CACHED_USER_FIELDS]
+        return model.from_db(
+            DEFAULT_DB_ALIAS, [field.attname for field in fields], [snapshot[field.name] for field in fields]
+        )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import logging
+import weakref
+
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def unique_key(task, key: str) -> str:
+    return f"dispatch:unique:{task.name}:{key}"
+
+
+def suppressed_key(task) -> str:
+    return f"dispatch:suppressed:{task.name}"
+
+
+def suppressed_count(task) -> int:
+    """How many messages for ``task`` were dropped as duplicates since the counter was created."""
+    return cache.get(suppressed_key(task), 0)
+
+
+# The open batch of each connection, per savepoint level. Batches are only weakly
+# referenced here: the on-commit callbacks Django keeps for the transaction hold them,
+# so rolling back the transaction or savepoint discards the batch and its entry.
+_open_batches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class _Batch:
+    """Messages enqueued at one savepoint level of a transaction, published when it commits."""
+
+    def __init__(self, batches: dict, level: tuple):
+        self.messages: dict[str, tuple] = {}
+        self.sent = False
+        self._batches = batches
+        self._level = level
+
+    def add(self, task, args: tuple, kwargs: dict, unique: tuple[str, int] | None = None) -> None:
+        if unique is not None:
+            key = unique_key(task, unique[0])
+        else:
+            key = json.dumps([task.name, args, kwargs], sort_keys=True, default=str)
+        self.messages.setdefault(key, (task, args, kwargs, unique))
+
+    def __call__(self):
+        # Registered once per message; the first call on commit sends the whole batch.
+        if not self.sent:
+            self.sent = True
+            ref = self._batches.get(self._level)
+            if ref is not None and ref() is self:
+                del self._batches[self._level]
+            publish(list(self.messages.values()))
+
+
+def _claim(task, unique: tuple[str, int] | None) -> bool:
+    """Reserve a unique message's key (SET NX with a TTL); False means a duplicate was already sent."""
+    if unique is None:
+        return True
+    key, ttl = unique
+    if cache.add(unique_key(task, key), 1, timeout=ttl):
+        return True
+    counter = suppressed_key(task)
+    cache.add(counter, 0, timeout=None)
+    cache.incr(counter)
+    logger.debug("Suppressed duplicate %s message %s", task.name, key)
+    return False
+
+
+def publish(messages: list[tuple]) -> None:
+    """Send ``(task, args, kwargs, unique)`` messages over a single producer connection."""
+    messages = [message for message in messages if _claim(message[0], message[3])]
+    if not messages:
+        return
+    app = current_app
+    if app.conf.task_always_eager:
+        for task, args, kwargs, _unique in messages:
+            task.apply_async(args=args, kwargs=kwargs)
+        return
+    with app.producer_or_acquire() as producer:
+        for task, args, kwargs, _unique in messages:
+            task.apply_async(args=args, kwargs=kwargs, producer=producer)
+    logger.debug("Published %s task messages", len(messages))
+
+
+def _current_batch(connection) -> _Batch:
+    level = tuple(connection.savepoint_ids)
+    batches = _open_batches.setdefault(connection, {})
+    ref = batches.get(level)
+    batch = ref() if ref is not None else None
+    if batch is None or batch.sent:
+        batch = _Batch(batches, level)
+
+        def forget(dead, level=level):
+            if batches.get(level) is dead:
+                del batches[level]
+
+        batches[level] = weakref.ref(batch, forget)
+    return batch
+
+
+def enqueue(task, *args, **kwargs) -> None:
+    """
+    Queue a Celery task for after the current transaction commits.
+
+    Messages enqueued in the same transaction are collected, identical ones (same
+    task and arguments) are sent once, and the batch is published together on
+    commit. Outside a transaction the message is sent immediately.
+    """
+    _enqueue(task, args, kwargs, None)
+
+
+def enqueue_unique(task, key: str, *args, unique_for: int | None = None, **kwargs) -> None:
+    """
+    Like ``enqueue``, but publish at most one message per ``(task, key)`` every
+    ``unique_for`` seconds (``DISPATCH_UNIQUE_TTL_SECONDS`` by default).
+
+    ``key`` should name the event and the field values that make it distinct, e.g.
+    ``f"{task.pk}:{assignee_id}"``. The key is claimed when the message is published,
+    so a rolled-back transaction does not block a later one.
+    """
+    ttl = settings.DISPATCH_UNIQUE_TTL_SECONDS if unique_for is None else unique_for
+    _enqueue(task, args, kwargs, (key, ttl))
+
+
+def _enqueue(task, args: tuple, kwargs: dict, unique: tuple[str, int] | None) -> None:
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        publish([(task, args, kwargs, unique)])
+        return
+    batch = _current_batch(connection)
+    batch.add(task, args, kwargs, unique)
+    transaction.on_commit(batch)
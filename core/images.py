@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import io
+from typing import Callable
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+
+def rendition_format() -> tuple[str, str]:
+    """WebP when this Pillow build can encode it, JPEG otherwise."""
+    return ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA")
+    buffer = io.BytesIO()
+    options = {"quality": 80}
+    if image_format == "WEBP":
+        options["method"] = 4
+    else:
+        options["optimize"] = True
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def build_renditions(storage, source_name: str, sizes: dict[str, int], name_for: Callable[[str, str], str]) -> dict[str, str]:
+    """
+    Write a bounded-size copy of ``source_name`` for every ``label: max_edge`` in ``sizes``.
+
+    ``name_for(label, extension)`` picks the storage path of each rendition; existing
+    files at that path are replaced. Returns ``{label: stored_name}``.
+    """
+    largest = max(sizes.values())
+    with storage.open(source_name, "rb") as handle:
+        image = Image.open(handle)
+        # Let the JPEG decoder downscale while reading instead of inflating the full image.
+        image.draft("RGB", (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    image_format, extension = rendition_format()
+    stored: dict[str, str] = {}
+    for label, max_edge in sizes.items():
+        copy = image.copy()
+        copy.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        name = name_for(label, extension)
+        if storage.exists(name):
+            storage.delete(name)
+        stored[label] = storage.save(name, ContentFile(_encode(copy, image_format)))
+    return stored
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import mimetypes
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header
+
+
+def delete_files_on_commit(*names: str | None) -> None:
+    """
+    Remove stored files once the surrounding transaction commits.
+
+    The deletion runs in a Celery worker, so requests never wait on storage, and a
+    rolled-back transaction leaves the files its rows still point at untouched.
+    """
+    from uploads.tasks import delete_stored_files
+
+    from .dispatch import enqueue
+
+    names = sorted({name for name in names if name})
+    if names:
+        enqueue(delete_stored_files, names)
+
+
+def protected_storage_response(storage, name: str, filename: str | None = None, *, as_attachment: bool = True) -> HttpResponse:
+    """
+    Return a response that delivers ``name`` from ``storage`` after the caller has authorized access.
+
+    With ``MEDIA_ACCEL_REDIRECT`` enabled the body is left empty and nginx streams the
+    file from its internal location (sendfile, Range support); otherwise Django streams
+    it itself, which is only meant for local development.
+    """
+    filename = filename or name.rsplit("/", 1)[-1]
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if getattr(settings, "MEDIA_ACCEL_REDIRECT", False):
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(name)
+        response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+        return response
+
+    return FileResponse(storage.open(name, "rb"), as_attachment=as_attachment, filename=filename, content_type=content_type)
+
+
+def protected_file_response(field_file, filename: str | None = None, *, as_attachment: bool = True) -> HttpResponse:
+    return protected_storage_response(field_file.storage, field_file.name, filename, as_attachment=as_attachment)
+
+
+def attachment_download_response(attachment, rendition: str | None = None) -> HttpResponse:
+    """Serve an attachment, or one of its generated image renditions when ``rendition`` is given."""
+    if not rendition:
+        return protected_file_response(attachment.file, attachment.filename)
+    renditions = attachment.blob.renditions if attachment.blob_id else {}
+    name = renditions.get(rendition)
+    if not name:
+        raise Http404("Rendition not available.")
+    stem = (attachment.filename or "attachment").rsplit(".", 1)[0]
+    extension = name.rsplit(".", 1)[-1]
+    return protected_storage_response(attachment.file.storage, name, f"{stem}-{rendition}.{extension}", as_attachment=False)
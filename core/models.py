@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.db import models
+from django.db.models import Q
+
+
+def alive_q(*paths: str) -> Q:
+    """
+    Match rows whose own ``deleted_at`` and that of every related object along ``paths`` is empty.
+
+    An empty path means the model itself, e.g. ``alive_q("", "project")`` for a board.
+    """
+    return Q(**{(f"{path}__deleted_at__isnull" if path else "deleted_at__isnull"): True for path in paths})
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """QuerySet for soft-deletable models; visibility querysets must go through ``alive()``."""
+
+    # Relations whose soft deletion hides this row as well, relative to the model.
+    alive_paths: tuple[str, ...] = ("",)
+
+    def alive(self):
+        return self.filter(alive_q(*self.alive_paths))
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
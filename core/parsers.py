@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+UTF8 = codecs.lookup("utf-8").name
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` that decodes request bodies with orjson."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            # orjson reads UTF-8 bytes directly; anything else is decoded to str first.
+            if codecs.lookup(encoding).name != UTF8:
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, LookupError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
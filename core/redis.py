@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+
+def get_redis_client(alias: str = "default"):
+    """
+    The raw redis-py client behind a django-redis cache, or ``None`` when that cache
+    is another backend, or django-redis is not installed.
+    """
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(alias)
+    except (ImportError, NotImplementedError):
+        return None
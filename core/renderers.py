@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import uuid
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# UTC datetimes end in "Z" like DRF's encoder; integer keys become strings like the stdlib's.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+LINE_SEPARATORS = (("\u2028".encode(), b"\\u2028"), ("\u2029".encode(), b"\\u2029"))
+
+
+def _isoformat(value) -> str:
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+def encode_default(obj):
+    """Types orjson (and msgpack) leave to the caller, converted the way DRF's ``JSONEncoder`` does."""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        # Serializer DecimalFields already emit strings unless COERCE_DECIMAL_TO_STRING is off.
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "__iter__"):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _msgpack_default(obj):
+    # MessagePack has no datetime or UUID types that every client decodes, so send the
+    # same strings the JSON renderer would.
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return _isoformat(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    return encode_default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` with orjson doing the encoding; datetimes, dates, UUIDs and dataclasses are handled in C."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # orjson only pretty-prints with two spaces.
+            option |= orjson.OPT_INDENT_2
+        content = orjson.dumps(data, default=encode_default, option=option)
+        # Keep the output a strict JavaScript subset, as DRF does.
+        for raw, escaped in LINE_SEPARATORS:
+            content = content.replace(raw, escaped)
+        return content
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Opt-in binary format for clients that send ``Accept: application/msgpack``."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
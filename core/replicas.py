@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Alias that reads should use in the current request or job; None means the primary.
+_read_alias: ContextVar[str | None] = ContextVar("db_read_alias", default=None)
+
+
+def replica_aliases() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def current_read_alias() -> str:
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_replica():
+    """Send reads in this block to a random replica, or the primary when none is configured."""
+    replicas = replica_aliases()
+    token = _read_alias.set(random.choice(replicas) if replicas else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def use_primary():
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads(func):
+    """Run a read-mostly job (analytics, exports) against a replica; put it below ``@shared_task``."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """Writes and migrations go to the primary; reads follow ``use_replica`` / ``use_primary``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None:
+            return None
+        # Reads inside a write transaction must see its own uncommitted rows.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in replica_aliases() else None
+
+
+def pin_key(request) -> str | None:
+    """Cache key identifying the client behind ``request`` by its credentials, if it sent any."""
+    credential = request.headers.get("Authorization") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return "db:pin:" + hashlib.sha256(credential.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe-method requests from a replica, except for clients that wrote within
+    the last ``DATABASE_REPLICA_PIN_SECONDS``, whose reads stay on the primary so
+    they never see replication lag on their own changes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        key = pin_key(request)
+        if request.method in SAFE_METHODS:
+            if key and cache.get(key):
+                return self.get_response(request)
+            with use_replica():
+                return self.get_response(request)
+        response = self.get_response(request)
+        if key:
+            cache.set(key, 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        key = pin_key(request)
+        if request.method in SAFE_METHODS:
+            if key and await cache.aget(key):
+                return await self.get_response(request)
+            with use_replica():
+                return await self.get_response(request)
+        response = await self.get_response(request)
+        if key:
+            await cache.aset(key, 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
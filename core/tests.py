@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications.tasks import send_task_assigned_notification
+
+from .authentication import local_user_cache
+from .dispatch import enqueue
+from .replicas import ReplicaRoutingMiddleware, current_read_alias
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+	def test_reads_stick_to_the_primary_right_after_a_write(self):
+		cache.clear()
+		seen = []
+		middleware = ReplicaRoutingMiddleware(lambda request: seen.append(current_read_alias()) or HttpResponse())
+		factory = RequestFactory(headers={"Authorization": "Bearer writer"})
+
+		middleware(factory.get("/api/v1/boards/"))
+		middleware(factory.post("/api/v1/boards/"))
+		middleware(factory.get("/api/v1/boards/"))
+		middleware(RequestFactory(headers={"Authorization": "Bearer reader"}).get("/api/v1/boards/"))
+		self.assertEqual(seen, ["replica_0", "default", "default", "replica_0"])
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(TransactionTestCase):
+	# "replica" mirrors the test database. TransactionTestCase, because the router keeps
+	# reads on the primary inside a transaction, which TestCase would wrap every test in.
+	databases = {"default", "replica"}
+
+	def setUp(self):
+		cache.clear()
+		local_user_cache.clear()
+		self.user = User.objects.create_user(email="router@example.com", password="StrongPass123")
+		self.client = APIClient()
+		self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+	def request(self, method, *args, **kwargs):
+		with CaptureQueriesContext(connections["default"]) as primary, CaptureQueriesContext(connections["replica"]) as replica:
+			response = getattr(self.client, method)(*args, **kwargs)
+		return response, len(primary), len(replica)
+
+	def test_safe_reads_go_to_the_replica_and_writes_to_the_primary(self):
+		url = reverse("users:user-profile")
+
+		response, primary, replica = self.request("get", url)
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(primary, 0)
+		self.assertGreater(replica, 0)
+
+		response, primary, replica = self.request("patch", url, {"bio": "Routed"}, format="json")
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertGreater(primary, 0)
+		self.assertEqual(replica, 0)
+
+		# The save dropped the cached user and the writer is pinned to the primary for a
+		# while, so it reads its own change from there.
+		response, primary, replica = self.request("get", url)
+		self.assertEqual(response.data["bio"], "Routed")
+		self.assertGreater(primary, 0)
+		self.assertEqual(replica, 0)
+
+
+class DispatchTests(TestCase):
+	def test_rolled_back_messages_stay_out_of_the_committed_batch(self):
+		task = send_task_assigned_notification
+		with mock.patch("core.dispatch.publish") as publish:
+			with self.captureOnCommitCallbacks(execute=True):
+				with self.assertRaises(RuntimeError), transaction.atomic():
+					enqueue(task, user_id=1)
+					raise RuntimeError
+				enqueue(task, user_id=2)
+				enqueue(task, user_id=2)
+			with self.captureOnCommitCallbacks(execute=True):
+				enqueue(task, user_id=3)
+		self.assertEqual(
+			[call.args[0] for call in publish.call_args_list],
+			[[(task, (), {"user_id": 2}, None)], [(task, (), {"user_id": 3}, None)]],
+		)
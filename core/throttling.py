@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .redis import get_redis_client
+
+# Sliding-window counter: the previous fixed window's count is weighted by how much of it
+# still overlaps the sliding window, and the request is admitted only if that estimate
+# plus the current window's count stays within the limit. Read, decide and increment
+# happen in one round trip, so concurrent requests cannot both take the last slot.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local estimated = previous * (window - elapsed) / window + current
+if estimated + 1 > limit then
+    return {0, 0}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('PEXPIRE', KEYS[1], window * 2)
+end
+return {1, math.floor(limit - estimated - 1)}
+"""
+
+_script = None
+
+
+@dataclass
+class RateLimitState:
+    limit: int
+    remaining: int
+    reset: int
+    window: int
+
+
+def _sliding_window_script(client):
+    global _script
+    if _script is None:
+        _script = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _script
+
+
+def _cache_hit(keys: list[str], limit: int, window_ms: int, elapsed_ms: int) -> tuple[bool, int]:
+    """Same algorithm on the Django cache, for deployments (and tests) without Redis."""
+    current_key, previous_key = keys
+    previous = cache.get(previous_key, 0)
+    current = cache.get(current_key, 0)
+    estimated = previous * (window_ms - elapsed_ms) / window_ms + current
+    if estimated + 1 > limit:
+        return False, 0
+    cache.add(current_key, 0, timeout=math.ceil(window_ms * 2 / 1000))
+    cache.incr(current_key)
+    return True, math.floor(limit - estimated - 1)
+
+
+def hit(key: str, limit: int, window_seconds: int) -> tuple[bool, RateLimitState]:
+    """Count one request against ``key``; returns whether it is allowed and the resulting budget."""
+    window_ms = window_seconds * 1000
+    now_ms = int(time.time() * 1000)
+    index, elapsed_ms = divmod(now_ms, window_ms)
+    keys = [f"ratelimit:{key}:{index}", f"ratelimit:{key}:{index - 1}"]
+    client = get_redis_client()
+    allowed = remaining = None
+    if client is not None:
+        try:
+            allowed, remaining = _sliding_window_script(client)(keys=keys, args=[limit, window_ms, elapsed_ms])
+            allowed = bool(allowed)
+        except RedisError:
+            allowed = None
+    if allowed is None:
+        allowed, remaining = _cache_hit(keys, limit, window_ms, elapsed_ms)
+    reset = math.ceil((window_ms - elapsed_ms) / 1000)
+    return allowed, RateLimitState(limit=limit, remaining=max(int(remaining), 0), reset=reset, window=window_seconds)
+
+
+class SlidingWindowRateThrottle(BaseThrottle):
+    """
+    Rate throttle backed by an atomic sliding-window counter.
+
+    Rates use DRF's ``DEFAULT_THROTTLE_RATES`` format and are looked up by ``scope``.
+    The tightest budget seen on a request is exposed through ``RateLimit-*`` headers
+    by ``RateLimitHeadersMiddleware``.
+    """
+
+    scope: str | None = None
+    durations = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+    def get_scope(self, request, view) -> str | None:
+        return self.scope
+
+    def get_cache_key(self, request, view) -> str | None:
+        raise NotImplementedError
+
+    def parse_rate(self, scope: str) -> tuple[int, int] | None:
+        try:
+            rate = api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError as exc:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{scope}' scope") from exc
+        if rate is None:
+            return None
+        count, period = rate.split("/")
+        return int(count), self.durations[period[0]]
+
+    def allow_request(self, request, view) -> bool:
+        self.state = None
+        scope = self.get_scope(request, view)
+        if scope is None:
+            return True
+        rate = self.parse_rate(scope)
+        ident = self.get_cache_key(request, view)
+        if rate is None or ident is None:
+            return True
+        limit, window = rate
+        allowed, self.state = hit(f"{scope}:{ident}", limit, window)
+        _record_state(request, self.state)
+        return allowed
+
+    def wait(self) -> float | None:
+        return self.state.reset if self.state is not None else None
+
+
+def _record_state(request, state: RateLimitState) -> None:
+    django_request = getattr(request, "_request", request)
+    current = getattr(django_request, "ratelimit", None)
+    if current is None or state.remaining < current.remaining:
+        django_request.ratelimit = state
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle):
+    scope = "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """General per-user budget; views with their own ``throttle_scope`` are counted there instead."""
+
+    scope = "user"
+
+    def get_scope(self, request, view):
+        return None if getattr(view, "throttle_scope", None) else self.scope
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+
+class ScopedSlidingWindowThrottle(UserSlidingWindowThrottle):
+    """Separate budget for views that declare a ``throttle_scope``; others are not limited by it."""
+
+    def get_scope(self, request, view):
+        return getattr(view, "throttle_scope", None)
+
+
+def throttle_scope(scope: str):
+    """Give an ``@api_view`` function its own throttle scope; apply it above ``@api_view``."""
+
+    def decorator(view):
+        view.cls.throttle_scope = scope
+        return view
+
+    return decorator
+
+
+class RateLimitHeadersMiddleware:
+    """Adds ``RateLimit-*`` headers describing the tightest throttle budget hit by the request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
+
+    def add_headers(self, request, response):
+        state = getattr(request, "ratelimit", None)
+        if state is not None:
+            response["RateLimit-Limit"] = str(state.limit)
+            response["RateLimit-Remaining"] = str(state.remaining)
+            response["RateLimit-Reset"] = str(state.reset)
+            response["RateLimit-Policy"] = f"{state.limit};w={state.window}"
+        return response
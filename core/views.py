@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, so under ASGI a request waiting on the
+    database does not hold a worker thread.
+
+    Authentication, permission and throttle checks are DRF's synchronous ones and run
+    in the request's thread; handlers should use the async ORM (``aget``, ``acount``,
+    ``async for``) and ``acheck_object_permissions``. Under WSGI Django runs the view
+    through ``async_to_sync``, so the same view serves both modes.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                # OPTIONS and 405s come from DRF's synchronous implementations.
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def acheck_object_permissions(self, request, obj) -> None:
+        await sync_to_async(self.check_object_permissions)(request, obj)
+
+
+class AsyncListAPIView(AsyncAPIView, generics.GenericAPIView):
+    """Async counterpart of ``ListAPIView``; override ``aget_queryset`` when scoping the list needs a query."""
+
+    async def aget_queryset(self):
+        return self.get_queryset()
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        paginate = getattr(self.paginator, "apaginate_queryset", None)
+        if paginate is None:
+            return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+        return await paginate(queryset, self.request, view=self)
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(await self.aget_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
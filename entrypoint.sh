@@ -14,7 +14,7 @@ postgres_password="${POSTGRES_PASSWORD:-kanban}"
 python << 'PY'
 import os
 import time
-import psycopg2
+import psycopg
 
 host = os.environ.get('POSTGRES_HOST', 'db')
 port = int(os.environ.get('POSTGRES_PORT', '5432'))
@@ -25,9 +25,9 @@ database = os.environ.get('POSTGRES_DB', 'kanban')
 timeout = time.time() + 60
 while True:
     try:
-        psycopg2.connect(host=host, port=port, user=user, password=password, dbname=database).close()
+        psycopg.connect(host=host, port=port, user=user, password=password, dbname=database).close()
         break
-    except psycopg2.OperationalError:
+    except psycopg.OperationalError:
         if time.time() > timeout:
             raise RuntimeError("Timed out waiting for Postgres")
         time.sleep(2)
@@ -13,6 +13,7 @@ class Notification(models.Model):
 
 	class Meta:
 		ordering = ("-created_at", "-id")
+		indexes = [models.Index(fields=["user", "is_read", "-created_at"], name="notification_user_unread_idx")]
 
 	def __str__(self):
 		return f"Notification {self.id} for user {self.user_id}"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from core.redis import get_redis_client
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of task ids scored by the epoch second their due-soon reminder should fire.
+SCHEDULE_KEY = "reminders:due_soon"
+
+# Pops up to ARGV[2] entries due at or before ARGV[1] in one step, so two dispatchers
+# never both take the same reminder.
+POP_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+_pop_due = None
+
+
+def reminder_lead() -> timedelta:
+    return timedelta(hours=settings.DUE_SOON_REMINDER_HOURS)
+
+
+def reminder_time(task: Task):
+    """When ``task``'s reminder should fire, or ``None`` when it needs none."""
+    if not task.assigned_to_id or not task.due_date:
+        return None
+    now = timezone.now()
+    if task.due_date <= now:
+        return None
+    return max(task.due_date - reminder_lead(), now)
+
+
+def schedule_reminder(task: Task) -> None:
+    """Register, move or cancel ``task``'s reminder to match its current due date and assignee."""
+    client = get_redis_client()
+    if client is None:
+        return
+    fire_at = reminder_time(task)
+    try:
+        if fire_at is None:
+            client.zrem(SCHEDULE_KEY, task.pk)
+        else:
+            client.zadd(SCHEDULE_KEY, {task.pk: fire_at.timestamp()})
+    except RedisError:
+        # The nightly rebuild re-registers anything missed here.
+        logger.warning("Could not schedule due-soon reminder", extra={"task_id": task.pk}, exc_info=True)
+
+
+def cancel_reminder(task_id: int) -> None:
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.zrem(SCHEDULE_KEY, task_id)
+    except RedisError:
+        # A stale entry is harmless: the dispatcher re-checks the task before reminding.
+        logger.warning("Could not cancel due-soon reminder", extra={"task_id": task_id}, exc_info=True)
+
+
+def pop_due_reminders(limit: int) -> list[int] | None:
+    """Take up to ``limit`` reminders that are due; ``None`` when no Redis schedule is available."""
+    global _pop_due
+    client = get_redis_client()
+    if client is None:
+        return None
+    if _pop_due is None:
+        _pop_due = client.register_script(POP_DUE_SCRIPT)
+    try:
+        return [int(task_id) for task_id in _pop_due(keys=[SCHEDULE_KEY], args=[time.time(), limit])]
+    except RedisError:
+        return None
+
+
+def due_soon_tasks(task_ids: list[int] | None = None) -> QuerySet:
+    """Alive, assigned tasks due within the reminder lead, optionally limited to ``task_ids``."""
+    now = timezone.now()
+    tasks = Task.objects.alive().filter(
+        due_date__gt=now,
+        due_date__lte=now + reminder_lead(),
+        assigned_to__isnull=False,
+    )
+    if task_ids is not None:
+        tasks = tasks.filter(pk__in=task_ids)
+    return tasks
+
+
+def rebuild_reminder_schedule(batch_size: int = 1000) -> int:
+    """Re-register every pending reminder, e.g. after the Redis schedule was lost."""
+    client = get_redis_client()
+    if client is None:
+        return 0
+    pending = Task.objects.alive().filter(due_date__gt=timezone.now(), assigned_to__isnull=False)
+    rows = pending.order_by("pk").values_list("pk", "due_date")
+    lead = reminder_lead()
+    now = timezone.now()
+    scheduled = 0
+    last_id = 0
+    while batch := list(rows.filter(pk__gt=last_id)[:batch_size]):
+        client.zadd(SCHEDULE_KEY, {pk: max(due_date - lead, now).timestamp() for pk, due_date in batch})
+        scheduled += len(batch)
+        last_id = batch[-1][0]
+    return scheduled
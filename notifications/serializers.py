@@ -10,3 +10,13 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = ("id", "user", "message", "is_read", "created_at")
         read_only_fields = ("id", "created_at", "user")
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs["all"] and "ids" not in attrs:
+            raise serializers.ValidationError("Provide ids or set all to true.")
+        return attrs
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from .models import Notification
+
+
+def unread_count_key(user_id: int) -> str:
+    return f"notifications:unread:{user_id}"
+
+
+def get_unread_count(user_id: int) -> int:
+    """The cached unread badge count, counted from the database only when the cache has no entry."""
+    key = unread_count_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        # add() rather than set(): a concurrent increment that landed first wins.
+        cache.add(key, count, timeout=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+    return count
+
+
+def adjust_unread_count(user_id: int, delta: int) -> None:
+    """Atomically move the cached counter; a missing entry is left for the next read to fill."""
+    if not delta:
+        return
+    key = unread_count_key(user_id)
+    try:
+        value = cache.incr(key, delta)
+    except ValueError:
+        return
+    if value < 0:
+        # Drifted below zero; drop it so the next read recounts.
+        cache.delete(key)
+
+
+def mark_notifications_read(user, ids: Iterable[int] | None = None) -> int:
+    """Mark all of ``user``'s unread notifications, or just ``ids``, read with a single UPDATE."""
+    unread = Notification.objects.filter(user=user, is_read=False)
+    if ids is not None:
+        unread = unread.filter(pk__in=list(ids))
+    updated = unread.update(is_read=True)
+    adjust_unread_count(user.pk, -updated)
+    return updated
+
+
+def reconcile_unread_counts() -> int:
+    """
+    Rewrite the cached counters from the database for every user with unread
+    notifications or recent notification traffic, healing any drift.
+    """
+    since = timezone.now() - timedelta(seconds=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+    counts = (
+        Notification.objects.filter(Q(is_read=False) | Q(created_at__gte=since))
+        .order_by()
+        .values("user_id")
+        .annotate(unread=Count("id", filter=Q(is_read=False)))
+        .values_list("user_id", "unread")
+    )
+    values = {unread_count_key(user_id): unread for user_id, unread in counts.iterator()}
+    cache.set_many(values, timeout=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+    return len(values)
+
+
+@dataclass
+class PruneReport:
+    expired: int = 0
+    over_cap: int = 0
+
+    @property
+    def deleted(self) -> int:
+        return self.expired + self.over_cap
+
+
+def _prune_expired(cutoff, batch_size: int) -> int:
+    """Delete read notifications older than ``cutoff`` one primary-key range at a time."""
+    bounds = Notification.objects.aggregate(low=Min("id"), high=Max("id"))
+    if bounds["low"] is None:
+        return 0
+    deleted = 0
+    for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+        removed, _ = Notification.objects.filter(
+            pk__gte=start, pk__lt=start + batch_size, is_read=True, created_at__lt=cutoff
+        ).delete()
+        deleted += removed
+    return deleted
+
+
+def _prune_over_cap(cap: int, batch_size: int) -> int:
+    """Trim every user down to their ``cap`` newest notifications."""
+    over = (
+        Notification.objects.order_by()
+        .values("user_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=cap)
+        .values_list("user_id", flat=True)
+    )
+    deleted = 0
+    for user_id in list(over):
+        newest_first = Notification.objects.filter(user_id=user_id).order_by("-created_at", "-id")
+        while ids := list(newest_first.values_list("id", flat=True)[cap : cap + batch_size]):
+            removed, _ = Notification.objects.filter(pk__in=ids).delete()
+            deleted += removed
+        # Unread rows may have gone too; let the next badge read recount.
+        cache.delete(unread_count_key(user_id))
+    return deleted
+
+
+def prune_notifications(
+    *, retention_days: int | None = None, per_user_cap: int | None = None, batch_size: int | None = None
+) -> PruneReport:
+    """
+    Apply the notification retention policy: read notifications older than
+    ``retention_days`` are deleted, then each user keeps at most ``per_user_cap``.
+    """
+    retention_days = settings.NOTIFICATION_RETENTION_DAYS if retention_days is None else retention_days
+    per_user_cap = settings.NOTIFICATION_MAX_PER_USER if per_user_cap is None else per_user_cap
+    batch_size = batch_size or settings.NOTIFICATION_PRUNE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return PruneReport(
+        expired=_prune_expired(cutoff, batch_size),
+        over_cap=_prune_over_cap(per_user_cap, batch_size),
+    )
@@ -1,9 +1,22 @@
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 
+from core.dispatch import enqueue_unique
 from tasks.models import Task
-from .tasks import send_task_assigned_notification, send_task_due_soon_notification
+from .models import Notification
+from .reminders import cancel_reminder, schedule_reminder
+from .services import adjust_unread_count
+from .tasks import send_task_assigned_notification
+
+REMINDER_FIELDS = frozenset({"due_date", "assigned_to", "assigned_to_id"})
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        user_id = instance.user_id
+        transaction.on_commit(lambda: adjust_unread_count(user_id, 1))
 
 
 @receiver(post_save, sender=Task)
@@ -12,12 +25,12 @@ def task_assignment_notification(sender, instance, created, **kwargs):
     user = getattr(instance, "assigned_to", None)
     if created and user:
         # Fire async task to create notification (in tests Celery runs eagerly)
-        send_task_assigned_notification.delay(user_id=user.id, task_data={"title": instance.title, "id": instance.id})
+        enqueue_unique(send_task_assigned_notification, f"{instance.id}:{user.id}", user_id=user.id, task_data={"title": instance.title, "id": instance.id})
 
 
 @receiver(pre_save, sender=Task)
-def task_due_and_assignment_changed(sender, instance, **kwargs):
-    # On update, detect assignment change or due date close and notify
+def task_assignment_changed(sender, instance, **kwargs):
+    # On update, detect assignment change and notify
     if not instance.pk:
         return
     try:
@@ -28,20 +41,20 @@ def task_due_and_assignment_changed(sender, instance, **kwargs):
     old_user = getattr(old, "assigned_to", None)
     new_user = getattr(instance, "assigned_to", None)
     if old_user is None and new_user is not None:
-        send_task_assigned_notification.delay(user_id=new_user.id, task_data={"title": instance.title, "id": instance.id})
+        enqueue_unique(send_task_assigned_notification, f"{instance.id}:{new_user.id}", user_id=new_user.id, task_data={"title": instance.title, "id": instance.id})
     elif old_user is not None and new_user is not None and old_user.id != new_user.id:
-        send_task_assigned_notification.delay(user_id=new_user.id, task_data={"title": instance.title, "id": instance.id})
-
-    # If due_date is being set or changed to near (optional - here we check if date exists and is within X hours),
-    # we only enqueue a notification if due_date is within next 24 hours for the assigned user.
-    due_old = getattr(old, "due_date", None)
-    due_new = getattr(instance, "due_date", None)
-    # Only do check when assigned_to exists
-    if getattr(instance, "assigned_to", None) and due_new and due_new != due_old:
-        time_diff = due_new - timezone.now()
-        # if due date within 24 hours, notify
-        from datetime import timedelta
-
-        if time_diff <= timedelta(hours=24):
-            user_id = instance.assigned_to.id
-            send_task_due_soon_notification.delay(user_id=user_id, task_data={"title": instance.title, "due_date": str(due_new)})
+        enqueue_unique(send_task_assigned_notification, f"{instance.id}:{new_user.id}", user_id=new_user.id, task_data={"title": instance.title, "id": instance.id})
+
+
+# Due-soon reminders fire from the schedule in notifications.reminders; saves only move the timer.
+@receiver(post_save, sender=Task)
+def schedule_due_soon_reminder(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not REMINDER_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: schedule_reminder(instance))
+
+
+@receiver(post_delete, sender=Task)
+def cancel_due_soon_reminder(sender, instance, **kwargs):
+    task_id = instance.pk
+    transaction.on_commit(lambda: cancel_reminder(task_id))
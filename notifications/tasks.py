@@ -1,25 +1,41 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
 from typing import Optional
 
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.utils import timezone
 
+from core.dispatch import enqueue_unique
 from core.email import send_email
 from tasks.models import Task
 from .models import Notification
+from .reminders import due_soon_tasks, pop_due_reminders, rebuild_reminder_schedule, reminder_lead
+from .services import prune_notifications, reconcile_unread_counts
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-def _due_soon_cache_key(task: Task) -> str:
+def due_soon_key(task: Task) -> str:
+    """Dedup key for due-soon jobs: one per task, assignee and due date."""
     due_ts = int(task.due_date.timestamp()) if task.due_date else "none"
-    return f"task-due-soon:{task.id}:{due_ts}"
+    return f"{task.id}:{task.assigned_to_id}:{due_ts}"
+
+
+def enqueue_due_soon(task: Task) -> None:
+    """Queue the due-soon email and in-app notification for ``task``, once per due date."""
+    key, ttl = due_soon_key(task), int(reminder_lead().total_seconds())
+    enqueue_unique(send_task_due_soon_email, key, task.id, unique_for=ttl)
+    enqueue_unique(
+        send_task_due_soon_notification,
+        key,
+        user_id=task.assigned_to_id,
+        task_data={"title": task.title, "due_date": str(task.due_date)},
+        unique_for=ttl,
+    )
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 3})
@@ -88,11 +104,6 @@ def send_task_due_soon_email(self, task_id: int) -> Optional[int]:
         logger.info("Due-soon email skipped: task already past due", extra={"task_id": task.id})
         return None
 
-    cache_key = _due_soon_cache_key(task)
-    if not cache.add(cache_key, True, timeout=24 * 60 * 60):
-        logger.info("Due-soon email suppressed (already sent recently)", extra={"task_id": task.id})
-        return None
-
     user = task.assigned_to
     due_display = timezone.localtime(due_dt)
     subject = f"Task '{task.title}' is due soon"
@@ -111,29 +122,41 @@ def send_task_due_soon_email(self, task_id: int) -> Optional[int]:
     return task.id
 
 
+@shared_task(bind=True)
+def dispatch_due_reminders(self) -> int:
+    """Send the reminders whose fire time has passed, popping them from the schedule in batches."""
+    batch_size = settings.REMINDER_DISPATCH_BATCH_SIZE
+    sent = 0
+    while True:
+        task_ids = pop_due_reminders(batch_size)
+        if task_ids is None:
+            # No Redis schedule (local development): fall back to scanning.
+            return check_due_soon_tasks()
+        # Tasks changed or removed since they were scheduled drop out here.
+        for task in due_soon_tasks(task_ids):
+            enqueue_due_soon(task)
+            sent += 1
+        if len(task_ids) < batch_size:
+            break
+    if sent:
+        logger.info("dispatch_due_reminders sent %s due-soon reminders", sent)
+    return sent
+
+
 @shared_task(bind=True)
 def check_due_soon_tasks(self) -> int:
-    now = timezone.now()
-    window = now + timedelta(hours=24)
-    tasks_due = Task.objects.select_related("assigned_to").filter(
-        due_date__gt=now,
-        due_date__lte=window,
-        assigned_to__isnull=False,
-    )
+    """Polling fallback for deployments without the Redis reminder schedule."""
+    due = 0
+    for task in due_soon_tasks().iterator():
+        enqueue_due_soon(task)
+        due += 1
+    logger.info("check_due_soon_tasks found %s tasks due soon", due)
+    return due
 
-    enqueued = 0
-    for task in tasks_due:
-        due_dt = task.due_date
-        if timezone.is_naive(due_dt):
-            due_dt = timezone.make_aware(due_dt, timezone.get_current_timezone())
-        if due_dt <= now:
-            continue
-        cache_key = _due_soon_cache_key(task)
-        if cache.add(cache_key, True, timeout=24 * 60 * 60):
-            send_task_due_soon_email.delay(task.id)
-            enqueued += 1
-    logger.info("check_due_soon_tasks queued %s due-soon emails", enqueued)
-    return enqueued
+
+@shared_task(bind=True)
+def rebuild_due_reminders(self) -> int:
+    return rebuild_reminder_schedule()
 
 
 @shared_task(bind=True)
@@ -156,3 +179,20 @@ def send_task_due_soon_notification(self, user_id: int, task_data: dict):
     message = f"Task '{task_data.get('title')}' is due soon ({task_data.get('due_date')})."
     notif = Notification.objects.create(user=user, message=message, created_at=timezone.now())
     return notif.id
+
+
+@shared_task(bind=True)
+def reconcile_unread_counts_task(self) -> int:
+    return reconcile_unread_counts()
+
+
+@shared_task(bind=True)
+def prune_notifications_task(self) -> dict:
+    report = prune_notifications()
+    logger.info(
+        "prune_notifications deleted %s notifications (%s expired, %s over the per-user cap)",
+        report.deleted,
+        report.expired,
+        report.over_cap,
+    )
+    return {"expired": report.expired, "over_cap": report.over_cap}
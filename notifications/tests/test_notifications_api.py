@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
 from boards.models import Board, BoardList
+from core.dispatch import enqueue_unique, suppressed_count
 from projects.models import Project, ProjectMember
 from tasks.models import Task
 from teams.models import Team, TeamMember
 from notifications.models import Notification
+from notifications.reminders import reminder_time
+from notifications.services import prune_notifications
+from notifications.tasks import send_task_assigned_notification
 
 User = get_user_model()
 
@@ -26,16 +36,48 @@ class NotificationsTests(APITestCase):
         self.client.force_authenticate(self.user)
 
     def test_notification_created_on_task_assignment(self):
-        task = Task.objects.create(
-            project=self.project,
-            board_list=self.list_todo,
-            title="Task X",
-            position=1,
-            assigned_to=self.user,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(
+                project=self.project,
+                board_list=self.list_todo,
+                title="Task X",
+                position=1,
+                assigned_to=self.user,
+            )
         notif = Notification.objects.filter(user=self.user, message__icontains="assigned").first()
         self.assertIsNotNone(notif)
 
+    def test_duplicate_jobs_are_published_once(self):
+        cache.clear()
+        payload = {"user_id": self.user.id, "task_data": {"title": "Dup", "id": 1}}
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            enqueue_unique(send_task_assigned_notification, "1:%s" % self.user.id, **payload)
+            raise RuntimeError
+        # The rolled-back job neither ran nor claimed its key.
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
+
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_unique(send_task_assigned_notification, "1:%s" % self.user.id, **payload)
+                enqueue_unique(send_task_assigned_notification, "1:%s" % self.user.id, **payload)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(suppressed_count(send_task_assigned_notification), 1)
+
+    def test_reminder_fires_a_day_before_the_due_date(self):
+        task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Ship", position=1)
+        self.assertIsNone(reminder_time(task))
+
+        task.assigned_to = self.user
+        task.due_date = timezone.now() + timedelta(days=3)
+        self.assertEqual(reminder_time(task), task.due_date - timedelta(hours=24))
+
+        # Due within the lead time: remind straight away.
+        task.due_date = timezone.now() + timedelta(hours=2)
+        self.assertLessEqual(reminder_time(task), timezone.now())
+
+        task.due_date = timezone.now() - timedelta(hours=1)
+        self.assertIsNone(reminder_time(task))
+
     def test_list_and_mark_read(self):
         notification = Notification.objects.create(user=self.user, message="Test notification")
         url = reverse("notifications:notifications-list")
@@ -48,3 +90,51 @@ class NotificationsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         notification.refresh_from_db()
         self.assertTrue(notification.is_read)
+
+    async def test_list_is_served_asynchronously_under_asgi(self):
+        for number in range(3):
+            await Notification.objects.acreate(user=self.user, message=f"Async {number}")
+        token = str(AccessToken.for_user(self.user))
+        url = reverse("notifications:notifications-list")
+
+        response = await self.async_client.get(url, {"page": 2}, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.async_client.get(url, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual([item["message"] for item in response.json()["results"]], ["Async 2", "Async 1", "Async 0"])
+        self.assertEqual((await self.async_client.get(url)).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unread_badge_is_served_from_cache_and_bulk_mark_read(self):
+        cache.clear()
+        count_url = reverse("notifications:notifications-unread-count")
+        first = Notification.objects.create(user=self.user, message="One")
+        self.assertEqual(self.client.get(count_url).data["unread"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = Notification.objects.create(user=self.user, message="Two")
+            Notification.objects.create(user=self.user, message="Three")
+        with self.assertNumQueries(0):
+            response = self.client.get(count_url)
+        self.assertEqual(response.data["unread"], 3)
+
+        read_url = reverse("notifications:notifications-mark-many-as-read")
+        response = self.client.post(read_url, {"ids": [first.id, second.id]}, format="json")
+        self.assertEqual((response.data["updated"], response.data["unread"]), (2, 1))
+        response = self.client.post(read_url, {"all": True}, format="json")
+        self.assertEqual((response.data["updated"], response.data["unread"]), (1, 0))
+        self.assertFalse(Notification.objects.filter(user=self.user, is_read=False).exists())
+
+    def test_prune_drops_old_read_notifications_and_caps_each_user(self):
+        old = timezone.now() - timedelta(days=120)
+        expired = Notification.objects.create(user=self.user, message="Old read", is_read=True, created_at=old)
+        kept_unread = Notification.objects.create(user=self.user, message="Old unread", created_at=old)
+        recent = [Notification.objects.create(user=self.user, message=f"New {index}") for index in range(4)]
+
+        report = prune_notifications(retention_days=90, per_user_cap=3, batch_size=2)
+
+        self.assertEqual((report.expired, report.over_cap, report.deleted), (1, 2, 3))
+        remaining = set(Notification.objects.filter(user=self.user).values_list("id", flat=True))
+        self.assertEqual(remaining, {item.id for item in recent[1:]})
+        self.assertNotIn(expired.id, remaining)
+        self.assertNotIn(kept_unread.id, remaining)
@@ -1,12 +1,20 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import NotificationListView, email_preview_view, mark_as_read_view
+from .views import (
+    NotificationListView,
+    email_preview_view,
+    mark_as_read_view,
+    mark_many_as_read_view,
+    unread_count_view,
+)
 
 app_name = "notifications"
 
 urlpatterns = [
     path("", NotificationListView.as_view(), name="notifications-list"),
+    path("unread-count/", unread_count_view, name="notifications-unread-count"),
+    path("read/", mark_many_as_read_view, name="notifications-mark-many-as-read"),
     path("<int:pk>/read/", mark_as_read_view, name="notifications-mark-as-read"),
     path("emails/preview/<str:template_slug>/", email_preview_view, name="emails-preview"),
 ]
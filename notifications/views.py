@@ -3,15 +3,18 @@ from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from types import SimpleNamespace
-from rest_framework import generics, permissions, status
+from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from core.views import AsyncListAPIView
+
 from .models import Notification
-from .serializers import NotificationSerializer
+from .serializers import MarkReadSerializer, NotificationSerializer
+from .services import get_unread_count, mark_notifications_read
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(AsyncListAPIView):
 	serializer_class = NotificationSerializer
 	permission_classes = (permissions.IsAuthenticated,)
 
@@ -23,11 +26,27 @@ class NotificationListView(generics.ListAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def mark_as_read_view(request, pk):
 	notification = get_object_or_404(Notification, pk=pk, user=request.user)
+	mark_notifications_read(request.user, [notification.pk])
 	notification.is_read = True
-	notification.save(update_fields=["is_read"])
 	return Response(NotificationSerializer(notification, context={"request": request}).data)
 
 
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+def mark_many_as_read_view(request):
+	serializer = MarkReadSerializer(data=request.data)
+	serializer.is_valid(raise_exception=True)
+	ids = None if serializer.validated_data["all"] else serializer.validated_data["ids"]
+	updated = mark_notifications_read(request.user, ids)
+	return Response({"updated": updated, "unread": get_unread_count(request.user.pk)})
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def unread_count_view(request):
+	return Response({"unread": get_unread_count(request.user.pk)})
+
+
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 def email_preview_view(request, template_slug: str):
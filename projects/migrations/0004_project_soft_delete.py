@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_initial'),
+        ('teams', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='project',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('team', 'name'), name='unique_live_project_name_per_team'),
+        ),
+    ]
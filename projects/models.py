@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from core.models import SoftDeleteQuerySet
+
 
 class Project(models.Model):
 	team = models.ForeignKey("teams.Team", related_name="projects", on_delete=models.CASCADE)
@@ -12,10 +15,19 @@ class Project(models.Model):
 	archived = models.BooleanField(default=False)
 	created_at = models.DateTimeField(default=timezone.now)
 	updated_at = models.DateTimeField(auto_now=True)
+	deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+	objects = SoftDeleteQuerySet.as_manager()
 
 	class Meta:
 		ordering = ("-created_at", "name")
-		unique_together = ("team", "name")
+		constraints = [
+			models.UniqueConstraint(
+				fields=("team", "name"),
+				condition=Q(deleted_at__isnull=True),
+				name="unique_live_project_name_per_team",
+			),
+		]
 
 	def __str__(self):
 		return f"{self.name} ({self.team})"
@@ -60,3 +60,8 @@ class ProjectSerializer(serializers.ModelSerializer):
             if not team.members.filter(user=request.user).exists():
                 raise serializers.ValidationError({"team_id": "You must belong to the team."})
         return attrs
+
+
+class ProjectCloneSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=150)
+    include_tasks = serializers.BooleanField(default=True)
@@ -1,11 +1,12 @@
 from django.urls import path
 
-from .views import ProjectDetailView, ProjectListCreateView, ProjectMembersView
+from .views import ProjectCloneView, ProjectDetailView, ProjectListCreateView, ProjectMembersView
 
 app_name = "projects"
 
 urlpatterns = [
     path("", ProjectListCreateView.as_view(), name="project-list"),
     path("<int:pk>/", ProjectDetailView.as_view(), name="project-detail"),
+    path("<int:pk>/clone/", ProjectCloneView.as_view(), name="project-clone"),
     path("<int:pk>/members/", ProjectMembersView.as_view(), name="project-members"),
 ]
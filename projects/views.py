@@ -6,9 +6,11 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from boards.services import clone_project, soft_delete
+
 from .models import Project, ProjectMember
 from .permissions import IsProjectManager, IsProjectMember
-from .serializers import ProjectMemberSerializer, ProjectSerializer
+from .serializers import ProjectCloneSerializer, ProjectMemberSerializer, ProjectSerializer
 from .services import add_project_member, remove_project_member
 
 User = get_user_model()
@@ -20,7 +22,8 @@ class ProjectListCreateView(generics.ListCreateAPIView):
 
 	def get_queryset(self):
 		return (
-			Project.objects.filter(members__user=self.request.user)
+			Project.objects.alive()
+			.filter(members__user=self.request.user)
 			.select_related("team")
 			.prefetch_related("members__user")
 			.distinct()
@@ -43,7 +46,8 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 	def get_queryset(self):
 		return (
-			Project.objects.filter(members__user=self.request.user)
+			Project.objects.alive()
+			.filter(members__user=self.request.user)
 			.select_related("team")
 			.prefetch_related("members__user")
 			.distinct()
@@ -56,6 +60,27 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
 			permission_classes = (permissions.IsAuthenticated, IsProjectManager)
 		return [permission() for permission in permission_classes]
 
+	def destroy(self, request, *args, **kwargs):
+		job = soft_delete(self.get_object(), user=request.user)
+		return Response({"purge_job": job.id, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class ProjectCloneView(APIView):
+	permission_classes = (permissions.IsAuthenticated, IsProjectManager)
+
+	def post(self, request, pk):
+		source = get_object_or_404(Project.objects.alive(), pk=pk)
+		self.check_object_permissions(request, source)
+		serializer = ProjectCloneSerializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+		try:
+			project = clone_project(source, user=request.user, **serializer.validated_data)
+		except DjangoValidationError as exc:
+			raise ValidationError(exc.message or str(exc)) from exc
+		project = Project.objects.select_related("team").prefetch_related("members__user").get(pk=project.pk)
+		output = ProjectSerializer(project, context={"request": request}).data
+		return Response(output, status=status.HTTP_201_CREATED)
+
 
 class ProjectMembersView(APIView):
 	permission_classes = (permissions.IsAuthenticated,)
@@ -68,7 +93,7 @@ class ProjectMembersView(APIView):
 		return [permission() for permission in permission_classes]
 
 	def get_project(self, request, pk):
-		project = get_object_or_404(Project, pk=pk)
+		project = get_object_or_404(Project.objects.alive(), pk=pk)
 		self.check_object_permissions(request, project)
 		return project
 
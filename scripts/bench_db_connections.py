@@ -0,0 +1,80 @@
+"""
+Time the database part of a request cycle under each connection mode.
+
+Every iteration goes through what Django does around a request: ``request_started``,
+one small query, ``request_finished``. The connection handling in those signals is what
+the modes change, so the difference in p50 is the connection setup each request pays.
+Run it against the same Postgres once per mode:
+
+    DB_POOL=false DB_CONN_MAX_AGE=0 python scripts/bench_db_connections.py --label per-request
+    DB_POOL=false python scripts/bench_db_connections.py --label persistent
+    DB_POOL=true python scripts/bench_db_connections.py --label pooled
+
+``DATABASE_URL`` (or the POSTGRES_* variables) must point at a migrated database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core import signals  # noqa: E402
+from django.db import connection  # noqa: E402
+
+
+def request_cycle() -> float:
+    started = time.perf_counter()
+    signals.request_started.send(sender=None)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    signals.request_finished.send(sender=None)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50, help="Cycles run before timing starts.")
+    parser.add_argument("--label", default="run", help="Tag for the result line, e.g. pooled.")
+    args = parser.parse_args()
+
+    for _ in range(args.warmup):
+        request_cycle()
+    latencies = sorted(request_cycle() for _ in range(args.requests))
+    connection.close()
+
+    def percentile(fraction: float) -> float:
+        return round(latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000, 3)
+
+    print(
+        json.dumps(
+            {
+                "label": args.label,
+                "vendor": connection.vendor,
+                "pool": "pool" in connection.settings_dict.get("OPTIONS", {}),
+                "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+                "requests": len(latencies),
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+                "p50_ms": percentile(0.50),
+                "p95_ms": percentile(0.95),
+                "p99_ms": percentile(0.99),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
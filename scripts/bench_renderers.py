@@ -0,0 +1,119 @@
+"""
+Compare DRF's stdlib JSON renderer/parser with the orjson and MessagePack ones on real
+``TaskSerializer`` output.
+
+A project with ``--tasks`` tasks (each with subtasks and an attachment) is created inside
+a transaction that is rolled back afterwards, serialized once, and then each renderer
+encodes the same data ``--repeat`` times:
+
+    python scripts/bench_renderers.py --tasks 500 --repeat 50
+
+Point ``DJANGO_SETTINGS_MODULE`` at any settings whose database is migrated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from boards.models import Board, BoardList  # noqa: E402
+from core.parsers import ORJSONParser  # noqa: E402
+from core.renderers import MessagePackRenderer, ORJSONRenderer, msgpack  # noqa: E402
+from projects.models import Project  # noqa: E402
+from tasks.models import Attachment, Subtask, Task  # noqa: E402
+from tasks.serializers import TaskSerializer  # noqa: E402
+from teams.models import Team  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def task_payload(count: int) -> list:
+    """``TaskSerializer`` output for ``count`` freshly created tasks, as a list view returns it."""
+    user = get_user_model().objects.create_user(email="bench-renderers@example.com", password="unused-password")
+    team = Team.objects.create(name="Renderer benchmark", description="", created_by=user)
+    project = Project.objects.create(team=team, name="Renderer benchmark")
+    board = Board.objects.create(project=project, name="Renderer benchmark")
+    board_list = BoardList.objects.filter(board=board).first()
+    due = timezone.now()
+    tasks = Task.objects.bulk_create(
+        Task(
+            project=project,
+            board_list=board_list,
+            title=f"Task {index}: migrate the billing exports",
+            description="Move the nightly export to the new bucket and update the runbook. " * 3,
+            due_date=due,
+            assigned_to=user,
+            position=index,
+            tags=["backend", "billing"],
+        )
+        for index in range(count)
+    )
+    Subtask.objects.bulk_create(
+        Subtask(task=task, title=f"Step {step}", position=step) for task in tasks for step in range(3)
+    )
+    Attachment.objects.bulk_create(
+        Attachment(task=task, file=f"attachments/bench/{task.pk}.pdf", filename=f"{task.pk}.pdf") for task in tasks
+    )
+    queryset = Task.objects.filter(project=project).prefetch_related("subtasks", "attachments__blob")
+    return TaskSerializer(queryset, many=True).data
+
+
+def measure(label: str, encode, repeat: int) -> None:
+    content = encode()
+    seconds = min(timeit.repeat(encode, number=1, repeat=repeat))
+    print(
+        f"{label:<12} {seconds * 1000:>9.2f} ms {len(content):>11,} B {len(gzip.compress(content)):>11,} B gzip"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50, help="Timing runs per renderer; the fastest is reported.")
+    args = parser.parse_args()
+
+    data = None
+    try:
+        with transaction.atomic():
+            data = task_payload(args.tasks)
+            raise Rollback
+    except Rollback:
+        pass
+
+    print(f"Rendering {args.tasks} tasks, best of {args.repeat} runs")
+    measure("json", lambda: JSONRenderer().render(data), args.repeat)
+    measure("orjson", lambda: ORJSONRenderer().render(data), args.repeat)
+    if msgpack is not None:
+        measure("msgpack", lambda: MessagePackRenderer().render(data), args.repeat)
+    else:
+        print("msgpack      not installed")
+
+    body = JSONRenderer().render(data)
+    print("Parsing the JSON body")
+    for label, json_parser in (("json", JSONParser()), ("orjson", ORJSONParser())):
+        seconds = min(timeit.repeat(lambda: json_parser.parse(io.BytesIO(body)), number=1, repeat=args.repeat))
+        print(f"{label:<12} {seconds * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
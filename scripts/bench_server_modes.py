@@ -0,0 +1,125 @@
+"""
+Load the async read endpoints with concurrent clients and report throughput and latency.
+
+Run it once against each server mode, with the same data and the same flags:
+
+    docker compose up -d --build
+    python scripts/bench_server_modes.py --token "$JWT" --project 1 --board 1 --label wsgi
+    docker compose -f docker-compose.yml -f docker-compose.asgi.yml up -d --build
+    python scripts/bench_server_modes.py --token "$JWT" --project 1 --board 1 --label asgi
+
+``--concurrency`` controls how many clients are in flight at once; raise it past the WSGI
+worker count to see where sync workers start queueing. Only the standard library is used,
+so it runs from any machine that can reach the stack.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def endpoints(args) -> list[str]:
+    paths = ["/api/v1/notifications/"]
+    if args.project:
+        paths.append(f"/api/v1/activity/projects/{args.project}/")
+    if args.board:
+        paths.append(f"/api/v1/analytics/boards/{args.board}/cfd/")
+        paths.append(f"/api/v1/analytics/boards/{args.board}/flow/")
+    return paths
+
+
+class Client:
+    """One keep-alive connection per client thread, like a browser tab polling the API."""
+
+    def __init__(self, base_url: str, token: str, timeout: float):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.connection = connection_class(parts.netloc, timeout=timeout)
+        self.headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+
+    def get(self, path: str) -> int:
+        try:
+            self.connection.request("GET", path, headers=self.headers)
+            response = self.connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return 0
+
+
+def run(args) -> dict:
+    paths = endpoints(args)
+    deadline = time.monotonic() + args.duration
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        client = Client(args.url, args.token, args.timeout)
+        local_latencies = []
+        local_statuses: dict[int, int] = {}
+        request_number = index
+        while time.monotonic() < deadline:
+            path = paths[request_number % len(paths)]
+            request_number += 1
+            started = time.perf_counter()
+            status = client.get(path)
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.concurrency)))
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if 200 <= status < 300)
+
+    def percentile(fraction: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000
+
+    return {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "ok": ok,
+        "errors": len(latencies) - ok,
+        "statuses": statuses,
+        "rps": round(ok / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "p50_ms": round(percentile(0.50), 1),
+        "p95_ms": round(percentile(0.95), 1),
+        "p99_ms": round(percentile(0.99), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost", help="Base URL of the stack (nginx).")
+    parser.add_argument("--token", required=True, help="JWT access token of a user who can read the project.")
+    parser.add_argument("--project", type=int, help="Project id for the activity feed.")
+    parser.add_argument("--board", type=int, help="Board id for the cumulative flow and flow endpoints.")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to keep the load running.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--label", default="run", help="Tag for the result line, e.g. wsgi or asgi.")
+    args = parser.parse_args()
+    print(json.dumps(run(args)))
+
+
+if __name__ == "__main__":
+    main()
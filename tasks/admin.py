@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Task, Subtask, Attachment
+from .models import ArchivedTask, Task, Subtask, Attachment
 
 
 @admin.register(Task)
@@ -20,3 +20,11 @@ class SubtaskAdmin(admin.ModelAdmin):
 @admin.register(Attachment)
 class AttachmentAdmin(admin.ModelAdmin):
 	list_display = ("id", "filename", "task", "created_at")
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+	list_display = ("id", "title", "project", "board_list", "assigned_to", "archived_at")
+	list_filter = ("priority",)
+	search_fields = ("title", "description")
+	readonly_fields = ("payload", "archived_at")
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef, QuerySet
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from activity.services import create_activity_log
+from analytics.services import done_list_names
+from boards.models import BoardList
+from comments.models import Comment, CommentAttachment
+from uploads.models import Blob
+
+from .models import ArchivedTask, Attachment, Subtask, Task
+
+
+def archivable_tasks(cutoff) -> QuerySet:
+    """
+    Live tasks that have sat in a terminal list since before ``cutoff``.
+
+    Time in the list is counted from the last move into it, as recorded in the flow
+    metrics, so later edits to a finished task do not keep it on the board. Tasks that
+    never moved there (created straight into a done list) fall back to ``updated_at``.
+    Tasks still holding legacy attachments stored outside the blob store are left
+    in place, since their files are deleted together with the attachment row.
+    """
+    legacy_files = Exists(Attachment.objects.filter(task=OuterRef("pk"), blob__isnull=True)) | Exists(
+        CommentAttachment.objects.filter(comment__task=OuterRef("pk"), blob__isnull=True)
+    )
+    return (
+        Task.objects.alive()
+        .alias(done_since=Coalesce("flow_metrics__completed_at", "updated_at"))
+        .filter(board_list__name__in=done_list_names(), done_since__lt=cutoff)
+        .exclude(legacy_files)
+    )
+
+
+def _attachment_payload(attachment) -> dict:
+    return {
+        "id": attachment.pk,
+        "filename": attachment.filename,
+        "file": attachment.file.name,
+        "blob_id": attachment.blob_id,
+        "created_at": attachment.created_at,
+    }
+
+
+def _adjust_blob_refs(blob_ids: list[int], sign: int) -> None:
+    by_count: dict[int, list[int]] = defaultdict(list)
+    for blob_id, count in Counter(blob_ids).items():
+        by_count[count].append(blob_id)
+    for count, ids in by_count.items():
+        Blob.objects.filter(pk__in=ids).update(ref_count=F("ref_count") + sign * count)
+
+
+def _archived_row(task: Task, subtasks, comments, attachments, archived_at) -> ArchivedTask:
+    return ArchivedTask(
+        id=task.pk,
+        project_id=task.project_id,
+        board_list_id=task.board_list_id,
+        title=task.title,
+        description=task.description,
+        due_date=task.due_date,
+        assigned_to_id=task.assigned_to_id,
+        priority=task.priority,
+        status=task.status,
+        tags=task.tags,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+        archived_at=archived_at,
+        payload={
+            "position": task.position,
+            "subtasks": [
+                {
+                    "id": subtask.pk,
+                    "title": subtask.title,
+                    "description": subtask.description,
+                    "completed": subtask.completed,
+                    "position": subtask.position,
+                    "created_at": subtask.created_at,
+                }
+                for subtask in subtasks
+            ],
+            "comments": [
+                {
+                    "id": comment.pk,
+                    "user_id": comment.user_id,
+                    "text": comment.text,
+                    "created_at": comment.created_at,
+                    "attachments": [_attachment_payload(item) for item in comment.attachments.all()],
+                }
+                for comment in comments
+            ],
+            "attachments": [_attachment_payload(item) for item in attachments],
+        },
+    )
+
+
+@transaction.atomic
+def archive_tasks(candidates: QuerySet, task_ids: list[int]) -> int:
+    """Move the given tasks, with their subtasks, comments and attachment references, into the archive."""
+    tasks = list(candidates.filter(pk__in=task_ids).select_for_update(of=("self",)).order_by())
+    if not tasks:
+        return 0
+    ids = [task.pk for task in tasks]
+    subtasks, comments, attachments = defaultdict(list), defaultdict(list), defaultdict(list)
+    for subtask in Subtask.objects.filter(task_id__in=ids).order_by("position", "id"):
+        subtasks[subtask.task_id].append(subtask)
+    for comment in Comment.objects.filter(task_id__in=ids).prefetch_related("attachments").order_by("created_at", "id"):
+        comments[comment.task_id].append(comment)
+    for attachment in Attachment.objects.filter(task_id__in=ids).order_by("id"):
+        attachments[attachment.task_id].append(attachment)
+
+    now = timezone.now()
+    rows = ArchivedTask.objects.bulk_create(
+        [_archived_row(task, subtasks[task.pk], comments[task.pk], attachments[task.pk], now) for task in tasks]
+    )
+    # The archive takes over each attachment's blob reference before the rows below release theirs.
+    _adjust_blob_refs([blob_id for row in rows for blob_id in row.attachment_blob_ids()], +1)
+    Task.objects.filter(pk__in=ids).delete()
+
+    per_project = Counter(task.project_id for task in tasks)
+    for project_id, count in per_project.items():
+        create_activity_log(
+            user=None,
+            action="tasks_archived",
+            metadata={"project_id": str(project_id), "tasks": count},
+        )
+    return len(tasks)
+
+
+def archive_completed_tasks(*, time_budget: float | None = None, batch_size: int | None = None) -> tuple[int, bool]:
+    """
+    Archive tasks that have been done for longer than ``TASK_ARCHIVE_AFTER_DAYS``.
+
+    Works through candidates in id order, one transaction per batch, and stops once
+    ``time_budget`` seconds have passed. Returns ``(archived, finished)``.
+    """
+    time_budget = time_budget if time_budget is not None else settings.TASK_ARCHIVE_TIME_BUDGET_SECONDS
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=settings.TASK_ARCHIVE_AFTER_DAYS)
+    candidates = archivable_tasks(cutoff)
+    deadline = time.monotonic() + time_budget
+    archived = 0
+    last_id = 0
+    while True:
+        ids = list(candidates.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return archived, True
+        last_id = ids[-1]
+        archived += archive_tasks(candidates, ids)
+        if time.monotonic() >= deadline:
+            return archived, False
+
+
+def _timestamp(value):
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+def _restored_attachments(model, items: list[dict], **owner) -> list:
+    return [
+        model(
+            id=item["id"],
+            filename=item["filename"],
+            file=item["file"],
+            blob_id=item["blob_id"],
+            created_at=_timestamp(item["created_at"]),
+            **owner,
+        )
+        for item in items
+    ]
+
+
+@transaction.atomic
+def restore_archived_task(archived: ArchivedTask, *, board_list: BoardList | None = None, user=None) -> Task:
+    """
+    Put an archived task back on a board, by default into the list it was archived from.
+
+    The task and its children keep their original ids. Rows are recreated with
+    bulk_create so restoring does not fire creation signals or assignment emails.
+    """
+    archived = ArchivedTask.objects.select_for_update().get(pk=archived.pk)
+    board_list = board_list or archived.board_list
+    if not BoardList.objects.alive().filter(pk=board_list.pk).exists():
+        raise ValidationError("The target list no longer exists.")
+    if board_list.board.project_id != archived.project_id:
+        raise ValidationError("Board list must belong to the task's project.")
+
+    position = (board_list.tasks.aggregate(max_pos=Max("position")).get("max_pos") or 0) + 1
+    task = Task(
+        id=archived.pk,
+        project_id=archived.project_id,
+        board_list=board_list,
+        title=archived.title,
+        description=archived.description,
+        due_date=archived.due_date,
+        assigned_to_id=archived.assigned_to_id,
+        priority=archived.priority,
+        status=board_list.name,
+        position=position,
+        tags=archived.tags,
+        created_at=archived.created_at,
+    )
+    Task.objects.bulk_create([task])
+
+    payload = archived.payload
+    Subtask.objects.bulk_create(
+        [
+            Subtask(
+                id=item["id"],
+                task=task,
+                title=item["title"],
+                description=item["description"],
+                completed=item["completed"],
+                position=item["position"],
+                created_at=_timestamp(item["created_at"]),
+            )
+            for item in payload.get("subtasks", [])
+        ]
+    )
+    comments = payload.get("comments", [])
+    # Authors deleted while the task was archived lose their comments' byline, as on_delete=SET_NULL would have done.
+    authors = set(
+        get_user_model().objects.filter(pk__in={item["user_id"] for item in comments}).values_list("pk", flat=True)
+    )
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                id=item["id"],
+                task=task,
+                user_id=item["user_id"] if item["user_id"] in authors else None,
+                text=item["text"],
+                created_at=_timestamp(item["created_at"]),
+            )
+            for item in comments
+        ]
+    )
+    Attachment.objects.bulk_create(_restored_attachments(Attachment, payload.get("attachments", []), task=task))
+    CommentAttachment.objects.bulk_create(
+        [
+            attachment
+            for comment in comments
+            for attachment in _restored_attachments(CommentAttachment, comment.get("attachments", []), comment_id=comment["id"])
+        ]
+    )
+    # Recreated attachments take a reference each; deleting the archive row releases the archive's.
+    _adjust_blob_refs(archived.attachment_blob_ids(), +1)
+    archived.delete()
+
+    create_activity_log(
+        user=user,
+        action="task_restored",
+        target=task,
+        metadata={"project_id": str(task.project_id), "board_list": str(board_list.pk)},
+    )
+    return task
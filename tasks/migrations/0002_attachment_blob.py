@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        ('uploads', '0002_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='task_attachments', to='uploads.blob'),
+        ),
+    ]
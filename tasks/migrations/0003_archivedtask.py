@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:29
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0004_board_is_template'),
+        ('projects', '0004_project_soft_delete'),
+        ('tasks', '0002_attachment_blob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('due_date', models.DateTimeField(blank=True, null=True)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium', max_length=10)),
+                ('status', models.CharField(blank=True, max_length=100)),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('payload', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+                ('board_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='boards.boardlist')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to='projects.project')),
+            ],
+            options={
+                'ordering': ('-archived_at', '-id'),
+                'indexes': [models.Index(fields=['project', '-archived_at'], name='archived_task_project_idx')],
+            },
+        ),
+    ]
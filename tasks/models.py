@@ -1,12 +1,28 @@
 from __future__ import annotations
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 from boards.models import BoardList
+from core.models import alive_q
 from projects.models import Project
 
+# Soft-deleted ancestors that hide a task, relative to Task.
+TASK_ALIVE_PATHS = ("project", "board_list", "board_list__board")
+
+
+def task_alive_q(prefix: str = "") -> Q:
+	"""Visibility filter for tasks, optionally reached through ``prefix`` (e.g. ``"task__"``)."""
+	return alive_q(*(f"{prefix}{path}" for path in TASK_ALIVE_PATHS))
+
+
+class TaskQuerySet(models.QuerySet):
+	def alive(self):
+		return self.filter(task_alive_q())
+
 
 class Task(models.Model):
 	class PriorityChoices(models.TextChoices):
@@ -27,6 +43,8 @@ class Task(models.Model):
 	created_at = models.DateTimeField(default=timezone.now)
 	updated_at = models.DateTimeField(auto_now=True)
 
+	objects = TaskQuerySet.as_manager()
+
 	class Meta:
 		ordering = ("position", "id")
 
@@ -60,6 +78,7 @@ class Attachment(models.Model):
 	task = models.ForeignKey(Task, related_name="attachments", on_delete=models.CASCADE)
 	file = models.FileField(upload_to="attachments/%Y/%m/%d")
 	filename = models.CharField(max_length=255, blank=True)
+	blob = models.ForeignKey("uploads.Blob", related_name="task_attachments", on_delete=models.PROTECT, null=True, blank=True)
 	created_at = models.DateTimeField(default=timezone.now)
 
 	def save(self, *args, **kwargs):
@@ -69,3 +88,46 @@ class Attachment(models.Model):
 
 	def __str__(self):
 		return f"{self.filename} ({self.task_id})"
+
+
+class ArchivedTask(models.Model):
+	"""
+	Cold copy of a finished task, moved out of the hot table by the archival job.
+
+	The row keeps the task's original id so activity entries and links still resolve
+	after a restore. Subtasks, comments and attachment references travel in ``payload``.
+	"""
+
+	id = models.BigIntegerField(primary_key=True)
+	project = models.ForeignKey(Project, related_name="archived_tasks", on_delete=models.CASCADE)
+	board_list = models.ForeignKey(BoardList, related_name="archived_tasks", on_delete=models.CASCADE)
+	title = models.CharField(max_length=255)
+	description = models.TextField(blank=True)
+	due_date = models.DateTimeField(null=True, blank=True)
+	assigned_to = models.ForeignKey(
+		settings.AUTH_USER_MODEL, related_name="archived_tasks", on_delete=models.SET_NULL, null=True, blank=True
+	)
+	priority = models.CharField(max_length=10, choices=Task.PriorityChoices.choices, default=Task.PriorityChoices.MEDIUM)
+	status = models.CharField(max_length=100, blank=True)
+	tags = models.JSONField(default=list, blank=True)
+	payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+	created_at = models.DateTimeField()
+	updated_at = models.DateTimeField()
+	archived_at = models.DateTimeField(default=timezone.now)
+
+	# Same ancestor paths as Task, so the visibility filter applies unchanged.
+	objects = TaskQuerySet.as_manager()
+
+	class Meta:
+		ordering = ("-archived_at", "-id")
+		indexes = [models.Index(fields=["project", "-archived_at"], name="archived_task_project_idx")]
+
+	def __str__(self):
+		return f"{self.title} (archived, {self.project_id})"
+
+	def attachment_blob_ids(self) -> list[int]:
+		"""One entry per attachment reference held in the payload, task and comment attachments alike."""
+		attachments = [*self.payload.get("attachments", [])]
+		for comment in self.payload.get("comments", []):
+			attachments.extend(comment.get("attachments", []))
+		return [item["blob_id"] for item in attachments if item.get("blob_id")]
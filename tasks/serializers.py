@@ -1,23 +1,37 @@
 from __future__ import annotations
 
 from django.db.models import Max
+from django.urls import reverse
 from rest_framework import serializers
 
 from boards.models import BoardList
 from projects.models import Project
 
-from .models import Task, Subtask, Attachment
+from .models import ArchivedTask, Task, Subtask, Attachment
 from .services import move_task_to_list
 
 
 class AttachmentSerializer(serializers.ModelSerializer):
     file = serializers.FileField(write_only=True)
+    size = serializers.IntegerField(source="blob.size", read_only=True, allow_null=True)
+    mime_type = serializers.CharField(source="blob.mime_type", read_only=True, allow_null=True)
+    checksum = serializers.CharField(source="blob.sha256", read_only=True, allow_null=True)
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Attachment
-        fields = ("id", "file", "filename", "created_at")
+        fields = ("id", "file", "filename", "size", "mime_type", "checksum", "renditions", "created_at")
         read_only_fields = ("id", "filename", "created_at")
 
+    def get_renditions(self, obj):
+        if obj.blob is None or not obj.blob.renditions:
+            return {}
+        url = reverse("tasks:attachment-download", args=[obj.pk])
+        request = self.context.get("request")
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        return {label: f"{url}?rendition={label}" for label in obj.blob.renditions}
+
 
 class SubtaskSerializer(serializers.ModelSerializer):
     class Meta:
@@ -27,8 +41,8 @@ class SubtaskSerializer(serializers.ModelSerializer):
 
 
 class TaskSerializer(serializers.ModelSerializer):
-    project_id = serializers.PrimaryKeyRelatedField(source="project", queryset=Project.objects.all(), write_only=True)
-    board_list_id = serializers.PrimaryKeyRelatedField(source="board_list", queryset=BoardList.objects.all(), write_only=True)
+    project_id = serializers.PrimaryKeyRelatedField(source="project", queryset=Project.objects.alive(), write_only=True)
+    board_list_id = serializers.PrimaryKeyRelatedField(source="board_list", queryset=BoardList.objects.alive(), write_only=True)
     subtasks = SubtaskSerializer(many=True, read_only=True)
     attachments = AttachmentSerializer(many=True, read_only=True)
 
@@ -84,3 +98,46 @@ class TaskSerializer(serializers.ModelSerializer):
             task.save()
             return task
         return super().update(instance, validated_data)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    subtasks = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+    attachment_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedTask
+        fields = (
+            "id",
+            "project",
+            "board_list",
+            "title",
+            "description",
+            "due_date",
+            "assigned_to",
+            "priority",
+            "status",
+            "tags",
+            "subtasks",
+            "comment_count",
+            "attachment_count",
+            "created_at",
+            "updated_at",
+            "archived_at",
+        )
+        read_only_fields = fields
+
+    def get_subtasks(self, obj):
+        return obj.payload.get("subtasks", [])
+
+    def get_comment_count(self, obj):
+        return len(obj.payload.get("comments", []))
+
+    def get_attachment_count(self, obj):
+        return len(obj.payload.get("attachments", []))
+
+
+class ArchiveRestoreSerializer(serializers.Serializer):
+    board_list_id = serializers.PrimaryKeyRelatedField(
+        source="board_list", queryset=BoardList.objects.alive(), required=False
+    )
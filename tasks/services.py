@@ -49,5 +49,6 @@ def move_task_to_list(task: Task, target_list, position: int | None = None) -> T
     task.board_list = target_list
     task.position = position
     task.status = target_list.name
-    task.save(update_fields=["board_list", "position", "status"])
+    # updated_at marks when the task entered its current list; archival ages finished tasks by it.
+    task.save(update_fields=["board_list", "position", "status", "updated_at"])
     return task
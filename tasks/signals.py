@@ -1,11 +1,10 @@
 import logging
-from datetime import timedelta
 
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 
-from notifications.tasks import send_task_assigned_email, send_task_due_soon_email
+from core.dispatch import enqueue_unique
+from notifications.tasks import send_task_assigned_email
 from .models import Task, Subtask, Attachment
 
 logger = logging.getLogger(__name__)
@@ -20,7 +19,7 @@ def log_task_activity(sender, instance, created, **kwargs):
 
     # Trigger assignment email on initial creation
     if created and instance.assigned_to:
-        send_task_assigned_email.delay(task_id=instance.id)
+        enqueue_unique(send_task_assigned_email, f"{instance.id}:{instance.assigned_to_id}", task_id=instance.id)
 
 
 @receiver(pre_save, sender=Task)
@@ -40,14 +39,7 @@ def detect_task_move(sender, instance, **kwargs):
     old_assignee = getattr(old, "assigned_to_id", None)
     new_assignee = getattr(instance, "assigned_to_id", None)
     if new_assignee and new_assignee != old_assignee:
-        send_task_assigned_email.delay(task_id=instance.id)
-
-    if new_assignee and instance.due_date:
-        due_changed = getattr(old, "due_date", None) != instance.due_date
-        if due_changed:
-            time_diff = instance.due_date - timezone.now()
-            if timedelta(seconds=0) < time_diff <= timedelta(hours=24):
-                send_task_due_soon_email.delay(task_id=instance.id)
+        enqueue_unique(send_task_assigned_email, f"{instance.id}:{new_assignee}", task_id=instance.id)
 
 
 @receiver(post_save, sender=Subtask)
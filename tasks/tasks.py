@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+
+from .archive import archive_completed_tasks
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def archive_completed_tasks_task(self) -> int:
+    archived, finished = archive_completed_tasks()
+    logger.info("archive_completed_tasks moved %s tasks to the archive", archived)
+    if not finished:
+        # Continue in a fresh run rather than holding the worker for the whole backlog.
+        archive_completed_tasks_task.delay()
+    return archived
@@ -1,12 +1,29 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
+from analytics.models import TaskFlowMetrics
+from comments.models import Comment
+from core.renderers import msgpack
 from projects.models import Project, ProjectMember
 from teams.models import Team, TeamMember
 from boards.models import Board, BoardList
-from .models import Task
+from uploads.models import Blob
+from .archive import archive_completed_tasks
+from .models import ArchivedTask, Attachment, Subtask, Task
 
 User = get_user_model()
 
@@ -37,6 +54,28 @@ class TaskApiTests(APITestCase):
 		self.assertEqual(task.position, 1)
 		self.assertEqual(task.status, self.list_todo.name)
 
+	def test_orjson_output_matches_drf_json(self):
+		task = Task.objects.create(
+			project=self.project,
+			board_list=self.list_todo,
+			title="Déploiement",
+			description="first\u2028second",
+			position=1,
+			due_date=timezone.now(),
+		)
+		Subtask.objects.create(task=task, title="Child")
+		response = self.client.get(reverse("tasks:tasks-detail", args=[task.id]))
+		self.assertEqual(response["Content-Type"], "application/json")
+		self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+	@skipUnless(msgpack, "msgpack is not installed")
+	def test_msgpack_is_served_only_when_asked_for(self):
+		Task.objects.create(project=self.project, board_list=self.list_todo, title="Packed", position=1, due_date=timezone.now())
+		url = reverse("tasks:tasks-list")
+		response = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+		self.assertEqual(response["Content-Type"], "application/msgpack")
+		self.assertEqual(msgpack.unpackb(response.content), json.loads(self.client.get(url).content))
+
 	def test_move_task_between_lists_and_reorder(self):
 		# create multiple tasks in list_todo
 		t1 = Task.objects.create(project=self.project, board_list=self.list_todo, title="Task 1", position=1)
@@ -54,3 +93,83 @@ class TaskApiTests(APITestCase):
 		response = self.client.post(reorder_url, {"ordered_ids": [t2.id]}, format="json")
 		self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+	def test_moves_are_limited_by_their_own_scope(self):
+		cache.clear()
+		task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Bouncy", position=1)
+		rates = {**settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"], "task_moves": "2/min"}
+		move_url = reverse("tasks:task-move", args=[task.id])
+		with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+			first = self.client.post(move_url, {"target_list_id": self.list_progress.id}, format="json")
+			self.assertEqual(first["RateLimit-Limit"], "2")
+			self.assertEqual(first["RateLimit-Remaining"], "1")
+			self.client.post(move_url, {"target_list_id": self.list_todo.id}, format="json")
+			blocked = self.client.post(move_url, {"target_list_id": self.list_progress.id}, format="json")
+			self.assertEqual(blocked.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+			self.assertEqual(blocked["RateLimit-Remaining"], "0")
+			self.assertIn("Retry-After", blocked)
+			# Other endpoints still draw on the general user budget.
+			response = self.client.get(reverse("tasks:tasks-list"))
+			self.assertEqual(response.status_code, status.HTTP_200_OK)
+			self.assertEqual(response["RateLimit-Limit"], "100")
+
+	def test_attachment_download_is_handed_to_nginx_for_members_only(self):
+		media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+		task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Spec", position=1)
+		with override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_REDIRECT=True, MEDIA_ACCEL_PREFIX="/protected-media/"):
+			attachment = Attachment.objects.create(task=task, file=SimpleUploadedFile("spec.pdf", b"%PDF-1.4"))
+			url = reverse("tasks:attachment-download", args=[attachment.id])
+
+			response = self.client.get(url)
+			self.assertEqual(response.status_code, status.HTTP_200_OK)
+			self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{attachment.file.name}")
+			self.assertIn('filename="spec.pdf"', response["Content-Disposition"])
+
+			outsider = User.objects.create_user(email="outsider@example.com", password="StrongPass123")
+			self.client.force_authenticate(outsider)
+			self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+	@override_settings(TASK_ARCHIVE_AFTER_DAYS=30)
+	def test_done_tasks_are_archived_and_restored_with_their_children(self):
+		list_done = BoardList.objects.get(board=self.board, name="Done")
+		old = Task.objects.create(project=self.project, board_list=list_done, title="Old release notes", position=1)
+		fresh = Task.objects.create(project=self.project, board_list=list_done, title="Fresh", position=2)
+		Subtask.objects.create(task=old, title="Proofread", completed=True)
+		Comment.objects.create(task=old, user=self.user, text="Shipped")
+		reviewer = User.objects.create_user(email="reviewer@example.com", password="StrongPass123")
+		Comment.objects.create(task=old, user=reviewer, text="Approved")
+		blob = Blob.objects.create(sha256="a" * 64, file="blobs/aa/aa/" + "a" * 64, size=3, ref_count=1)
+		Attachment.objects.create(task=old, filename="notes.txt", file=blob.file.name, blob=blob)
+		Task.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=45))
+		# Done long ago but edited since, and untouched for long but only just completed.
+		edited = Task.objects.create(project=self.project, board_list=list_done, title="Edited", position=3)
+		TaskFlowMetrics.objects.filter(task=edited).update(completed_at=timezone.now() - timedelta(days=45))
+		reopened = Task.objects.create(project=self.project, board_list=list_done, title="Reopened", position=4)
+		Task.objects.filter(pk=reopened.pk).update(updated_at=timezone.now() - timedelta(days=45))
+		TaskFlowMetrics.objects.filter(task=reopened).update(completed_at=timezone.now() - timedelta(days=2))
+
+		archived, finished = archive_completed_tasks()
+		self.assertEqual((archived, finished), (2, True))
+		self.assertFalse(Task.objects.filter(pk__in=[old.pk, edited.pk]).exists())
+		self.assertEqual(set(Task.objects.values_list("pk", flat=True)), {fresh.pk, reopened.pk})
+		blob.refresh_from_db()
+		self.assertEqual(blob.ref_count, 1)
+
+		response = self.client.get(reverse("tasks:archive-list"), {"q": "release"})
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual([item["id"] for item in response.data["results"]], [old.pk])
+		self.assertEqual(response.data["results"][0]["comment_count"], 2)
+		reviewer.delete()
+
+		response = self.client.post(reverse("tasks:archive-restore", args=[old.pk]), {"board_list_id": self.list_todo.id}, format="json")
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		restored = Task.objects.get(pk=old.pk)
+		self.assertEqual((restored.board_list_id, restored.status), (self.list_todo.id, self.list_todo.name))
+		self.assertEqual(list(restored.subtasks.values_list("title", "completed")), [("Proofread", True)])
+		self.assertEqual(
+			sorted(restored.comments.values_list("text", "user_id")), [("Approved", None), ("Shipped", self.user.id)]
+		)
+		self.assertEqual(restored.attachments.get().blob_id, blob.id)
+		self.assertEqual(list(ArchivedTask.objects.values_list("pk", flat=True)), [edited.pk])
+		blob.refresh_from_db()
+		self.assertEqual(blob.ref_count, 1)
@@ -1,7 +1,14 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import TaskViewSet, move_task_view, reorder_tasks_view
+from .views import (
+    ArchivedTaskListView,
+    TaskViewSet,
+    download_attachment_view,
+    move_task_view,
+    reorder_tasks_view,
+    restore_archived_task_view,
+)
 
 router = DefaultRouter()
 router.register(r"", TaskViewSet, basename="tasks")
@@ -9,6 +16,9 @@ router.register(r"", TaskViewSet, basename="tasks")
 app_name = "tasks"
 
 urlpatterns = [
+    path("attachments/<int:pk>/download/", download_attachment_view, name="attachment-download"),
+    path("archive/", ArchivedTaskListView.as_view(), name="archive-list"),
+    path("archive/<int:pk>/restore/", restore_archived_task_view, name="archive-restore"),
     path("", include(router.urls)),
     path("<int:pk>/move/", move_task_view, name="task-move"),
     path("list/<int:list_pk>/reorder/", reorder_tasks_view, name="tasks-reorder"),
@@ -1,20 +1,28 @@
 from __future__ import annotations
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets, permissions, status
+from rest_framework import generics, viewsets, permissions, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 
+from core.media import attachment_download_response
+from core.throttling import throttle_scope
 from projects.permissions import IsProjectMember, IsProjectManager
 from boards.models import BoardList
 
-from .models import Task
-from .serializers import TaskSerializer
+from .archive import restore_archived_task
+from .models import ArchivedTask, Attachment, Task, task_alive_q
+from .serializers import ArchivedTaskSerializer, ArchiveRestoreSerializer, TaskSerializer
 from .services import move_task_to_list, reorder_tasks
 
 
 class TaskViewSet(viewsets.ModelViewSet):
-    queryset = Task.objects.all().select_related("project", "board_list", "assigned_to").prefetch_related("subtasks", "attachments")
+    queryset = Task.objects.all().select_related("project", "board_list", "assigned_to").prefetch_related(
+        "subtasks", Prefetch("attachments", queryset=Attachment.objects.select_related("blob"))
+    )
     serializer_class = TaskSerializer
 
     def get_permissions(self):
@@ -26,26 +34,28 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Users can only see tasks for projects they are a member of
-        return Task.objects.filter(project__members__user=self.request.user).distinct()
+        return self.queryset.alive().filter(project__members__user=self.request.user).distinct()
 
 
+@throttle_scope("task_moves")
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated, IsProjectManager])
 def move_task_view(request, pk):
-    task = get_object_or_404(Task, pk=pk)
+    task = get_object_or_404(Task.objects.alive(), pk=pk)
     target_list_id = request.data.get("target_list_id") or request.query_params.get("target_list_id")
     position = request.data.get("position") or request.query_params.get("position")
     if not target_list_id:
         return Response({"target_list_id": "This field is required."}, status=status.HTTP_400_BAD_REQUEST)
-    target_list = get_object_or_404(BoardList, pk=target_list_id)
+    target_list = get_object_or_404(BoardList.objects.alive(), pk=target_list_id)
     task = move_task_to_list(task, target_list, int(position) if position is not None else None)
     return Response(TaskSerializer(task, context={"request": request}).data)
 
 
+@throttle_scope("task_moves")
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated, IsProjectManager])
 def reorder_tasks_view(request, list_pk):
-    board_list = get_object_or_404(BoardList, pk=list_pk)
+    board_list = get_object_or_404(BoardList.objects.alive(), pk=list_pk)
     ordered_ids = request.data.get("ordered_ids")
     if not isinstance(ordered_ids, list) or not ordered_ids:
         return Response({"ordered_ids": "This field must be a list of task ids."}, status=status.HTTP_400_BAD_REQUEST)
@@ -54,6 +64,51 @@ def reorder_tasks_view(request, list_pk):
     except Exception as exc:
         return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
     return Response(status=status.HTTP_204_NO_CONTENT)
-from django.shortcuts import render
 
-# Create your views here.
+
+class ArchivedTaskListView(generics.ListAPIView):
+    """Archived tasks of the caller's projects, filterable by ``project`` and searchable with ``q``."""
+
+    serializer_class = ArchivedTaskSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = "search"
+
+    def get_queryset(self):
+        queryset = ArchivedTask.objects.alive().filter(project__members__user=self.request.user)
+        project_id = self.request.query_params.get("project")
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        term = self.request.query_params.get("q")
+        if term:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset
+
+
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated, IsProjectManager])
+def restore_archived_task_view(request, pk):
+    archived = get_object_or_404(ArchivedTask.objects.alive().select_related("project"), pk=pk)
+    if not IsProjectManager().has_object_permission(request, None, archived):
+        raise PermissionDenied(IsProjectManager.message)
+    serializer = ArchiveRestoreSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        task = restore_archived_task(archived, board_list=serializer.validated_data.get("board_list"), user=request.user)
+    except DjangoValidationError as exc:
+        raise ValidationError(exc.message or str(exc)) from exc
+    task = TaskViewSet.queryset.get(pk=task.pk)
+    return Response(TaskSerializer(task, context={"request": request}).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def download_attachment_view(request, pk):
+    # Membership is part of the lookup so authorization costs a single query.
+    attachment = get_object_or_404(
+        Attachment.objects.select_related("blob")
+        .only("file", "filename", "blob__renditions")
+        .filter(task_alive_q("task__")),
+        pk=pk,
+        task__project__members__user=request.user,
+    )
+    return attachment_download_response(attachment, request.query_params.get("rendition"))
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import Blob, UploadSession
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+	list_display = ("id", "user", "target", "filename", "received_bytes", "total_size", "status", "created_at")
+	list_filter = ("target", "status")
+	search_fields = ("filename", "user__email")
+
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+	list_display = ("sha256", "size", "mime_type", "ref_count", "created_at")
+	search_fields = ("sha256",)
+	readonly_fields = ("sha256", "file", "size", "mime_type", "ref_count", "created_at")
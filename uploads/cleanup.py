@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import reduce
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from comments.models import CommentAttachment
+from core.media import delete_files_on_commit
+from tasks.models import Attachment
+
+from .models import Blob, UploadSession
+from .services import session_part_names
+
+User = get_user_model()
+
+# Top-level storage directories whose files are owned by rows in the database.
+MANAGED_PREFIXES = ("attachments", "comment_attachments", "blobs", "renditions", "users", "uploads")
+
+
+@dataclass
+class CollectionReport:
+    dry_run: bool
+    blobs_removed: int = 0
+    files_scanned: int = 0
+    orphaned_files: list[str] = field(default_factory=list)
+
+    @property
+    def files_removed(self) -> int:
+        return len(self.orphaned_files)
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def iter_storage_files(storage, prefix: str) -> Iterator[str]:
+    """Yield every stored file below ``prefix`` without materialising the whole tree."""
+    try:
+        directories, files = storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f"{prefix}/{name}"
+    for directory in directories:
+        yield from iter_storage_files(storage, f"{prefix}/{directory}")
+
+
+def _segment(name: str, index: int) -> str | None:
+    parts = name.split("/")
+    return parts[index] if len(parts) > index else None
+
+
+def referenced_names(names: list[str]) -> set[str]:
+    """The subset of ``names`` that some row still points at, resolved with a handful of queries per batch."""
+    referenced = set(Attachment.objects.filter(file__in=names).values_list("file", flat=True))
+    referenced |= set(CommentAttachment.objects.filter(file__in=names).values_list("file", flat=True))
+    referenced |= set(Blob.objects.filter(file__in=names).values_list("file", flat=True))
+
+    rendition_shas = {_segment(name, 3) for name in names if name.startswith("renditions/")}
+    for renditions in Blob.objects.filter(sha256__in=rendition_shas - {None}).values_list("renditions", flat=True):
+        referenced |= set(renditions.values())
+
+    # Avatars uploaded before the user had a pk (at registration) live under a random
+    # directory, so owners are found by the stored avatar path, never by parsing an id out
+    # of it. Renditions are written next to their avatar.
+    avatar_dirs = {name.rsplit("/", 1)[0] + "/" for name in names if name.startswith("users/")}
+    if avatar_dirs:
+        owners = User.objects.filter(reduce(operator.or_, (Q(avatar__startswith=prefix) for prefix in avatar_dirs)))
+        for avatar, renditions in owners.values_list("avatar", "avatar_renditions"):
+            referenced.add(avatar)
+            referenced |= set((renditions or {}).values())
+
+    session_ids = {_segment(name, 1) for name in names if name.startswith("uploads/")}
+    pending = UploadSession.objects.filter(
+        pk__in=[value for value in session_ids if value],
+        status=UploadSession.StatusChoices.PENDING,
+    ).only("id", "parts")
+    for session in pending:
+        referenced |= set(session_part_names(session))
+    return referenced & set(names)
+
+
+def _collect_released_blobs(cutoff, batch_size: int, report: CollectionReport) -> None:
+    released = Blob.objects.filter(ref_count=0).filter(
+        Q(released_at__lt=cutoff) | Q(released_at__isnull=True, created_at__lt=cutoff)
+    )
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                released.filter(pk__gt=last_id)
+                .order_by("pk")
+                .select_for_update(skip_locked=True)
+                .only("id", "file", "renditions")[:batch_size]
+            )
+            if not batch:
+                return
+            last_id = batch[-1].pk
+            report.blobs_removed += len(batch)
+            if report.dry_run:
+                continue
+            names = [name for blob in batch for name in (blob.file.name, *blob.renditions.values())]
+            Blob.objects.filter(pk__in=[blob.pk for blob in batch], ref_count=0).delete()
+            delete_files_on_commit(*names)
+
+
+def _collect_orphaned_files(storage, cutoff, batch_size: int, report: CollectionReport) -> None:
+    for prefix in MANAGED_PREFIXES:
+        for batch in _batched(iter_storage_files(storage, prefix), batch_size):
+            report.files_scanned += len(batch)
+            referenced = referenced_names(batch)
+            # Files younger than the grace period may belong to a transaction that has not committed yet.
+            orphaned = [name for name in batch if name not in referenced and storage.get_modified_time(name) < cutoff]
+            report.orphaned_files.extend(orphaned)
+            if orphaned and not report.dry_run:
+                delete_files_on_commit(*orphaned)
+
+
+def collect_orphaned_media(*, dry_run: bool = False, batch_size: int = 500, grace: timedelta | None = None) -> CollectionReport:
+    """
+    Reconcile media storage with the database.
+
+    Blobs that stayed unreferenced for the grace period are deleted with their
+    renditions, then every managed storage prefix is walked in batches and files no
+    row points at are removed. ``dry_run`` only reports what would go.
+    """
+    grace = grace if grace is not None else timedelta(hours=settings.MEDIA_GC_GRACE_HOURS)
+    cutoff = timezone.now() - grace
+    report = CollectionReport(dry_run=dry_run)
+    _collect_released_blobs(cutoff, batch_size, report)
+    _collect_orphaned_files(default_storage, cutoff, batch_size, report)
+    return report
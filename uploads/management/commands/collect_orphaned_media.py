@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from uploads.cleanup import collect_orphaned_media
+
+
+class Command(BaseCommand):
+    help = "Delete unreferenced blobs and media files that no database row points at"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without deleting anything")
+        parser.add_argument("--batch-size", type=int, default=500, help="Storage entries checked per query batch")
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=settings.MEDIA_GC_GRACE_HOURS,
+            help="Skip files and blobs released more recently than this",
+        )
+
+    def handle(self, *args, **options):
+        report = collect_orphaned_media(
+            dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+            grace=timedelta(hours=options["grace_hours"]),
+        )
+        verb = "Would remove" if report.dry_run else "Removed"
+        if report.dry_run:
+            for name in report.orphaned_files:
+                self.stdout.write(name)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {report.blobs_removed} blobs and {report.files_removed} files ({report.files_scanned} scanned)"
+            )
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:16
+
+import django.utils.timezone
+import uploads.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to=uploads.models.blob_upload_to)),
+                ('size', models.PositiveBigIntegerField()),
+                ('mime_type', models.CharField(default='application/octet-stream', max_length=255)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count'], name='uploads_blo_ref_cou_c642d3_idx')],
+            },
+        ),
+    ]
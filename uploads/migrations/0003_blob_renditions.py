@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0002_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blob',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
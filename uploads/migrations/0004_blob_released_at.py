@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0003_blob_renditions'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blob',
+            name='uploads_blo_ref_cou_c642d3_idx',
+        ),
+        migrations.AddField(
+            model_name='blob',
+            name='released_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='blob',
+            index=models.Index(fields=['ref_count', 'released_at'], name='uploads_blo_ref_cou_187e11_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def blob_upload_to(instance, filename):
+	return f"blobs/{instance.sha256[:2]}/{instance.sha256[2:4]}/{instance.sha256}"
+
+
+class Blob(models.Model):
+	"""Content-addressed file shared by every attachment with the same SHA-256."""
+
+	sha256 = models.CharField(max_length=64, unique=True)
+	file = models.FileField(upload_to=blob_upload_to, max_length=255)
+	size = models.PositiveBigIntegerField()
+	mime_type = models.CharField(max_length=255, default="application/octet-stream")
+	ref_count = models.PositiveIntegerField(default=0)
+	renditions = models.JSONField(default=dict, blank=True)
+	created_at = models.DateTimeField(default=timezone.now)
+	released_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		indexes = [models.Index(fields=("ref_count", "released_at"))]
+
+	@property
+	def is_image(self):
+		return self.mime_type.startswith("image/")
+
+	def __str__(self):
+		return f"{self.sha256[:12]} ({self.size} bytes, {self.ref_count} refs)"
+
+
+class UploadSession(models.Model):
+	"""A resumable upload assembled from ordered chunks before it is attached to its target."""
+
+	class TargetChoices(models.TextChoices):
+		TASK_ATTACHMENT = "task_attachment", "Task attachment"
+		COMMENT_ATTACHMENT = "comment_attachment", "Comment attachment"
+		AVATAR = "avatar", "Avatar"
+
+	class StatusChoices(models.TextChoices):
+		PENDING = "pending", "Pending"
+		COMPLETED = "completed", "Completed"
+		ABORTED = "aborted", "Aborted"
+
+	id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+	user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="upload_sessions", on_delete=models.CASCADE)
+	target = models.CharField(max_length=30, choices=TargetChoices.choices)
+	target_id = models.PositiveBigIntegerField(null=True, blank=True)
+	filename = models.CharField(max_length=255)
+	total_size = models.PositiveBigIntegerField()
+	checksum = models.CharField(max_length=64)
+	received_bytes = models.PositiveBigIntegerField(default=0)
+	parts = models.JSONField(default=list, blank=True)
+	status = models.CharField(max_length=20, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+	result_id = models.PositiveBigIntegerField(null=True, blank=True)
+	created_at = models.DateTimeField(default=timezone.now)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		ordering = ("-created_at",)
+		indexes = [models.Index(fields=("status", "created_at"))]
+
+	def __str__(self):
+		return f"Upload {self.id} ({self.received_bytes}/{self.total_size})"
+
+	@property
+	def is_pending(self):
+		return self.status == self.StatusChoices.PENDING
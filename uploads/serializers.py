@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import UploadSession
+
+SHA256_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = (
+            "id",
+            "target",
+            "target_id",
+            "filename",
+            "total_size",
+            "checksum",
+            "received_bytes",
+            "status",
+            "result_id",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = ("id", "received_bytes", "status", "result_id", "created_at", "updated_at")
+
+    def validate_total_size(self, value):
+        max_bytes = settings.UPLOAD_MAX_BYTES
+        if value <= 0 or value > max_bytes:
+            raise serializers.ValidationError(f"Uploads must be between 1 and {max_bytes} bytes.")
+        return value
+
+    def validate_checksum(self, value):
+        if not SHA256_RE.match(value):
+            raise serializers.ValidationError("Checksum must be a hex-encoded SHA-256 digest.")
+        return value.lower()
+
+    def validate(self, attrs):
+        if attrs["target"] != UploadSession.TargetChoices.AVATAR and not attrs.get("target_id"):
+            raise serializers.ValidationError({"target_id": "This field is required."})
+        if attrs["target"] == UploadSession.TargetChoices.AVATAR:
+            attrs["target_id"] = None
+        return attrs
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import mimetypes
+from typing import Any, BinaryIO
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from PIL import Image
+
+from comments.models import Comment, CommentAttachment
+from core.dispatch import enqueue
+from core.media import delete_files_on_commit
+from projects.models import ProjectMember
+from tasks.models import Attachment, Task, task_alive_q
+from users.services import schedule_avatar_renditions
+
+from .models import Blob, UploadSession
+
+
+class _LimitedReader(io.RawIOBase):
+    """Reads at most ``limit`` bytes from ``source`` without buffering them all."""
+
+    def __init__(self, source: BinaryIO, limit: int):
+        self._source = source
+        self._remaining = limit
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        data = self._source.read(min(len(buffer), self._remaining))
+        if not data:
+            return 0
+        size = len(data)
+        buffer[:size] = data
+        self._remaining -= size
+        self.consumed += size
+        return size
+
+
+class _PartsReader(io.RawIOBase):
+    """Streams stored chunk files back in order while hashing what passes through."""
+
+    def __init__(self, names: list[str]):
+        self._names = list(names)
+        self._current = None
+        self.digest = hashlib.sha256()
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while True:
+            if self._current is None:
+                if not self._names:
+                    return 0
+                self._current = default_storage.open(self._names.pop(0), "rb")
+            data = self._current.read(len(buffer))
+            if data:
+                size = len(data)
+                buffer[:size] = data
+                self.digest.update(data)
+                self.consumed += size
+                return size
+            self._current.close()
+            self._current = None
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        super().close()
+
+
+def part_name(session: UploadSession, offset: int) -> str:
+    return f"uploads/{session.id}/{offset:015d}.part"
+
+
+def session_part_names(session: UploadSession) -> list[str]:
+    return [part_name(session, offset) for offset, _size in session.parts]
+
+
+def _require_project_member(user, project_id: int) -> None:
+    if not ProjectMember.objects.filter(project_id=project_id, user=user).exists():
+        raise PermissionDenied("You must be a project member.")
+
+
+def resolve_upload_target(user, target: str, target_id: int | None) -> Any:
+    """Return the object an upload will be attached to, enforcing who may attach to it."""
+    if target == UploadSession.TargetChoices.AVATAR:
+        return user
+    if target == UploadSession.TargetChoices.TASK_ATTACHMENT:
+        task = Task.objects.alive().filter(pk=target_id).first()
+        if task is None:
+            raise ValidationError("Task not found.")
+        _require_project_member(user, task.project_id)
+        return task
+    if target == UploadSession.TargetChoices.COMMENT_ATTACHMENT:
+        comment = Comment.objects.select_related("task").filter(task_alive_q("task__"), pk=target_id).first()
+        if comment is None:
+            raise ValidationError("Comment not found.")
+        if comment.user_id != user.id:
+            raise PermissionDenied("You can only attach files to your own comments.")
+        return comment
+    raise ValidationError("Unknown upload target.")
+
+
+def guess_mime_type(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def accessible_blob(user, checksum: str, size: int) -> Blob | None:
+    """
+    An existing blob with this content that ``user`` can already read through some attachment.
+
+    Restricting instant dedup to visible blobs means knowing a file's hash is not
+    enough to get a copy of it attached somewhere new.
+    """
+    return (
+        Blob.objects.filter(sha256=checksum, size=size)
+        .filter(
+            (Q(task_attachments__task__project__members__user=user) & task_alive_q("task_attachments__task__"))
+            | (
+                Q(comment_attachments__comment__task__project__members__user=user)
+                & task_alive_q("comment_attachments__comment__task__")
+            )
+        )
+        .order_by()
+        .first()
+    )
+
+
+def release_blob(blob_id: int) -> None:
+    """Drop one reference; the garbage collector removes blobs that stay unreferenced past the grace period."""
+    Blob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+        ref_count=F("ref_count") - 1,
+        released_at=Case(When(ref_count=1, then=Value(timezone.now())), default=F("released_at")),
+    )
+
+
+def start_upload_session(*, user, target: str, target_id: int | None, filename: str, total_size: int, checksum: str) -> UploadSession:
+    """
+    Open an upload session. When the same content is already stored and visible to
+    ``user`` the attachment is created straight away and the session comes back completed.
+    """
+    resolved = resolve_upload_target(user, target, target_id)
+    checksum = checksum.lower()
+    session = UploadSession(
+        user=user,
+        target=target,
+        target_id=target_id,
+        filename=filename,
+        total_size=total_size,
+        checksum=checksum,
+    )
+    blob = None if target == UploadSession.TargetChoices.AVATAR else accessible_blob(user, checksum, total_size)
+    if blob is not None:
+        with transaction.atomic():
+            # The garbage collector may have removed the blob since the lookup; the client
+            # then uploads the content like any other.
+            blob = Blob.objects.select_for_update().filter(pk=blob.pk).first()
+            if blob is not None:
+                result = _create_attachment(session, resolved, blob)
+                session.received_bytes = total_size
+                session.status = UploadSession.StatusChoices.COMPLETED
+                session.result_id = result.pk
+                session.save()
+                return session
+    session.save()
+    return session
+
+
+def append_chunk(session: UploadSession, stream: BinaryIO, offset: int, length: int) -> UploadSession:
+    """
+    Store ``length`` bytes read from ``stream`` as the part starting at ``offset``.
+
+    Chunks must arrive in order; a client resumes by asking for ``received_bytes``
+    and sending the next chunk from there. The body is copied to storage in small
+    blocks so memory use does not depend on the chunk size.
+    """
+    max_chunk = settings.UPLOAD_CHUNK_MAX_BYTES
+    if not session.is_pending:
+        raise ValidationError("Upload session is no longer accepting data.")
+    if offset != session.received_bytes:
+        raise ValidationError(f"Expected chunk at offset {session.received_bytes}.")
+    if length <= 0 or length > max_chunk:
+        raise ValidationError(f"Chunks must be between 1 and {max_chunk} bytes.")
+    if offset + length > session.total_size:
+        raise ValidationError("Chunk extends past the declared upload size.")
+
+    name = part_name(session, offset)
+    default_storage.delete(name)
+    reader = _LimitedReader(stream, length)
+    stored_name = default_storage.save(name, File(reader, name=name))
+    if reader.consumed != length:
+        default_storage.delete(stored_name)
+        raise ValidationError("Chunk body is shorter than its Content-Range.")
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if offset != session.received_bytes:
+            default_storage.delete(stored_name)
+            raise ValidationError(f"Expected chunk at offset {session.received_bytes}.")
+        session.parts = [*session.parts, [offset, length]]
+        session.received_bytes = offset + length
+        session.save(update_fields=["parts", "received_bytes", "updated_at"])
+    return session
+
+
+def _check_digest(reader: _PartsReader, session: UploadSession) -> bool:
+    return reader.consumed == session.total_size and reader.digest.hexdigest() == session.checksum
+
+
+def _verified_write(field_file, filename: str, session: UploadSession) -> None:
+    """Write the assembled parts into ``field_file``; remove the result again if the checksum is off."""
+    reader = _PartsReader(session_part_names(session))
+    try:
+        field_file.save(filename, File(reader, name=filename), save=False)
+    finally:
+        reader.close()
+    if not _check_digest(reader, session):
+        field_file.storage.delete(field_file.name)
+        raise ValidationError("Checksum mismatch; upload rejected.")
+
+
+def _verify_parts(session: UploadSession) -> None:
+    """Hash the received parts without writing them anywhere."""
+    reader = _PartsReader(session_part_names(session))
+    buffer = bytearray(64 * 1024)
+    try:
+        while reader.readinto(buffer):
+            pass
+    finally:
+        reader.close()
+    if not _check_digest(reader, session):
+        raise ValidationError("Checksum mismatch; upload rejected.")
+
+
+def _verify_image(field_file) -> None:
+    try:
+        with field_file.storage.open(field_file.name, "rb") as handle:
+            Image.open(handle).verify()
+    except Exception as exc:
+        field_file.storage.delete(field_file.name)
+        raise ValidationError("Uploaded avatar is not a valid image.") from exc
+
+
+def _prepare_blob(session: UploadSession) -> Blob | None:
+    """
+    Hash the parts and, unless the content is already stored, write them out as a new
+    unsaved blob. Runs outside any transaction because it reads the whole upload.
+    """
+    if Blob.objects.filter(sha256=session.checksum).exists():
+        # Dedup still requires the client to have sent the content it claims.
+        _verify_parts(session)
+        return None
+    blob = Blob(sha256=session.checksum, size=session.total_size, mime_type=guess_mime_type(session.filename))
+    _verified_write(blob.file, session.checksum, session)
+    return blob
+
+
+def _store_blob(session: UploadSession, prepared: Blob | None) -> Blob:
+    """Return the locked blob for the session's content, inserting ``prepared`` if nobody has stored it yet."""
+    from .tasks import generate_blob_renditions
+
+    existing = Blob.objects.select_for_update().filter(sha256=session.checksum).first()
+    if existing is not None:
+        if prepared is not None:
+            # A concurrent upload of the same content got there first; keep theirs.
+            delete_files_on_commit(prepared.file.name)
+        return existing
+    if prepared is None:
+        raise ValidationError("Stored content was removed in the meantime; complete the upload again.")
+    try:
+        with transaction.atomic():
+            prepared.save()
+    except IntegrityError:
+        delete_files_on_commit(prepared.file.name)
+        return Blob.objects.select_for_update().get(sha256=session.checksum)
+    if prepared.is_image:
+        enqueue(generate_blob_renditions, prepared.pk)
+    return prepared
+
+
+def _create_attachment(session: UploadSession, target: Any, blob: Blob):
+    model = Attachment if session.target == UploadSession.TargetChoices.TASK_ATTACHMENT else CommentAttachment
+    owner = {"task": target} if model is Attachment else {"comment": target}
+    attachment = model.objects.create(filename=session.filename, blob=blob, file=blob.file.name, **owner)
+    Blob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+    return attachment
+
+
+def _save_avatar(target: Any, old_paths: list[str]):
+    target.avatar_renditions = {}
+    target.save(update_fields=["avatar", "avatar_renditions"])
+    delete_files_on_commit(*(path for path in old_paths if path != target.avatar.name))
+    schedule_avatar_renditions(target)
+    return target
+
+
+def _ensure_completable(session: UploadSession) -> None:
+    if not session.is_pending:
+        raise ValidationError("Upload session is already closed.")
+    if session.received_bytes != session.total_size:
+        raise ValidationError(f"Upload incomplete: {session.received_bytes} of {session.total_size} bytes received.")
+
+
+def complete_upload(session: UploadSession):
+    """
+    Assemble, verify and attach an upload; chunk files are dropped after commit.
+
+    Reassembling and hashing the parts happens before the transaction, so the session
+    and blob rows are only locked for the few writes that record the result. A file
+    written for an upload that then fails to commit is removed again.
+    """
+    session = UploadSession.objects.get(pk=session.pk)
+    _ensure_completable(session)
+    target = resolve_upload_target(session.user, session.target, session.target_id)
+
+    prepared = None
+    if session.target == UploadSession.TargetChoices.AVATAR:
+        old_paths = [target.avatar.name] if target.avatar else []
+        old_paths.extend(target.avatar_renditions.values())
+        _verified_write(target.avatar, session.filename, session)
+        _verify_image(target.avatar)
+        written = target.avatar.name
+    else:
+        prepared = _prepare_blob(session)
+        written = prepared.file.name if prepared is not None else None
+
+    try:
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            _ensure_completable(session)
+            if session.target == UploadSession.TargetChoices.AVATAR:
+                result = _save_avatar(target, old_paths)
+            else:
+                result = _create_attachment(session, target, _store_blob(session, prepared))
+            session.status = UploadSession.StatusChoices.COMPLETED
+            session.result_id = result.pk
+            session.save(update_fields=["status", "result_id", "updated_at"])
+            delete_files_on_commit(*session_part_names(session))
+    except Exception:
+        if written:
+            default_storage.delete(written)
+        raise
+    return result
+
+
+def abort_upload(session: UploadSession) -> None:
+    names = session_part_names(session)
+    session.status = UploadSession.StatusChoices.ABORTED
+    session.save(update_fields=["status", "updated_at"])
+    delete_files_on_commit(*names)
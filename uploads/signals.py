@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from comments.models import CommentAttachment
+from core.media import delete_files_on_commit
+from tasks.models import ArchivedTask, Attachment
+
+from .services import release_blob
+
+
+@receiver(post_delete, sender=Attachment)
+@receiver(post_delete, sender=CommentAttachment)
+def release_attachment_file(sender, instance, **kwargs):
+    # Blob files are shared, so they are only dropped by the garbage collector once unreferenced.
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+    elif instance.file:
+        delete_files_on_commit(instance.file.name)
+
+
+@receiver(post_delete, sender=ArchivedTask)
+def release_archived_attachments(sender, instance, **kwargs):
+    for blob_id in instance.attachment_blob_ids():
+        release_blob(blob_id)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from core.images import build_renditions
+
+from .models import Blob, UploadSession
+from .services import session_part_names
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, autoretry_for=(OSError,), retry_backoff=True, retry_kwargs={"max_retries": 3})
+def delete_stored_files(self, names: list[str]) -> int:
+    removed = 0
+    for name in names:
+        if default_storage.exists(name):
+            default_storage.delete(name)
+            removed += 1
+    return removed
+
+
+@shared_task(bind=True)
+def purge_stale_upload_sessions(self) -> int:
+    """Abort pending sessions nobody touched within the TTL and drop their chunk files."""
+    cutoff = timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    stale = UploadSession.objects.filter(status=UploadSession.StatusChoices.PENDING, updated_at__lt=cutoff)
+    purged = 0
+    for session in stale.only("id", "parts").iterator():
+        for name in session_part_names(session):
+            if default_storage.exists(name):
+                default_storage.delete(name)
+        purged += 1
+    stale.update(status=UploadSession.StatusChoices.ABORTED, updated_at=timezone.now())
+    logger.info("purge_stale_upload_sessions aborted %s sessions", purged)
+    return purged
+
+
+@shared_task(bind=True)
+def generate_blob_renditions(self, blob_id: int) -> dict[str, str]:
+    blob = Blob.objects.filter(pk=blob_id).first()
+    if blob is None or not blob.is_image:
+        return {}
+    prefix = f"renditions/{blob.sha256[:2]}/{blob.sha256[2:4]}/{blob.sha256}"
+    try:
+        renditions = build_renditions(
+            default_storage,
+            blob.file.name,
+            settings.ATTACHMENT_RENDITION_SIZES,
+            lambda label, ext: f"{prefix}/{label}.{ext}",
+        )
+    except (OSError, SyntaxError, ValueError):
+        logger.warning("generate_blob_renditions could not decode blob %s", blob_id)
+        return {}
+    Blob.objects.filter(pk=blob_id).update(renditions=renditions)
+    return renditions
+
+
+@shared_task(bind=True)
+def collect_orphaned_media_task(self) -> dict[str, int]:
+    from .cleanup import collect_orphaned_media
+
+    report = collect_orphaned_media()
+    logger.info(
+        "collect_orphaned_media removed %s blobs and %s files (%s scanned)",
+        report.blobs_removed,
+        report.files_removed,
+        report.files_scanned,
+    )
+    return {"blobs": report.blobs_removed, "files": report.files_removed, "scanned": report.files_scanned}
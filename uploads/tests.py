@@ -0,0 +1,198 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from boards.models import Board, BoardList
+from projects.models import Project, ProjectMember
+from tasks.models import Attachment, Task
+from teams.models import Team, TeamMember
+from users.services import schedule_avatar_renditions
+
+from .cleanup import collect_orphaned_media
+from .models import Blob, UploadSession
+from .services import _prepare_blob
+
+User = get_user_model()
+
+
+@override_settings(UPLOAD_CHUNK_MAX_BYTES=8)
+class ChunkedUploadTests(APITestCase):
+	def setUp(self):
+		self.media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+		media_override = override_settings(MEDIA_ROOT=self.media_root)
+		media_override.enable()
+		self.addCleanup(media_override.disable)
+
+		self.user = User.objects.create_user(email="uploader@example.com", password="StrongPass123")
+		self.team = Team.objects.create(name="Team Alpha", description="", created_by=self.user)
+		TeamMember.objects.create(team=self.team, user=self.user, role=TeamMember.RoleChoices.OWNER)
+		self.project = Project.objects.create(team=self.team, name="Project A")
+		ProjectMember.objects.create(project=self.project, user=self.user, role=ProjectMember.RoleChoices.MANAGER)
+		self.board = Board.objects.create(project=self.project, name="Upload Board")
+		self.list_todo = BoardList.objects.get(board=self.board, name="Todo")
+		self.task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Docs", position=1)
+		self.client.force_authenticate(self.user)
+
+	def start_session(self, payload, checksum=None, task=None):
+		response = self.client.post(
+			reverse("uploads:session-list"),
+			{
+				"target": UploadSession.TargetChoices.TASK_ATTACHMENT,
+				"target_id": (task or self.task).id,
+				"filename": "notes.txt",
+				"total_size": len(payload),
+				"checksum": checksum or hashlib.sha256(payload).hexdigest(),
+			},
+			format="json",
+		)
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		self.last_session = response.data
+		return response.data["id"]
+
+	def put_chunk(self, session_id, payload, start, end):
+		return self.client.generic(
+			"PUT",
+			reverse("uploads:session-detail", args=[session_id]),
+			payload[start : end + 1],
+			content_type="application/octet-stream",
+			HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{len(payload)}",
+		)
+
+	def test_chunks_resume_and_complete_into_attachment(self):
+		payload = b"resumable upload body"
+		session_id = self.start_session(payload)
+
+		self.assertEqual(self.put_chunk(session_id, payload, 0, 7).status_code, status.HTTP_200_OK)
+		out_of_order = self.put_chunk(session_id, payload, 16, 20)
+		self.assertEqual(out_of_order.status_code, status.HTTP_400_BAD_REQUEST)
+
+		status_response = self.client.get(reverse("uploads:session-detail", args=[session_id]))
+		offset = status_response.data["received_bytes"]
+		self.assertEqual(offset, 8)
+		self.put_chunk(session_id, payload, offset, 15)
+		self.put_chunk(session_id, payload, 16, len(payload) - 1)
+
+		response = self.client.post(reverse("uploads:session-complete", args=[session_id]))
+		self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+		attachment = Attachment.objects.get(task=self.task)
+		with attachment.file.open("rb") as handle:
+			self.assertEqual(handle.read(), payload)
+		self.assertEqual(UploadSession.objects.get(pk=session_id).status, UploadSession.StatusChoices.COMPLETED)
+
+	def test_checksum_mismatch_rejects_upload(self):
+		payload = b"tampered"
+		session_id = self.start_session(payload, checksum="0" * 64)
+		self.put_chunk(session_id, payload, 0, len(payload) - 1)
+
+		response = self.client.post(reverse("uploads:session-complete", args=[session_id]))
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertFalse(Attachment.objects.filter(task=self.task).exists())
+		self.assertTrue(UploadSession.objects.get(pk=session_id).is_pending)
+
+	def test_parts_are_assembled_outside_the_locking_transaction(self):
+		payload = b"assembled before locking"
+		session_id = self.start_session(payload)
+		for start in range(0, len(payload), 8):
+			self.put_chunk(session_id, payload, start, min(start + 7, len(payload) - 1))
+		outer_depth = len(connection.atomic_blocks)
+		written = []
+
+		def prepare_then_abort(session):
+			self.assertEqual(len(connection.atomic_blocks), outer_depth)
+			blob = _prepare_blob(session)
+			written.append(blob.file.name)
+			# Another request closes the session while this one was hashing.
+			UploadSession.objects.filter(pk=session.pk).update(status=UploadSession.StatusChoices.ABORTED)
+			return blob
+
+		with mock.patch("uploads.services._prepare_blob", side_effect=prepare_then_abort):
+			response = self.client.post(reverse("uploads:session-complete", args=[session_id]))
+		self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertFalse(default_storage.exists(written[0]))
+		self.assertFalse(Blob.objects.exists())
+
+	def test_duplicate_content_is_deduplicated_at_init(self):
+		payload = b"%PDF-1.4 shared spec"
+		session_id = self.start_session(payload)
+		for start in range(0, len(payload), 8):
+			self.put_chunk(session_id, payload, start, min(start + 7, len(payload) - 1))
+		first = self.client.post(reverse("uploads:session-complete", args=[session_id]))
+		self.assertEqual(first.data["size"], len(payload))
+		self.assertEqual(first.data["mime_type"], "text/plain")
+
+		other_task = Task.objects.create(project=self.project, board_list=self.list_todo, title="Review", position=2)
+		self.start_session(payload, task=other_task)
+		self.assertEqual(self.last_session["status"], UploadSession.StatusChoices.COMPLETED)
+
+		blob = Blob.objects.get(sha256=hashlib.sha256(payload).hexdigest())
+		self.assertEqual(blob.ref_count, 2)
+		self.assertEqual(Attachment.objects.get(task=other_task).file.name, blob.file.name)
+
+		Attachment.objects.get(task=other_task).delete()
+		blob.refresh_from_db()
+		self.assertEqual(blob.ref_count, 1)
+
+	def test_dedup_falls_back_to_an_upload_when_the_blob_was_collected(self):
+		payload = b"collected meanwhile"
+		blob = Blob.objects.create(sha256=hashlib.sha256(payload).hexdigest(), file="blobs/collected", size=len(payload))
+		Blob.objects.filter(pk=blob.pk).delete()
+		# The collector removed the blob between the dedup lookup and the row lock.
+		with mock.patch("uploads.services.accessible_blob", return_value=blob):
+			self.start_session(payload)
+		self.assertEqual(self.last_session["status"], UploadSession.StatusChoices.PENDING)
+		self.assertFalse(Attachment.objects.filter(task=self.task).exists())
+
+	def test_garbage_collector_removes_only_unreferenced_media(self):
+		kept = Attachment.objects.create(task=self.task, file=ContentFile(b"kept", name="kept.txt"))
+		stray = default_storage.save("attachments/2026/01/01/stray.txt", ContentFile(b"stray"))
+		released = Blob(sha256="a" * 64, size=4, ref_count=0)
+		released.file.save("blob", ContentFile(b"gone"), save=False)
+		released.save()
+
+		report = collect_orphaned_media(dry_run=True, grace=timedelta(0))
+		self.assertEqual((report.blobs_removed, report.orphaned_files), (1, [stray]))
+		self.assertTrue(default_storage.exists(stray))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			collect_orphaned_media(grace=timedelta(0))
+		self.assertFalse(default_storage.exists(stray))
+		self.assertFalse(default_storage.exists(released.file.name))
+		self.assertFalse(Blob.objects.filter(pk=released.pk).exists())
+		self.assertTrue(default_storage.exists(kept.file.name))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			kept.delete()
+		self.assertFalse(default_storage.exists(kept.file.name))
+
+	def test_garbage_collector_keeps_avatars_uploaded_at_registration(self):
+		buffer = io.BytesIO()
+		Image.new("RGB", (300, 200), "navy").save(buffer, "PNG")
+		# Saved before the row has a pk, so the avatar lands under a random directory.
+		user = User.objects.create_user(
+			email="newcomer@example.com",
+			password="StrongPass123",
+			avatar=ContentFile(buffer.getvalue(), name="me.png"),
+		)
+		with self.captureOnCommitCallbacks(execute=True):
+			schedule_avatar_renditions(user)
+		user.refresh_from_db()
+		self.assertNotIn(str(user.pk), user.avatar.name.split("/"))
+		self.assertTrue(user.avatar_renditions)
+		stray = default_storage.save("users/999999/avatar.png", ContentFile(b"stale"))
+
+		report = collect_orphaned_media(dry_run=True, grace=timedelta(0))
+		self.assertEqual(report.orphaned_files, [stray])
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import UploadCompleteView, UploadSessionDetailView, UploadSessionListView
+
+app_name = "uploads"
+
+urlpatterns = [
+    path("", UploadSessionListView.as_view(), name="session-list"),
+    path("<uuid:pk>/", UploadSessionDetailView.as_view(), name="session-detail"),
+    path("<uuid:pk>/complete/", UploadCompleteView.as_view(), name="session-complete"),
+]
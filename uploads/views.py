@@ -0,0 +1,83 @@
+import re
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from comments.serializers import CommentAttachmentSerializer
+from core.parsers import ORJSONParser
+from tasks.serializers import AttachmentSerializer
+from users.serializers import UserSerializer
+
+from .models import UploadSession
+from .serializers import UploadSessionSerializer
+from .services import abort_upload, append_chunk, complete_upload, start_upload_session
+
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+RESULT_SERIALIZERS = {
+	UploadSession.TargetChoices.TASK_ATTACHMENT: AttachmentSerializer,
+	UploadSession.TargetChoices.COMMENT_ATTACHMENT: CommentAttachmentSerializer,
+	UploadSession.TargetChoices.AVATAR: UserSerializer,
+}
+
+
+class UploadSessionMixin:
+	permission_classes = (permissions.IsAuthenticated,)
+	throttle_scope = "uploads"
+
+	def get_session(self, request, pk):
+		return get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+
+class UploadSessionListView(UploadSessionMixin, APIView):
+	def post(self, request):
+		serializer = UploadSessionSerializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+		try:
+			session = start_upload_session(user=request.user, **serializer.validated_data)
+		except DjangoValidationError as exc:
+			raise ValidationError(exc.message or str(exc)) from exc
+		return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionDetailView(UploadSessionMixin, APIView):
+	# Chunk bodies are read straight from the request stream, so no parser may touch them.
+	parser_classes = (ORJSONParser,)
+
+	def get(self, request, pk):
+		return Response(UploadSessionSerializer(self.get_session(request, pk)).data)
+
+	def put(self, request, pk):
+		session = self.get_session(request, pk)
+		match = CONTENT_RANGE_RE.match(request.headers.get("Content-Range", ""))
+		if not match:
+			raise ValidationError({"Content-Range": "Expected 'bytes <start>-<end>/<total>'."})
+		start, end, total = (int(value) for value in match.groups())
+		if total != session.total_size or end < start:
+			raise ValidationError({"Content-Range": "Range does not match this upload."})
+		try:
+			session = append_chunk(session, request.stream, start, end - start + 1)
+		except DjangoValidationError as exc:
+			raise ValidationError(exc.message or str(exc)) from exc
+		return Response(UploadSessionSerializer(session).data)
+
+	def delete(self, request, pk):
+		session = self.get_session(request, pk)
+		if session.is_pending:
+			abort_upload(session)
+		return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadCompleteView(UploadSessionMixin, APIView):
+	def post(self, request, pk):
+		session = self.get_session(request, pk)
+		try:
+			result = complete_upload(session)
+		except DjangoValidationError as exc:
+			raise ValidationError(exc.message or str(exc)) from exc
+		serializer_class = RESULT_SERIALIZERS[session.target]
+		return Response(serializer_class(result, context={"request": request}).data, status=status.HTTP_201_CREATED)
@@ -51,6 +51,7 @@ class User(AbstractBaseUser, PermissionsMixin):
 	name = models.CharField(max_length=150, blank=True)
 	bio = models.TextField(blank=True)
 	avatar = models.ImageField(upload_to=user_avatar_upload_path, blank=True, null=True)
+	avatar_renditions = models.JSONField(default=dict, blank=True)
 
 	is_active = models.BooleanField(default=True)
 	is_staff = models.BooleanField(default=False)
@@ -63,6 +64,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 	EMAIL_FIELD = "email"
 	USERNAME_FIELD = "email"
 	REQUIRED_FIELDS: list[str] = []
+	# Changes to these are announced as profile updates; logins and password changes are not.
+	PROFILE_FIELDS = ("email", "name", "bio", "avatar")
 
 	class Meta:
 		ordering = ("-created_at",)
@@ -72,6 +75,36 @@ class User(AbstractBaseUser, PermissionsMixin):
 	def __str__(self):
 		return self.email
 
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		instance = super().from_db(db, field_names, values)
+		instance._remember_profile()
+		return instance
+
+	def save(self, *args, **kwargs):
+		super().save(*args, **kwargs)
+		self._remember_profile()
+
+	def _profile_values(self) -> dict:
+		# Deferred fields are skipped rather than loaded.
+		return {
+			name: self._meta.get_field(name).get_prep_value(getattr(self, name))
+			for name in self.PROFILE_FIELDS
+			if name in self.__dict__
+		}
+
+	def _remember_profile(self):
+		self._loaded_profile = self._profile_values()
+
+	def changed_profile_fields(self, update_fields=None) -> set[str]:
+		"""Profile fields that differ from the values last loaded or saved, compared in memory."""
+		current = self._profile_values()
+		candidates = current.keys() if update_fields is None else current.keys() & set(update_fields)
+		loaded = getattr(self, "_loaded_profile", None)
+		if loaded is None:
+			return set(candidates)
+		return {name for name in candidates if name not in loaded or loaded[name] != current[name]}
+
 	def get_full_name(self):
 		return self.name or self.email
 
@@ -1,16 +1,18 @@
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from .services import create_user_account, update_user_profile
-from .utils import build_avatar_response
+from .tokens import CachedRefreshToken
+from .utils import build_avatar_renditions_response, build_avatar_response
 
 User = get_user_model()
 
 
 class UserSerializer(serializers.ModelSerializer):
     avatar_url = serializers.SerializerMethodField()
+    avatar_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -21,6 +23,7 @@ class UserSerializer(serializers.ModelSerializer):
             "bio",
             "avatar",
             "avatar_url",
+            "avatar_renditions",
             "created_at",
             "updated_at",
         )
@@ -29,6 +32,9 @@ class UserSerializer(serializers.ModelSerializer):
     def get_avatar_url(self, obj):
         return build_avatar_response(obj)
 
+    def get_avatar_renditions(self, obj):
+        return build_avatar_renditions_response(obj)
+
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, style={"input_type": "password"})
@@ -64,6 +70,10 @@ class LoginSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = CachedRefreshToken
+
+
 class ProfileUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
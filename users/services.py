@@ -5,6 +5,9 @@ from typing import Any
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from core.dispatch import enqueue
+
+from .tasks import generate_avatar_renditions
 from .utils import replace_user_avatar
 
 User = get_user_model()
@@ -17,18 +20,31 @@ def create_user_account(**validated_data: Any) -> User:
         if avatar:
             user.avatar = avatar
             user.save(update_fields=["avatar"])
+            schedule_avatar_renditions(user)
     return user
 
 
+def schedule_avatar_renditions(user: User) -> None:
+    """Queue thumbnail generation for the user's current avatar once the transaction commits."""
+    if not user.avatar:
+        return
+    user_id, avatar_name = str(user.id), user.avatar.name
+    enqueue(generate_avatar_renditions, user_id=user_id, avatar_name=avatar_name)
+
+
 _SENTINEL = object()
 
 
+@transaction.atomic
 def update_user_profile(user: User, **validated_data: Any) -> User:
+    """Apply profile changes; a replaced avatar's files are only deleted if the save commits."""
     avatar = validated_data.pop("avatar", _SENTINEL)
     for attr, value in validated_data.items():
         setattr(user, attr, value)
     if avatar is not _SENTINEL:
         replace_user_avatar(user, avatar)
     user.save()
+    if avatar is not _SENTINEL:
+        schedule_avatar_renditions(user)
     return user
 
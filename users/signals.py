@@ -1,16 +1,56 @@
+from functools import partial
+
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 
+from core.authentication import INVALIDATING_FIELDS, invalidate_cached_users
+from core.dispatch import enqueue
+from core.media import delete_files_on_commit
 from notifications.tasks import send_welcome_email
 from .tasks import notify_profile_updated
+from .tokens import remember_blacklisted
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=User)
-def user_post_save(sender, instance, created, **kwargs):
+def user_post_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        enqueue(send_welcome_email, user_id=str(instance.id))
+        return
+    changed = instance.changed_profile_fields(update_fields)
+    if changed:
+        enqueue(notify_profile_updated, user_id=str(instance.id), fields=sorted(changed))
+
+
+def _invalidate_now_and_on_commit(user_id):
+    # Dropped straight away so this transaction stops reading the old entry, and again once
+    # it commits, since a concurrent request may have cached the pre-commit row in between.
+    invalidate_cached_users([user_id])
+    transaction.on_commit(partial(invalidate_cached_users, [user_id]))
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not INVALIDATING_FIELDS.intersection(update_fields)):
+        return
+    _invalidate_now_and_on_commit(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_post_delete(sender, instance, **kwargs):
+    _invalidate_now_and_on_commit(instance.pk)
+    delete_files_on_commit(instance.avatar.name if instance.avatar else None, *instance.avatar_renditions.values())
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def blacklisted_token_post_save(sender, instance, created, **kwargs):
+    # Every blacklisting path (refresh rotation, logout, the admin) reaches the Redis set.
+    # Written straight away rather than on commit: a check running before the commit may
+    # already have warmed this day's set without the jti. If the transaction rolls back the
+    # token only stays rejected, which errs on the safe side.
     if created:
-        send_welcome_email.delay(user_id=str(instance.id))
-    else:
-        notify_profile_updated.delay(user_id=str(instance.id))
+        remember_blacklisted(instance.token.jti, int(instance.token.expires_at.timestamp()))
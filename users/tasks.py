@@ -5,8 +5,13 @@ import logging
 from celery import shared_task
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django.core.mail import send_mail
 
+from core.images import build_renditions
+
+from .tokens import purge_expired_tokens
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
@@ -32,5 +37,33 @@ def send_welcome_email(self, user_id: str) -> None:
 
 
 @shared_task(bind=True)
-def notify_profile_updated(self, user_id: str) -> None:
-    logger.info("Profile updated for user %s", user_id)
+def notify_profile_updated(self, user_id: str, fields: list[str] | None = None) -> None:
+    logger.info("Profile updated for user %s: %s", user_id, ", ".join(fields or []))
+
+
+@shared_task(bind=True)
+def generate_avatar_renditions(self, user_id: str, avatar_name: str) -> dict[str, str]:
+    user = User.objects.filter(pk=user_id).only("id", "avatar").first()
+    # Skip work for an avatar that has been replaced since the job was queued.
+    if user is None or not user.avatar or user.avatar.name != avatar_name:
+        return {}
+    stem = avatar_name.rsplit(".", 1)[0]
+    try:
+        renditions = build_renditions(
+            default_storage,
+            avatar_name,
+            settings.AVATAR_RENDITION_SIZES,
+            lambda label, ext: f"{stem}_{label}.{ext}",
+        )
+    except (OSError, SyntaxError, ValueError):
+        logger.warning("generate_avatar_renditions could not decode avatar for user %s", user_id)
+        return {}
+    User.objects.filter(pk=user_id, avatar=avatar_name).update(avatar_renditions=renditions)
+    return renditions
+
+
+@shared_task(bind=True)
+def purge_expired_tokens_task(self) -> dict[str, int]:
+    outstanding, blacklisted = purge_expired_tokens(settings.TOKEN_PURGE_BATCH_SIZE)
+    logger.info("purge_expired_tokens removed %s outstanding and %s blacklisted tokens", outstanding, blacklisted)
+    return {"outstanding": outstanding, "blacklisted": blacklisted}
@@ -1,7 +1,25 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import local_user_cache, user_cache_key
+from .services import update_user_profile
+from .tokens import purge_expired_tokens
 
 User = get_user_model()
 
@@ -29,7 +47,117 @@ class UserEndpointsTests(APITestCase):
 		self.assertEqual(response.status_code, status.HTTP_200_OK)
 		self.assertIn("access", response.data)
 
+	def test_only_profile_changes_publish_update_events(self):
+		with self.assertNoLogs("users.tasks", level="INFO"):
+			response = self.client.post(
+				reverse("users:user-login"), {"email": "existing@example.com", "password": "StrongPass123"}, format="json"
+			)
+			self.assertEqual(response.status_code, status.HTTP_200_OK)
+			self.user.set_password("EvenStronger456")
+			self.user.save()
+
+		self.client.force_authenticate(self.user)
+		with self.assertLogs("users.tasks", level="INFO") as logs:
+			with self.captureOnCommitCallbacks(execute=True):
+				self.client.patch(reverse("users:user-profile"), {"name": "Renamed", "bio": ""}, format="json")
+		self.assertEqual(len(logs.output), 1)
+		self.assertIn("Profile updated for user %s: name" % self.user.pk, logs.output[0])
+
+	def test_side_effects_are_sent_once_after_commit(self):
+		user = User.objects.get(pk=self.user.pk)
+		with self.assertLogs("users.tasks", level="INFO") as logs:
+			with self.captureOnCommitCallbacks(execute=True):
+				user.name = "First"
+				user.save()
+				user.name = "Second"
+				user.save()
+				with self.assertRaises(RuntimeError), transaction.atomic():
+					user.bio = "Never committed"
+					user.save()
+					raise RuntimeError
+				self.assertEqual(logs.output, [])
+		# Both renames produce the same message; the rolled-back bio change produces none.
+		self.assertEqual(len(logs.output), 1)
+		self.assertIn(": name", logs.output[0])
+
 	def test_profile_requires_auth(self):
 		url = reverse("users:user-profile")
 		response = self.client.get(url)
 		self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+	def test_avatar_upload_generates_renditions(self):
+		media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+		buffer = io.BytesIO()
+		Image.new("RGB", (800, 600), "teal").save(buffer, "JPEG")
+		avatar = SimpleUploadedFile("me.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+		self.client.force_authenticate(self.user)
+		with override_settings(MEDIA_ROOT=media_root), self.captureOnCommitCallbacks(execute=True):
+			response = self.client.patch(reverse("users:user-profile"), {"avatar": avatar}, format="multipart")
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+		self.user.refresh_from_db()
+		self.assertEqual(set(self.user.avatar_renditions), {"small", "medium"})
+		with override_settings(MEDIA_ROOT=media_root):
+			with self.user.avatar.storage.open(self.user.avatar_renditions["small"]) as handle:
+				self.assertEqual(max(Image.open(handle).size), 64)
+			profile = self.client.get(reverse("users:user-profile"))
+		self.assertIn("small", profile.data["avatar_renditions"])
+
+	def test_failed_profile_save_keeps_the_old_avatar(self):
+		media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+		User.objects.create_user(email="taken@example.com", password="StrongPass123")
+		with override_settings(MEDIA_ROOT=media_root):
+			self.user.avatar = SimpleUploadedFile("old.png", b"old", content_type="image/png")
+			self.user.save()
+			old_name = self.user.avatar.name
+			replacement = SimpleUploadedFile("new.png", b"new", content_type="image/png")
+			with self.captureOnCommitCallbacks(execute=True):
+				with self.assertRaises(IntegrityError):
+					update_user_profile(self.user, email="taken@example.com", avatar=replacement)
+			self.assertTrue(self.user.avatar.storage.exists(old_name))
+
+	def test_jwt_user_comes_from_cache_until_the_user_changes(self):
+		cache.clear()
+		local_user_cache.clear()
+		self.user.bio = "Kanban fan"
+		self.user.save()
+		token = str(RefreshToken.for_user(self.user).access_token)
+		self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+		url = reverse("users:user-profile")
+
+		self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+		local_user_cache.clear()
+		# Served from the shared cache without touching the database.
+		with self.assertNumQueries(0):
+			response = self.client.get(url)
+		self.assertEqual(response.data["bio"], "Kanban fan")
+
+		stale = cache.get(user_cache_key(self.user.pk))
+		with self.captureOnCommitCallbacks(execute=True):
+			self.user.is_active = False
+			self.user.save()
+			# A concurrent request caching the pre-commit row before the save commits.
+			cache.set(user_cache_key(self.user.pk), stale)
+		self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+	def test_every_blacklisted_token_reaches_the_redis_set(self):
+		refresh = RefreshToken.for_user(self.user)
+		with mock.patch("users.signals.remember_blacklisted") as remember:
+			# Blacklisted outside CachedRefreshToken, as logout or the admin would.
+			refresh.blacklist()
+		remember.assert_called_once_with(refresh["jti"], refresh["exp"])
+
+	def test_rotated_refresh_token_is_rejected_and_expired_tokens_are_purged(self):
+		refresh = str(RefreshToken.for_user(self.user))
+		url = reverse("users:token-refresh")
+		with self.captureOnCommitCallbacks(execute=True):
+			response = self.client.post(url, {"refresh": refresh}, format="json")
+		self.assertEqual(response.status_code, status.HTTP_200_OK)
+		self.assertEqual(self.client.post(url, {"refresh": refresh}, format="json").status_code, status.HTTP_401_UNAUTHORIZED)
+
+		OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+		self.assertEqual(purge_expired_tokens(batch_size=1), (1, 1))
+		self.assertFalse(BlacklistedToken.objects.exists() or OutstandingToken.objects.exists())
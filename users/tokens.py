@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Blacklisted jtis are kept in one Redis set per UTC day of token expiry, so each set
+# expires on its own once every token in it is dead. The marker member says the set was
+# filled from the database and is authoritative; without it the database is asked.
+WARM_MARKER = "__warm__"
+
+
+def _expiry_day(exp: int) -> datetime:
+    return datetime.fromtimestamp(exp, tz=dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _bucket_key(exp: int) -> str:
+    return f"auth:blacklist:{_expiry_day(exp):%Y%m%d}"
+
+
+def _bucket_expires_at(exp: int) -> int:
+    return int((_expiry_day(exp) + timedelta(days=1, hours=1)).timestamp())
+
+
+def _blacklisted_in_db(jti: str) -> bool:
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def _warm_bucket(client, exp: int) -> None:
+    day = _expiry_day(exp)
+    jtis = list(
+        BlacklistedToken.objects.filter(
+            token__expires_at__gte=day, token__expires_at__lt=day + timedelta(days=1)
+        ).values_list("token__jti", flat=True)
+    )
+    key = _bucket_key(exp)
+    pipe = client.pipeline()
+    pipe.sadd(key, WARM_MARKER, *jtis)
+    pipe.expireat(key, _bucket_expires_at(exp))
+    pipe.execute()
+
+
+def remember_blacklisted(jti: str, exp: int) -> None:
+    """
+    Add ``jti`` to its day's set. If that fails the whole set is dropped, warm marker
+    included, so later checks for that day go to the database instead of trusting a
+    set that is missing this jti.
+    """
+    client = get_redis_client()
+    if client is None:
+        return
+    key = _bucket_key(exp)
+    try:
+        pipe = client.pipeline()
+        pipe.sadd(key, jti)
+        pipe.expireat(key, _bucket_expires_at(exp))
+        pipe.execute()
+    except RedisError:
+        logger.warning("Could not cache blacklisted token %s, dropping its day's set", jti, exc_info=True)
+        try:
+            client.delete(key)
+        except RedisError:
+            logger.error("Could not drop blacklist set %s", key, exc_info=True)
+
+
+def is_blacklisted(jti: str, exp: int) -> bool:
+    """Redis first; the database decides whenever the day's set is missing or unreachable."""
+    client = get_redis_client()
+    if client is None:
+        return _blacklisted_in_db(jti)
+    key = _bucket_key(exp)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.sismember(key, jti)
+        pipe.sismember(key, WARM_MARKER)
+        member, warm = pipe.execute()
+        if member:
+            return True
+        if warm:
+            return False
+        blacklisted = _blacklisted_in_db(jti)
+        _warm_bucket(client, exp)
+        return blacklisted
+    except RedisError:
+        logger.warning("Blacklist cache unavailable, checking the database", exc_info=True)
+        return _blacklisted_in_db(jti)
+
+
+class CachedRefreshToken(RefreshToken):
+    """Refresh token whose blacklist lookups go through the Redis blacklist sets."""
+
+    def check_blacklist(self) -> None:
+        if is_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+
+def purge_expired_tokens(batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Delete expired outstanding tokens and their blacklist entries, one id batch per
+    statement pair. Returns ``(outstanding, blacklisted)`` deleted counts.
+    """
+    expired = OutstandingToken.objects.filter(expires_at__lte=timezone.now()).order_by("id")
+    outstanding = blacklisted = 0
+    while ids := list(expired.values_list("id", flat=True)[:batch_size]):
+        with transaction.atomic():
+            blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+            outstanding += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+    return outstanding, blacklisted
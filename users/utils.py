@@ -7,6 +7,8 @@ from django.conf import settings
 from django.core.files.base import File
 from django.core.files.storage import default_storage
 
+from core.media import delete_files_on_commit
+
 
 def user_avatar_upload_path(instance, filename: str) -> str:
     ext = Path(filename).suffix or ".jpg"
@@ -15,13 +17,13 @@ def user_avatar_upload_path(instance, filename: str) -> str:
 
 
 def replace_user_avatar(user, new_file: File | None) -> None:
-    old_path = user.avatar.name if user.avatar else None
+    old_paths = [user.avatar.name if user.avatar else None, *user.avatar_renditions.values()]
     if new_file is None:
         user.avatar = None
     else:
         user.avatar = new_file
-    if old_path and default_storage.exists(old_path):
-        default_storage.delete(old_path)
+    user.avatar_renditions = {}
+    delete_files_on_commit(*old_paths)
 
 
 def build_avatar_response(user) -> str | None:
@@ -32,3 +34,7 @@ def build_avatar_response(user) -> str | None:
         media_url = getattr(settings, "MEDIA_URL", "").rstrip("/")
         return f"{media_url}{url}" if media_url else url
     return None
+
+
+def build_avatar_renditions_response(user) -> dict[str, str]:
+    return {label: default_storage.url(name) for label, name in (user.avatar_renditions or {}).items()}